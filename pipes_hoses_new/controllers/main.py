@@ -0,0 +1,68 @@
+import hmac
+import json
+
+from werkzeug.exceptions import Forbidden
+
+from odoo import api, http
+from odoo.http import content_disposition, request
+from odoo.modules.registry import Registry
+
+from ..tools import instrumentation
+
+
+class VibrationExportController(http.Controller):
+
+    @http.route('/vibration/export/<int:wizard_id>', type='http', auth='user')
+    def export_samples(self, wizard_id):
+        """Stream the samples selected by an export wizard as they are read"""
+        wizard = request.env['vibration.export.wizard'].browse(wizard_id).exists()
+        if not wizard:
+            raise request.not_found()
+        wizard.check_access('read')
+        wizard.monitor_id.check_access('read')
+        request.env['vibration.cycle.data'].check_access('read')
+        encoder = wizard._get_encoder()
+
+        monitor_id = wizard.monitor_id.id
+        params = wizard._get_export_params()
+        dbname, uid, context = request.env.cr.dbname, request.env.uid, dict(request.env.context)
+
+        def generate():
+            # The response body is produced after the request's cursor is
+            # closed: read through a cursor of its own
+            with Registry(dbname).cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                yield from env['vibration.monitor'].browse(monitor_id)._iter_export(encoder, **params)
+
+        return request.make_response(generate(), headers=[
+            ('Content-Type', encoder.content_type),
+            ('Content-Disposition', content_disposition(wizard._get_export_filename(encoder))),
+        ])
+
+
+class VibrationMetricsController(http.Controller):
+
+    def _check_metrics_access(self):
+        """Administrators, or scrapers sending the pipes_hoses_new.metrics_token parameter as bearer token"""
+        if request.env.user._is_system():
+            return
+        token = request.env['ir.config_parameter'].sudo().get_param('pipes_hoses_new.metrics_token')
+        header = request.httprequest.headers.get('Authorization', '')
+        if not (token and hmac.compare_digest(header, f'Bearer {token}')):
+            raise Forbidden()
+
+    @http.route('/vibration/metrics', type='http', auth='public', methods=['GET'], save_session=False)
+    def metrics(self):
+        """Timings and counters of all the host's workers, in the Prometheus text format"""
+        self._check_metrics_access()
+        return request.make_response(instrumentation.render(), headers=[
+            ('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),
+        ])
+
+    @http.route('/vibration/metrics/profiles', type='http', auth='public', methods=['GET'], save_session=False)
+    def profiles(self):
+        """The latest calls profiled by this worker, see tools/instrumentation.py"""
+        self._check_metrics_access()
+        return request.make_response(json.dumps(list(instrumentation.PROFILES), indent=2), headers=[
+            ('Content-Type', 'application/json'),
+        ])
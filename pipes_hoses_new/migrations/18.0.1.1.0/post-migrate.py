@@ -0,0 +1,20 @@
+from odoo import api, SUPERUSER_ID
+
+LEGACY_DEGREES = (0, 45, 90, 135, 180, 225, 270, 315, 360)
+
+
+def migrate(cr, version):
+    """Drop the duplicated degree columns and convert the JSON payloads in the background.
+
+    The degree values are also in each row's JSON payload, which stays
+    readable until the scheduled action has packed it.
+    """
+    for degree in LEGACY_DEGREES:
+        for suffix in ('planned', 'actual', 'planned_time', 'actual_time'):
+            cr.execute(
+                f'ALTER TABLE vibration_cycle_data DROP COLUMN IF EXISTS "degree_{degree}_{suffix}"'
+            )
+
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['ir.config_parameter'].set_param('pipes_hoses_new.payload_migration_id', 0)
+    env.ref('pipes_hoses_new.ir_cron_migrate_cycle_payloads')._trigger()
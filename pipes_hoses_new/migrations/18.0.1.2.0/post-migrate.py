@@ -0,0 +1,7 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Start storing the chart payloads of existing cycle records, in the background"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env.ref('pipes_hoses_new.ir_cron_backfill_cycle_charts')._trigger()
@@ -0,0 +1,10 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Drop the PLC acquisition and replay crons, now ticked by the live scheduler"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    for xmlid in ('pipes_hoses_new.ir_cron_plc_acquisition', 'pipes_hoses_new.ir_cron_replay'):
+        cron = env.ref(xmlid, raise_if_not_found=False)
+        if cron:
+            cron.unlink()
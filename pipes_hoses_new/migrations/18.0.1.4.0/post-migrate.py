@@ -0,0 +1,8 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Decode the base64 waveforms to raw bytes, in the background"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['ir.config_parameter'].set_param('pipes_hoses_new.payload_migration_id', 0)
+    env.ref('pipes_hoses_new.ir_cron_migrate_cycle_payloads')._trigger()
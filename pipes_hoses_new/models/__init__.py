@@ -1,3 +1,9 @@
 from . import vibration_monitor
 from . import vibration_dashboard
-from . import live
\ No newline at end of file
+from . import live
+from . import plc_acquisition
+from . import vibration_archive
+from . import vibration_snapshot
+from . import vibration_export
+from . import vibration_replay
+from . import ir_websocket
@@ -0,0 +1,14 @@
+from odoo import models
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        """Only internal users may listen to the live vibration channels"""
+        if not self.env.user._is_internal():
+            channels = [
+                channel for channel in channels
+                if not (isinstance(channel, str) and channel.startswith('vibration_monitor_'))
+            ]
+        return super()._build_bus_channel_list(channels)
@@ -1,8 +1,11 @@
 from odoo import models, fields, api
-import json
-import math
-from datetime import datetime, timedelta
-import random
+import logging
+import time
+from datetime import datetime
+
+from ..tools import instrumentation
+
+_logger = logging.getLogger(__name__)
 
 
 class VibrationMonitor(models.Model):
@@ -12,13 +15,23 @@ class VibrationMonitor(models.Model):
     total_records_generated = fields.Integer(string='Total Records', default=0)
     last_generation_time = fields.Datetime(string='Last Generation Time')
 
+    # Wall-clock length of one scheduler run; the cron re-triggers itself after it
+    _LIVE_LOOP_SECONDS = 55
+
+    def write(self, vals):
+        res = super().write(vals)
+        if vals.get('is_live'):
+            # Wake the scheduler now rather than at its next planned run
+            self.env.ref('pipes_hoses_new.ir_cron_live_generation')._trigger()
+        return res
+
     def action_toggle_live_mode(self):
         """Toggle live mode on/off"""
         self.ensure_one()
         self.is_live = not self.is_live
 
         if self.is_live:
-            message = 'Live mode started. Data will be generated via polling.'
+            message = 'Live mode started. Data is generated on the server every second.'
             msg_type = 'success'
         else:
             message = 'Live mode stopped.'
@@ -37,7 +50,8 @@ class VibrationMonitor(models.Model):
     def action_generate_next_record(self):
         """
         Generate next record if live mode is active and enough time has passed.
-        Called by frontend polling.
+        Live generation normally runs server-side (_cron_live_generation);
+        this stays available for manual or external triggering.
         """
         self.ensure_one()
 
@@ -57,10 +71,11 @@ class VibrationMonitor(models.Model):
 
         # Generate the record
         try:
-            self._generate_single_record()
+            stats = self._generate_single_record()
             return {
                 'success': True,
                 'total_records': self.total_records_generated,
+                'rows_per_second': stats['rows_per_second'],
                 'message': 'Record generated'
             }
         except Exception as e:
@@ -73,74 +88,81 @@ class VibrationMonitor(models.Model):
         """Generate ONE new record"""
         self.ensure_one()
 
-        amplitude_map = {'2hz': 50, '3hz': 25, '5hz': 12.5, '7hz': 8.3}
-        max_amplitude = amplitude_map.get(self.frequency_variant, 50)
-        sample_degrees = self._get_sample_points_for_cycle()
-        num_cycles = int(self.frequency_value)
+        # Ingestion keeps the last Sr. No. on the monitor
+        stats = self.ingest_seconds([self._prepare_second_payload(self.total_records_generated + 1)])
 
-        # Get next cycle number
-        last_cycle = self.env['vibration.cycle.data'].search(
-            [('monitor_id', '=', self.id)],
-            order='cycle_number desc',
-            limit=1
-        )
-        next_cycle_number = (last_cycle.cycle_number + 1) if last_cycle else 1
+        # Update counters
+        self.last_generation_time = fields.Datetime.now()
+        return stats
 
+    @api.model
+    @instrumentation.timed('live_tick')
+    def _live_tick(self):
+        """Generate one second of samples for every live monitor in a single ingestion"""
+        # Monitors connected to a PLC get their samples from the acquisition instead
+        monitors = self.search([('is_live', '=', True), ('is_connected', '=', False)])
+        if not monitors:
+            return None
+
+        # The next Sr. No. follows the last one ingested, kept on the monitor
+        # rather than read back from the cycle table on every tick
         start_time = datetime.now()
-        cycle_duration = 1.0 / num_cycles
-        cycle_data = {
-            'monitor_id': self.id,
-            'cycle_number': next_cycle_number,
-            'timestamp': start_time,
-        }
-        all_data_points = []
-
-        for cycle in range(num_cycles):
-            cycle_start_offset = cycle * cycle_duration
-            for i, degree in enumerate(sample_degrees):
-                time_offset = (i / (len(sample_degrees) - 1)) * cycle_duration
-                time_in_second = cycle_start_offset + time_offset
-                timestamp = start_time + timedelta(seconds=time_in_second)
-
-                planned_value = self._calculate_displacement(degree, max_amplitude)
-                actual_value = planned_value * random.uniform(0.95, 1.05)
-
-                all_data_points.append({
-                    'cycle': cycle + 1,
-                    'degree': degree,
-                    'time': time_in_second,
-                    'planned': planned_value,
-                    'actual': actual_value
-                })
-
-                self.env['vibration.data.log'].create({
-                    'monitor_id': self.id,
-                    'cycle_number': next_cycle_number,
-                    'sub_cycle_number': cycle + 1,
-                    'degree': degree,
-                    'dimension': round(planned_value, 2),
-                    'amplitude': round(actual_value, 2),
-                    'timestamp': timestamp,
-                    'time_in_cycle': round(time_offset, 4),
-                    'time_actual': round(time_in_second, 4),
-                })
-
-        # Store first cycle in fields
-        for i, degree in enumerate(sample_degrees):
-            point = all_data_points[i]
-            cycle_data[f'degree_{degree}_planned'] = round(point['planned'], 2)
-            cycle_data[f'degree_{degree}_actual'] = round(point['actual'], 2)
-            cycle_data[f'degree_{degree}_planned_time'] = round(point['time'], 4)
-            cycle_data[f'degree_{degree}_actual_time'] = round(point['time'], 4)
-
-        cycle_data['all_data_points'] = json.dumps(all_data_points)
-        self.env['vibration.cycle.data'].create(cycle_data)
+        stats = self.ingest_seconds([
+            monitor._prepare_second_payload(monitor.total_records_generated + 1, start_time)
+            for monitor in monitors
+        ])
+        monitors.write({'last_generation_time': fields.Datetime.now()})
+        return stats
 
-        # Update counters
-        self.total_records_generated = next_cycle_number
-        self.last_update = fields.Datetime.now()
-        self.last_generation_time = fields.Datetime.now()
+    @api.model
+    def _cron_live_generation(self):
+        """Run everything that feeds live charts at 1 Hz, without any client attached.
 
+        One cron job, holding a single cron thread, ticks in turn:
+
+        - the PLC acquisition of connected monitors, whose sockets are read
+          on a thread of the acquisition service;
+        - the generation of one second for every other live monitor;
+        - the running replays.
+
+        Each runs in its own transaction. The cron lock guarantees a single
+        scheduler no matter how many workers or dashboards are up. The loop
+        ends when none of them has anything left to do, or after
+        _LIVE_LOOP_SECONDS, in which case the job is re-triggered immediately.
+        """
+        deadline = time.monotonic() + self._LIVE_LOOP_SECONDS
+        next_tick = time.monotonic()
+        # Kept by the process across runs: its connections stay open between
+        # them, and close on their own when the next run goes to another process
+        service = self._get_plc_service()
+        first = True
+        while time.monotonic() < deadline:
+            # Pick up is_live, connection and replay changes committed by other transactions
+            self.env.invalidate_all()
+            busy = self._plc_tick(service, resume=first)
+            first = False
+            try:
+                busy = self._live_tick() is not None or busy
+                self.env.cr.commit()
+            except Exception:
+                self.env.cr.rollback()
+                _logger.exception("Live vibration generation tick failed")
+                busy = True
+            busy = self.env['vibration.replay']._tick_running() or busy
+            if not busy:
+                return
+
+            next_tick += 1.0
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind: skip the missed ticks instead of bursting
+                next_tick = time.monotonic()
+
+        self.env.ref('pipes_hoses_new.ir_cron_live_generation')._trigger()
+
+    @instrumentation.timed('check_live_status')
     def check_live_status(self):
         """Check if live mode is active - called by frontend"""
         self.ensure_one()
@@ -171,22 +193,22 @@ class VibrationDashboard(models.Model):
     @api.depends()
     def _compute_is_any_monitor_live(self):
         """Check if any monitor is in live mode"""
+        is_any_monitor_live = bool(self.env['vibration.monitor.snapshot'].search_count(
+            [('is_live', '=', True), ('monitor_id.active', '=', True)], limit=1))
         for record in self:
-            live_count = self.env['vibration.monitor'].search_count([
-                ('is_live', '=', True)
-            ])
-            record.is_any_monitor_live = live_count > 0
+            record.is_any_monitor_live = is_any_monitor_live
 
+    @instrumentation.timed('get_dashboard_refresh_data')
     def get_dashboard_refresh_data(self):
         """Get latest data for dashboard refresh"""
         self.ensure_one()
 
         # Force recompute
         self._compute_chart_data()
-        self._compute_cycle_data()
+        self._compute_cycle_count()
 
         return {
             'chart_data': self.chart_data,
-            'cycle_count': len(self.cycle_data_ids),
+            'cycle_count': self.cycle_count,
             'is_any_monitor_live': self.is_any_monitor_live,
         }
\ No newline at end of file
@@ -0,0 +1,142 @@
+from odoo import models, fields, api
+import logging
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ..tools import plc
+
+_logger = logging.getLogger(__name__)
+
+# Acquisition service of each database, kept by the process between runs of
+# the live scheduler so that PLC connections outlive them
+_services = {}
+_services_lock = threading.Lock()
+
+
+class VibrationMonitor(models.Model):
+    _inherit = 'vibration.monitor'
+
+    plc_tag = fields.Char(
+        string='PLC Tag', compute='_compute_plc_tag', store=True, readonly=False,
+        help='Name of the tag streaming this monitor\'s samples on the PLC')
+
+    @api.depends('frequency_variant')
+    def _compute_plc_tag(self):
+        for record in self:
+            record.plc_tag = f'VIB_{(record.frequency_variant or "").upper()}'
+
+    def _get_plc_sample_rate(self):
+        """Samples per second to acquire, matching the monitor's sampling grid"""
+        self.ensure_one()
+        return int(self.frequency_value * self.samples_per_cycle)
+
+    def _get_plc_resume_index(self):
+        """Index of the first sample not ingested yet, or 0 to start from the current one"""
+        self.ensure_one()
+        last_cycle = self.env['vibration.cycle.data'].search(
+            [('monitor_id', '=', self.id)], order='cycle_number desc', limit=1)
+        if not last_cycle:
+            return 0
+        last_second = last_cycle.timestamp.replace(tzinfo=timezone.utc).timestamp()
+        return int(round(last_second + 1)) * self._get_plc_sample_rate()
+
+    def _prepare_acquired_seconds(self, samples, first_cycle_number):
+        """Split acquired PLC samples into ingest_seconds payloads, one per second"""
+        self.ensure_one()
+        rate = self._get_plc_sample_rate()
+        frequency = self.frequency_value
+        second_index = samples['index'] // rate
+        boundaries = np.flatnonzero(np.diff(second_index)) + 1
+        seconds = []
+        for offset, chunk in enumerate(np.split(samples, boundaries)):
+            second = int(chunk['index'][0] // rate)
+            time_actual = (chunk['index'] - second * rate) / rate
+            cycle = np.floor(time_actual * frequency) + 1
+            seconds.append({
+                'monitor_id': self.id,
+                'cycle_number': first_cycle_number + offset,
+                'timestamp': datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None),
+                'samples': {
+                    'cycle': cycle,
+                    'degree': chunk['degree'],
+                    'time': time_actual,
+                    'time_in_cycle': time_actual - (cycle - 1) / frequency,
+                    'actual': chunk['actual'],
+                },
+            })
+        return seconds
+
+    def _flush_acquired_samples(self, batches):
+        """Ingest the seconds completed since the last flush, in one transaction.
+
+        Rolls back and raises when the ingestion fails, so that the
+        acquisition service keeps the samples for its next flush.
+
+        :return: ids of the monitors that are no longer connected
+        """
+        # Pick up disconnections committed by other transactions
+        self.env.invalidate_all()
+        connected = self.exists().filtered('is_connected')
+        disconnected = set(self.ids) - set(connected.ids)
+        seconds = []
+        for monitor in connected.filtered(lambda m: m.id in batches):
+            seconds += monitor._prepare_acquired_seconds(
+                batches[monitor.id], monitor.total_records_generated + 1)
+        try:
+            if seconds:
+                self.ingest_seconds(seconds)
+            self.env.cr.commit()
+        except Exception:
+            self.env.cr.rollback()
+            raise
+        return disconnected
+
+    @api.model
+    def _sync_plc_subscriptions(self, service, realign=False):
+        """Subscribe newly connected monitors to ``service`` and drop disconnected ones.
+
+        :param realign: skip what was ingested since the service last
+            flushed, e.g. by the scheduler running in another process
+        """
+        monitors = self.search([('is_connected', '=', True), ('plc_ip_address', '!=', False)])
+        for key in set(service.subscriptions) - set(monitors.ids):
+            service.unsubscribe(key)
+        for monitor in monitors:
+            if monitor.id in service.subscriptions:
+                if realign:
+                    service.subscriptions[monitor.id].skip_before(monitor._get_plc_resume_index())
+            else:
+                service.subscribe(
+                    monitor.id, monitor.plc_ip_address, monitor.plc_port or 44818,
+                    monitor.plc_tag, monitor._get_plc_sample_rate(), monitor._get_plc_resume_index())
+        return monitors
+
+    @api.model
+    def _get_plc_service(self):
+        """Started acquisition service of this database in this process, see _cron_live_generation"""
+        with _services_lock:
+            service = _services.get(self.env.cr.dbname)
+            if service is None:
+                service = _services[self.env.cr.dbname] = plc.AcquisitionService()
+                service.start()
+        return service
+
+    @api.model
+    def _plc_tick(self, service, resume=False):
+        """Ingest the seconds acquired by ``service`` since the last tick.
+
+        Connections are checked at every tick, so monitors connected while
+        the scheduler runs join it, and disconnected ones leave it.
+
+        :param resume: first tick of a scheduler run: realign the
+            subscriptions on the database and reopen idle connections
+        :return: whether any monitor is connected
+        """
+        if not self._sync_plc_subscriptions(service, realign=resume):
+            return False
+        if resume:
+            service.resume()
+        service.flush(lambda batches: self.browse(list(batches))._flush_acquired_samples(batches))
+        return True
@@ -0,0 +1,246 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+import logging
+from datetime import timedelta
+
+import numpy as np
+
+from ..tools import archive
+
+_logger = logging.getLogger(__name__)
+
+
+class VibrationDataRollup(models.Model):
+    _name = 'vibration.data.rollup'
+    _description = 'Vibration Data Rollup'
+    _order = 'bucket_start desc, degree asc'
+
+    monitor_id = fields.Many2one('vibration.monitor', string='Monitor', required=True, ondelete='cascade')
+    resolution = fields.Selection([
+        ('second', 'Per Second'),
+        ('minute', 'Per Minute'),
+    ], string='Resolution', required=True)
+    bucket_start = fields.Datetime(string='Bucket Start', required=True)
+    degree = fields.Float(string='Degree (°)')
+    sample_count = fields.Integer(string='Samples')
+    # Deviation is amplitude (actual) minus dimension (planned), in MM
+    deviation_min = fields.Float(string='Min Deviation')
+    deviation_max = fields.Float(string='Max Deviation')
+    deviation_mean = fields.Float(string='Mean Deviation')
+    deviation_rms = fields.Float(string='RMS Deviation')
+
+    def init(self):
+        create_index(self.env.cr, 'vibration_data_rollup_monitor_bucket_idx',
+                     self._table, ['monitor_id', 'resolution', 'bucket_start'])
+
+    @api.model
+    def _rollup_window(self, monitor_id, window_start, window_end):
+        """Aggregate the raw samples of one monitor in [window_start, window_end).
+
+        The window must be aligned on whole minutes so that every per-second
+        and per-minute bucket is complete when it is written.
+        """
+        uid = self.env.uid
+        now = self.env.cr.now()
+        for resolution in ('second', 'minute'):
+            self.env.cr.execute(SQL(
+                """
+                INSERT INTO vibration_data_rollup (
+                    monitor_id, resolution, bucket_start, degree, sample_count,
+                    deviation_min, deviation_max, deviation_mean, deviation_rms,
+                    create_uid, create_date, write_uid, write_date
+                )
+                SELECT monitor_id, %(resolution)s, date_trunc(%(resolution)s, timestamp), degree, count(*),
+                       min(amplitude - dimension), max(amplitude - dimension),
+                       avg(amplitude - dimension), sqrt(avg((amplitude - dimension) ^ 2)),
+                       %(uid)s, %(now)s, %(uid)s, %(now)s
+                  FROM vibration_data_log
+                 WHERE monitor_id = %(monitor_id)s
+                   AND timestamp >= %(window_start)s
+                   AND timestamp < %(window_end)s
+              GROUP BY monitor_id, date_trunc(%(resolution)s, timestamp), degree
+                """,
+                resolution=resolution, uid=uid, now=now, monitor_id=monitor_id,
+                window_start=window_start, window_end=window_end,
+            ))
+
+
+class VibrationDataArchive(models.Model):
+    _name = 'vibration.data.archive'
+    _description = 'Vibration Raw Data Archive'
+    _order = 'monitor_id, first_cycle_number asc'
+
+    monitor_id = fields.Many2one('vibration.monitor', string='Monitor', required=True, ondelete='cascade')
+    attachment_id = fields.Many2one('ir.attachment', string='Archive File', required=True, ondelete='restrict')
+    first_cycle_number = fields.Integer(string='First Sr. No.')
+    last_cycle_number = fields.Integer(string='Last Sr. No.')
+    first_timestamp = fields.Datetime(string='From')
+    last_timestamp = fields.Datetime(string='To')
+    row_count = fields.Integer(string='Samples')
+    block_count = fields.Integer(string='Blocks')
+    file_size = fields.Integer(string='File Size (bytes)')
+
+    # Length of the time window compacted in one go, per monitor
+    _COMPACT_WINDOW_MINUTES = 10
+    # Windows processed per cron run before it re-triggers itself
+    _COMPACT_MAX_WINDOWS = 30
+
+    def init(self):
+        create_index(self.env.cr, 'vibration_data_archive_monitor_cycle_idx',
+                     self._table, ['monitor_id', 'first_cycle_number', 'last_cycle_number'])
+        create_index(self.env.cr, 'vibration_data_archive_monitor_timestamp_idx',
+                     self._table, ['monitor_id', 'first_timestamp', 'last_timestamp'])
+
+    def unlink(self):
+        attachments = self.attachment_id
+        res = super().unlink()
+        attachments.unlink()
+        return res
+
+    @api.model
+    def _get_compaction_cutoff(self):
+        """Samples older than this (aligned on a whole minute) are compacted"""
+        retention_hours = float(self.env['ir.config_parameter'].sudo().get_param(
+            'pipes_hoses_new.raw_retention_hours', 24))
+        cutoff = fields.Datetime.now() - timedelta(hours=retention_hours)
+        return cutoff.replace(second=0, microsecond=0)
+
+    @api.model
+    def _cron_compact_data_logs(self):
+        """Roll up and archive raw data logs older than the retention period"""
+        cutoff = self._get_compaction_cutoff()
+        window = timedelta(minutes=self._COMPACT_WINDOW_MINUTES)
+
+        for __ in range(self._COMPACT_MAX_WINDOWS):
+            # One probe of the (monitor_id, timestamp) index per monitor
+            self.env.cr.execute(SQL(
+                """
+                SELECT monitor.id, oldest.timestamp
+                  FROM vibration_monitor monitor
+                 CROSS JOIN LATERAL (
+                        SELECT timestamp FROM vibration_data_log
+                         WHERE monitor_id = monitor.id AND timestamp < %s
+                      ORDER BY timestamp LIMIT 1
+                  ) oldest
+                """, cutoff,
+            ))
+            pending = self.env.cr.fetchall()
+            if not pending:
+                return
+            for monitor_id, oldest in pending:
+                window_start = oldest.replace(second=0, microsecond=0)
+                window_end = min(cutoff, window_start + window)
+                self.env['vibration.data.rollup']._rollup_window(monitor_id, window_start, window_end)
+                self._archive_window(monitor_id, window_start, window_end)
+
+        # More history left than one run should handle: continue in a fresh run
+        self.env.ref('pipes_hoses_new.ir_cron_compact_vibration_data')._trigger()
+
+    @api.model
+    def _archive_window(self, monitor_id, window_start, window_end):
+        """Move the raw samples of one monitor in [window_start, window_end) to an archive file"""
+        self.env['vibration.data.log'].flush_model()
+        self.env.cr.execute(SQL(
+            """
+            SELECT id, cycle_number, sub_cycle_number, degree, dimension, amplitude,
+                   timestamp, time_in_cycle, time_actual
+              FROM vibration_data_log
+             WHERE monitor_id = %s AND timestamp >= %s AND timestamp < %s
+          ORDER BY cycle_number, sub_cycle_number, time_actual
+            """, monitor_id, window_start, window_end,
+        ))
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return self.browse()
+
+        samples = np.array(
+            [tuple(0 if value is None else value for value in row[1:]) for row in rows],
+            dtype=archive.SAMPLE_DTYPE)
+        data = archive.write_archive(samples)
+
+        first_cycle = int(samples['cycle_number'][0])
+        last_cycle = int(samples['cycle_number'][-1])
+        attachment = self.env['ir.attachment'].create({
+            'name': f'vibration_{monitor_id}_{first_cycle}_{last_cycle}.var',
+            'raw': data,
+            'mimetype': 'application/octet-stream',
+            'res_model': 'vibration.monitor',
+            'res_id': monitor_id,
+        })
+        record = self.create({
+            'monitor_id': monitor_id,
+            'attachment_id': attachment.id,
+            'first_cycle_number': first_cycle,
+            'last_cycle_number': last_cycle,
+            'first_timestamp': samples['timestamp'].min().astype('datetime64[us]').item(),
+            'last_timestamp': samples['timestamp'].max().astype('datetime64[us]').item(),
+            'row_count': len(samples),
+            'block_count': -(-len(samples) // archive.BLOCK_ROWS),
+            'file_size': len(data),
+        })
+
+        self.env.cr.execute(SQL(
+            "DELETE FROM vibration_data_log WHERE id = ANY(%s)", [row[0] for row in rows],
+        ))
+        self.env['vibration.data.log'].invalidate_model()
+        self.env['vibration.monitor.snapshot']._add_data_log_count(monitor_id, -len(rows))
+        _logger.info(
+            "Archived %s samples of monitor %s (Sr. No. %s-%s) into %s bytes",
+            len(samples), monitor_id, first_cycle, last_cycle, len(data))
+        return record
+
+    def _open_reader(self):
+        """Open the archive file, memory-mapped when it lives on the filestore"""
+        self.ensure_one()
+        attachment = self.attachment_id.sudo()
+        if attachment.store_fname:
+            return archive.MappedArchive(attachment._full_path(attachment.store_fname))
+        return archive.ArchiveReader(attachment.raw)
+
+    def _read_samples(self, first_cycle_number=None, last_cycle_number=None, date_from=None, date_to=None):
+        """Return archived samples in the cycle and time ranges as one SAMPLE_DTYPE array"""
+        chunks = []
+        for record in self:
+            reader = record._open_reader()
+            try:
+                chunks.append(reader.read(first_cycle_number, last_cycle_number))
+            finally:
+                if isinstance(reader, archive.MappedArchive):
+                    reader.close()
+        if not chunks:
+            return np.empty(0, dtype=archive.SAMPLE_DTYPE)
+        samples = np.concatenate(chunks)
+        if date_from is not None:
+            samples = samples[samples['timestamp'] >= np.datetime64(date_from, 'us')]
+        if date_to is not None:
+            samples = samples[samples['timestamp'] <= np.datetime64(date_to, 'us')]
+        return samples
+
+    @api.model
+    def read_archived_samples(self, monitor_id, first_cycle_number, last_cycle_number, date_from, date_to):
+        """Return archived raw samples of a monitor for a cycle range, as data log dicts.
+
+        Sr. No. restart at 1 with every live run, so the samples are also
+        bounded to [date_from, date_to] to keep a single run's.
+        """
+        date_from = fields.Datetime.to_datetime(date_from)
+        date_to = fields.Datetime.to_datetime(date_to)
+        archives = self.search([
+            ('monitor_id', '=', monitor_id),
+            ('last_cycle_number', '>=', first_cycle_number),
+            ('first_cycle_number', '<=', last_cycle_number),
+            ('last_timestamp', '>=', date_from),
+            ('first_timestamp', '<=', date_to),
+        ], order='first_timestamp')
+        samples = archives._read_samples(first_cycle_number, last_cycle_number, date_from, date_to)
+        return [{
+            'cycle_number': int(sample['cycle_number']),
+            'sub_cycle_number': int(sample['sub_cycle_number']),
+            'degree': float(sample['degree']),
+            'dimension': round(float(sample['dimension']), 2),
+            'amplitude': round(float(sample['amplitude']), 2),
+            'timestamp': fields.Datetime.to_string(sample['timestamp'].astype('datetime64[us]').item()),
+            'time_in_cycle': round(float(sample['time_in_cycle']), 4),
+            'time_actual': round(float(sample['time_actual']), 4),
+        } for sample in samples]
@@ -1,8 +1,14 @@
 from odoo import models, fields, api
+from odoo.tools import SQL
 import json
 import math
+import time
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from ..tools import decimation, instrumentation
+
 
 class VibrationDashboard(models.Model):
     _name = 'vibration.dashboard'
@@ -24,6 +30,12 @@ class VibrationDashboard(models.Model):
         ('7hz', '7 Hz'),
     ], string='Selected Frequency')
 
+    # Machines shown on the dashboard
+    monitor_ids = fields.Many2many(
+        'vibration.monitor', string='Monitors',
+        compute='_compute_monitor_ids', store=True, readonly=False,
+        help='Monitors traced on the dashboard, all those of the selected frequency by default')
+
     is_live_running = fields.Boolean(
         string='Is Live Running',
         compute='_compute_is_live_running',
@@ -36,111 +48,293 @@ class VibrationDashboard(models.Model):
     # Store frequency value for the widget
     frequency_value = fields.Float(string='Frequency Value', compute='_compute_chart_data')
 
-    # Cycle data for the selected frequency
-    cycle_data_ids = fields.One2many('vibration.cycle.data', compute='_compute_cycle_data',
-                                     string='Cycle Data')
+    # Cycle records of the selected monitors, from their snapshots; the records
+    # themselves are paged by the cycle list widget, see get_cycle_page
+    cycle_count = fields.Integer(string='Cycle Count', compute='_compute_cycle_count')
 
     @api.depends()
     def _compute_frequency_breakdown(self):
+        counts = dict(self.env['vibration.monitor.snapshot']._read_group(
+            [('monitor_id.active', '=', True)], ['frequency_variant'], ['__count']))
         for record in self:
-            VibrationMonitor = self.env['vibration.monitor']
-            record.monitors_2hz = VibrationMonitor.search_count([('frequency_variant', '=', '2hz')])
-            record.monitors_3hz = VibrationMonitor.search_count([('frequency_variant', '=', '3hz')])
-            record.monitors_5hz = VibrationMonitor.search_count([('frequency_variant', '=', '5hz')])
-            record.monitors_7hz = VibrationMonitor.search_count([('frequency_variant', '=', '7hz')])
+            record.monitors_2hz = counts.get('2hz', 0)
+            record.monitors_3hz = counts.get('3hz', 0)
+            record.monitors_5hz = counts.get('5hz', 0)
+            record.monitors_7hz = counts.get('7hz', 0)
 
     @api.depends('selected_frequency')
-    def _compute_cycle_data(self):
-        """Compute ALL cycle data for the selected frequency"""
+    def _compute_monitor_ids(self):
+        monitors_by_variant = dict(self.env['vibration.monitor']._read_group(
+            [('frequency_variant', 'in', [f for f in self.mapped('selected_frequency') if f])],
+            ['frequency_variant'], ['id:recordset']))
         for record in self:
-            if record.selected_frequency:
-                monitor = self.env['vibration.monitor'].search([
-                    ('frequency_variant', '=', record.selected_frequency)
-                ], limit=1)
-                if monitor:
-                    # Get ALL cycle data (not just 1)
-                    record.cycle_data_ids = self.env['vibration.cycle.data'].search([
-                        ('monitor_id', '=', monitor.id)
-                    ], order='cycle_number desc')  # Show newest first
-                else:
-                    record.cycle_data_ids = self.env['vibration.cycle.data']
-            else:
-                record.cycle_data_ids = self.env['vibration.cycle.data']
+            record.monitor_ids = monitors_by_variant.get(
+                record.selected_frequency, self.env['vibration.monitor'])
 
-    @api.depends('selected_frequency')
+    @api.depends('monitor_ids')
+    @instrumentation.timed('dashboard_cycle_count')
+    def _compute_cycle_count(self):
+        for record in self:
+            record.cycle_count = self._count_cycles(record.monitor_ids.ids)
+
+    @api.model
+    def _count_cycles(self, monitor_ids):
+        """Number of cycle records of the given monitors, read from their snapshots"""
+        [[total]] = self.env['vibration.monitor.snapshot']._read_group(
+            [('monitor_id', 'in', monitor_ids)], [], ['cycle_count:sum'])
+        return total or 0
+
+    # Seconds of history sent with the form; newer points arrive through get_chart_delta
+    _CHART_WINDOW_SECONDS = 10
+    # Upper bound on cycles returned by one delta call and monitor, for clients far behind
+    _CHART_DELTA_MAX_CYCLES = 60
+    # Point budget per series and per second of data; denser seconds are decimated
+    _CHART_POINTS_PER_SECOND = 200
+    # Rows per page of the cycle list, and the most a client may ask for
+    _CYCLE_PAGE_SIZE = 80
+    _CYCLE_PAGE_MAX_SIZE = 500
+    # Columns of the cycle list; legacy per-degree values stay on the record form
+    _CYCLE_PAGE_FIELDS = (
+        'monitor_id', 'cycle_number', 'timestamp', 'deviation_rms', 'peak_to_peak',
+        'crest_factor', 'phase_lag', 'dominant_frequency', 'is_drifting', 'drift_degrees',
+    )
+    # Above any cycle number: bound of the first page in descending order
+    _CYCLE_NUMBER_MAX = 2 ** 31 - 1
+    # A live buffer not written for this long belongs to a monitor no longer traced
+    _LIVE_BUFFER_STALE_SECONDS = 3
+
+    @api.depends('monitor_ids')
+    @instrumentation.timed('dashboard_chart_data')
     def _compute_chart_data(self):
-        """Compute cumulative chart data showing ALL records"""
+        """Compute the chart series of every selected monitor over the most recent window"""
+        all_monitors = self.monitor_ids
+        cycles_by_monitor = self._fetch_cycles_per_monitor(
+            dict.fromkeys(all_monitors.ids, self._CYCLE_NUMBER_MAX), self._CHART_WINDOW_SECONDS,
+            descending=True)
         for record in self:
-            if record.selected_frequency:
-                monitor = self.env['vibration.monitor'].search([
-                    ('frequency_variant', '=', record.selected_frequency)
-                ], limit=1)
-
-                if monitor:
-                    record.frequency_value = monitor.frequency_value
-
-                    # Get ALL data logs for cumulative display
-                    logs = self.env['vibration.data.log'].search([
-                        ('monitor_id', '=', monitor.id)
-                    ], order='timestamp asc, time_actual asc')
-
-                    if not logs:
-                        record.chart_data = json.dumps({'planned': [], 'actual': []})
-                        return
-
-                    # Prepare cumulative data arrays
-                    planned_data = []
-                    actual_data = []
-
-                    # Calculate cumulative time offset
-                    cumulative_time = 0.0
-                    last_cycle_number = 0
-
-                    for log in logs:
-                        # When we move to a new cycle, add 1 second to cumulative time
-                        if log.cycle_number != last_cycle_number:
-                            if last_cycle_number > 0:  # Not the first cycle
-                                cumulative_time += 1.0
-                            last_cycle_number = log.cycle_number
-
-                        # Add the time within this cycle to cumulative time
-                        point_time = cumulative_time + log.time_actual
-
-                        # Add actual data point
-                        actual_data.append({
-                            'degree': log.degree,
-                            'value': log.amplitude,
-                            'time': point_time,
-                            'cycle': log.cycle_number,
-                            'sub_cycle': log.sub_cycle_number,
-                        })
-
-                        # Add planned data point
-                        planned_data.append({
-                            'degree': log.degree,
-                            'value': log.dimension,
-                            'time': point_time,
-                            'cycle': log.cycle_number,
-                            'sub_cycle': log.sub_cycle_number,
-                        })
-
-                    record.chart_data = json.dumps({
-                        'planned': planned_data,
-                        'actual': actual_data
-                    })
-                else:
-                    record.chart_data = json.dumps({'planned': [], 'actual': []})
-                    record.frequency_value = 0.0
-            else:
-                record.chart_data = json.dumps({'planned': [], 'actual': []})
-                record.frequency_value = 0.0
+            series = [
+                record._prepare_monitor_series(monitor, cycles_by_monitor.get(monitor.id))
+                for monitor in record.monitor_ids
+            ]
+            with instrumentation.measure('dashboard_chart_json'):
+                record.chart_data = json.dumps({'monitors': series})
+            instrumentation.observe(
+                'vibration_payload_bytes', len(record.chart_data), instrumentation.BYTES_BUCKETS,
+                path='dashboard_chart_data')
+            record.frequency_value = record.monitor_ids[:1].frequency_value
+
+    @api.model
+    def _fetch_cycles_per_monitor(self, cursors, limit, descending=False):
+        """Fetch up to ``limit`` cycle records of each monitor in a single query.
+
+        ``cursors`` maps monitor ids to an exclusive bound on the cycle
+        number, usually the last one already known. Each monitor's records
+        are a keyset range on (monitor_id, cycle_number): the ones following
+        the bound, or preceding it when ``descending``, nearest first. Their
+        waveforms are then prefetched together. The caller checks that the
+        monitors exist and may be read; cycle records hidden from the user by
+        record rules are left out.
+
+        :return: dict mapping monitor ids to records sorted by cycle number
+        """
+        Cycle = self.env['vibration.cycle.data']
+        if not cursors:
+            return {}
+        Cycle.check_access('read')
+        Cycle.flush_model(['monitor_id', 'cycle_number'])
+        monitor_ids, after = zip(*cursors.items())
+        self.env.cr.execute(SQL("""
+            SELECT cycle.id
+              FROM unnest(%(monitor_ids)s::int[], %(after)s::int[]) AS known(monitor_id, after)
+              CROSS JOIN LATERAL (
+                    SELECT id
+                      FROM vibration_cycle_data
+                     WHERE monitor_id = known.monitor_id
+                       AND cycle_number %(comparison)s known.after
+                  ORDER BY cycle_number %(direction)s
+                     LIMIT %(limit)s
+              ) AS cycle
+        """, monitor_ids=list(monitor_ids), after=list(after), limit=limit,
+            comparison=SQL('<') if descending else SQL('>'),
+            direction=SQL('DESC') if descending else SQL('ASC')))
+        cycles = Cycle.browse([row[0] for row in self.env.cr.fetchall()])._filtered_access('read')
+        return {
+            monitor.id: monitor_cycles.sorted('cycle_number')
+            for monitor, monitor_cycles in cycles.grouped('monitor_id').items()
+        }
+
+    @api.model
+    def _prepare_monitor_series(self, monitor, cycles=None, after_cycle_number=0):
+        """Chart series of one monitor, from its cycle records sorted by cycle number"""
+        payload = self._prepare_chart_payload(cycles or self.env['vibration.cycle.data'], after_cycle_number)
+        payload.update({
+            # Lets the widget subscribe to the monitor's bus channel
+            'monitor_id': monitor.id,
+            'name': f'{monitor.display_name} #{monitor.id}',
+            'is_live': monitor.is_live,
+            'template': monitor._get_planned_template().to_dict(),
+        })
+        return payload
+
+    @api.model
+    def _prepare_chart_payload(self, cycles, after_cycle_number=0):
+        """Build actual chart points for cycle records sorted by cycle number"""
+        chunks = []
+        for cycle in cycles:
+            arrays = cycle._get_waveform_arrays()
+            chunks.append((cycle.cycle_number, arrays if arrays is not None else {'time': []}))
+        return self._prepare_chart_points(chunks, after_cycle_number)
+
+    @api.model
+    def _prepare_chart_points(self, chunks, after_cycle_number=0):
+        """Build actual chart points for ``(cycle_number, arrays)`` seconds sorted by cycle number.
+
+        Each second is offset by ``cycle_number - 1`` on the time axis.
+        Seconds holding more than ``_CHART_POINTS_PER_SECOND`` samples are
+        reduced with min/max decimation, which keeps the peaks. The planned
+        trace is not sent point by point: widgets look it up by degree in the
+        monitor's planned template. ``cursor`` is the last cycle number
+        included, to be passed back to get_chart_delta.
+        """
+        cursor = max([after_cycle_number] + [number for number, __ in chunks])
+        chunks = [(number, arrays) for number, arrays in chunks if len(arrays['time'])]
+
+        if not chunks:
+            return {'actual': [], 'cursor': cursor}
+
+        cycle_numbers = np.concatenate([
+            np.full(len(arrays['time']), number) for number, arrays in chunks])
+        times = np.concatenate([
+            arrays['time'].astype(np.float64) + (number - 1) for number, arrays in chunks])
+        sub_cycles = np.concatenate([arrays['cycle'] for __, arrays in chunks])
+        degrees = np.concatenate([arrays['degree'] for __, arrays in chunks]).astype(np.float64)
+        actual = np.concatenate([arrays['actual'] for __, arrays in chunks]).astype(np.float64)
+
+        keep = decimation.decimate_indices(
+            times, actual, self._CHART_POINTS_PER_SECOND * len(chunks), method='minmax')
+
+        actual_data = [{
+            'degree': degree,
+            'value': actual_value,
+            'time': point_time,
+            'cycle': cycle_number,
+            'sub_cycle': sub_cycle,
+        } for cycle_number, sub_cycle, degree, point_time, actual_value in zip(
+            cycle_numbers[keep].tolist(), sub_cycles[keep].astype(int).tolist(),
+            np.round(degrees[keep], 4).tolist(), np.round(times[keep], 4).tolist(),
+            np.round(actual[keep], 2).tolist())]
+
+        return {
+            'actual': actual_data,
+            'cursor': cursor,
+        }
+
+    @api.model
+    @instrumentation.timed('get_chart_delta')
+    def get_chart_delta(self, cursors):
+        """Return only the chart points recorded after the client's cursors.
+
+        ``cursors`` maps the ids of the monitors the client follows to the
+        last cycle number it received of each. Recent seconds are served from
+        the monitors' shared-memory live buffers without any query; the
+        monitors whose buffer does not hold every second since their cursor
+        are caught up together in one keyset query, so the cost of a call
+        depends on how many seconds are new, not on how long the run has been
+        going.
+        """
+        # JSON object keys arrive as strings
+        cursors = {int(monitor_id): after for monitor_id, after in cursors.items()}
+        # Only existing monitors the user may read get a buffer opened or a query
+        monitors = self.env['vibration.monitor'].browse(list(cursors)).exists()
+        monitors.check_access('read')
+        series = []
+        for monitor in monitors:
+            payload = self._get_chart_delta_from_buffer(monitor, cursors[monitor.id])
+            if payload is not None:
+                series.append(payload)
+
+        served = {payload['monitor_id'] for payload in series}
+        missing = {monitor.id: cursors[monitor.id] for monitor in monitors if monitor.id not in served}
+        monitors = monitors.filtered(lambda monitor: monitor.id in missing)
+        cycles_by_monitor = self._fetch_cycles_per_monitor(
+            {monitor.id: missing[monitor.id] for monitor in monitors}, self._CHART_DELTA_MAX_CYCLES)
+        for monitor in monitors:
+            series.append(self._prepare_monitor_series(
+                monitor, cycles_by_monitor.get(monitor.id), missing[monitor.id]))
+        instrumentation.increment(
+            'vibration_chart_points_total', sum(len(payload['actual']) for payload in series),
+            path='get_chart_delta')
+
+        return {
+            'monitors': series,
+            'is_live': any(payload['is_live'] for payload in series),
+        }
+
+    @api.model
+    def _get_chart_delta_from_buffer(self, monitor, after_cycle_number):
+        """Chart delta of ``monitor`` read from its live buffer, or None if the buffer cannot answer.
+
+        The caller checks that the monitor exists and may be read.
+        """
+        buffer = monitor._get_live_buffer()
+        seconds = buffer.read_after(after_cycle_number, self._CHART_DELTA_MAX_CYCLES) if buffer else None
+        if seconds is None:
+            return None
+        payload = self._prepare_chart_points(seconds, after_cycle_number)
+        # The buffer does not know the live flag: data written within the last
+        # ticks means the monitor is being traced
+        payload['is_live'] = time.time() - buffer.last_write < self._LIVE_BUFFER_STALE_SECONDS
+        payload['monitor_id'] = monitor.id
+        return payload
+
+    @api.model
+    @instrumentation.timed('get_cycle_page')
+    def get_cycle_page(self, monitor_ids, before=None, limit=None):
+        """Return one page of the given monitors' cycle records, newest first.
+
+        Pages are keyset ranges on (cycle_number, monitor_id), both
+        descending: ``before`` is the ``[cycle_number, monitor_id]`` key of
+        the last row of the previous page, or None for the first page. Each
+        monitor contributes at most one page of rows through its
+        (monitor_id, cycle_number) index, whatever the depth of the page,
+        and the total comes from the monitors' snapshots, so no call reads
+        or counts the whole history.
+
+        :return: dict with the ``rows`` (read values of _CYCLE_PAGE_FIELDS),
+            the ``next`` key to pass as ``before`` (None on the last page)
+            and the ``total`` number of records
+        """
+        limit = min(int(limit or self._CYCLE_PAGE_SIZE), self._CYCLE_PAGE_MAX_SIZE)
+        # Only existing monitors the user may read are queried
+        monitors = self.env['vibration.monitor'].browse(monitor_ids).exists()
+        monitors.check_access('read')
+        monitor_ids = monitors.ids
+        if before:
+            # Rows of the same second as the key come after it only for lower monitor ids
+            number, last_monitor_id = before
+            bounds = {
+                monitor_id: number + 1 if monitor_id < last_monitor_id else number
+                for monitor_id in monitor_ids
+            }
+        else:
+            bounds = dict.fromkeys(monitor_ids, self._CYCLE_NUMBER_MAX)
+
+        cycles_by_monitor = self._fetch_cycles_per_monitor(bounds, limit + 1, descending=True)
+        cycles = self.env['vibration.cycle.data'].union(*cycles_by_monitor.values())
+        cycles = cycles.sorted(lambda cycle: (cycle.cycle_number, cycle.monitor_id.id), reverse=True)
+        page = cycles[:limit]
+        return {
+            'rows': page.read(list(self._CYCLE_PAGE_FIELDS)),
+            'next': [page[-1].cycle_number, page[-1].monitor_id.id] if len(cycles) > limit else None,
+            'total': self._count_cycles(monitor_ids),
+        }
 
     def action_refresh_dashboard(self):
         """Refresh dashboard data"""
         self.ensure_one()
         # Recompute all statistics
         self._compute_frequency_breakdown()
-        self._compute_cycle_data()
+        self._compute_cycle_count()
         self._compute_chart_data()
         return {
             'type': 'ir.actions.client',
@@ -172,79 +366,46 @@ class VibrationDashboard(models.Model):
             'context': {'create': True}
         }
 
-    def action_view_selected_logs(self):
-        """View logs for selected frequency"""
-        self.ensure_one()
-        if not self.selected_frequency:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'message': 'Please select a frequency first',
-                    'type': 'warning',
-                    'sticky': False,
-                }
+    def _notify_no_monitor(self):
+        """Warning returned by the actions when no monitor is selected"""
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'message': 'Please select a frequency or monitors first',
+                'type': 'warning',
+                'sticky': False,
             }
+        }
 
-        monitor = self.env['vibration.monitor'].search([
-            ('frequency_variant', '=', self.selected_frequency)
-        ], limit=1)
-
-        if not monitor:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'message': 'No monitor found for selected frequency',
-                    'type': 'warning',
-                    'sticky': False,
-                }
-            }
+    def action_view_selected_logs(self):
+        """View logs of the selected monitors"""
+        self.ensure_one()
+        if not self.monitor_ids:
+            return self._notify_no_monitor()
 
+        context = {'default_monitor_id': self.monitor_ids.id} if len(self.monitor_ids) == 1 else {}
         return {
-            'name': f'{self.selected_frequency.upper()} Data Logs',
+            'name': f'{(self.selected_frequency or "").upper()} Data Logs'.strip(),
             'type': 'ir.actions.act_window',
             'res_model': 'vibration.data.log',
             'view_mode': 'tree,form',
-            'domain': [('monitor_id', '=', monitor.id)],
-            'context': {'default_monitor_id': monitor.id},
+            'domain': [('monitor_id', 'in', self.monitor_ids.ids)],
+            'context': context,
         }
 
     def action_start_live_generation(self):
-        """Start live data generation for selected frequency"""
+        """Start live data generation for the selected monitors"""
         self.ensure_one()
-        if not self.selected_frequency:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'message': 'Please select a frequency first',
-                    'type': 'warning',
-                    'sticky': False,
-                }
-            }
+        if not self.monitor_ids:
+            return self._notify_no_monitor()
 
-        monitor = self.env['vibration.monitor'].search([
-            ('frequency_variant', '=', self.selected_frequency)
-        ], limit=1)
-
-        if not monitor:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'message': 'No monitor found for selected frequency',
-                    'type': 'warning',
-                    'sticky': False,
-                }
-            }
-
-        monitor.write({'is_live': True})
+        self.monitor_ids.write({'is_live': True})
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
-                'message': f'Live generation started for {self.selected_frequency.upper()}',
+                'message': f'Live generation started for {len(self.monitor_ids)} monitor(s)',
                 'type': 'success',
                 'sticky': False,
             }
@@ -253,16 +414,10 @@ class VibrationDashboard(models.Model):
     def action_stop_live_generation(self):
         """Stop live data generation"""
         self.ensure_one()
-        if not self.selected_frequency:
+        if not self.monitor_ids:
             return True
 
-        monitor = self.env['vibration.monitor'].search([
-            ('frequency_variant', '=', self.selected_frequency)
-        ], limit=1)
-
-        if monitor:
-            monitor.write({'is_live': False})
-
+        self.monitor_ids.write({'is_live': False})
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -273,50 +428,20 @@ class VibrationDashboard(models.Model):
             }
         }
 
-    @api.depends('selected_frequency')
+    @api.depends('monitor_ids.is_live')
     def _compute_is_live_running(self):
-        """Check if the selected frequency monitor is in live mode"""
+        """Check if any of the selected monitors is in live mode"""
         for record in self:
-            if record.selected_frequency:
-                monitor = self.env['vibration.monitor'].search([
-                    ('frequency_variant', '=', record.selected_frequency)
-                ], limit=1)
-                record.is_live_running = monitor.is_live if monitor else False
-            else:
-                record.is_live_running = False
+            record.is_live_running = any(record.monitor_ids.mapped('is_live'))
 
     def action_toggle_live_generation(self):
-        """Toggle live data generation for selected frequency"""
+        """Toggle live data generation for the selected monitors, all together"""
         self.ensure_one()
-        if not self.selected_frequency:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'message': 'Please select a frequency first',
-                    'type': 'warning',
-                    'sticky': False,
-                }
-            }
+        if not self.monitor_ids:
+            return self._notify_no_monitor()
 
-        monitor = self.env['vibration.monitor'].search([
-            ('frequency_variant', '=', self.selected_frequency)
-        ], limit=1)
-
-        if not monitor:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'message': 'No monitor found for selected frequency',
-                    'type': 'warning',
-                    'sticky': False,
-                }
-            }
-
-        # Toggle the is_live state
-        new_state = not monitor.is_live
-        monitor.write({'is_live': new_state})
+        # Stop everything if any is running, so the monitors end up in step
+        self.monitor_ids.write({'is_live': not self.is_live_running})
 
         return {
             'type': 'ir.actions.client',
@@ -325,14 +450,18 @@ class VibrationDashboard(models.Model):
 
     @api.model
     def generate_live_data_for_frequency(self, frequency_variant):
-        """Generate one second of data for specific frequency"""
-        monitor = self.env['vibration.monitor'].search([
+        """Generate one second of data for every live monitor of a frequency"""
+        monitors = self.env['vibration.monitor'].search([
             ('frequency_variant', '=', frequency_variant),
             ('is_live', '=', True)
-        ], limit=1)
+        ])
 
-        if not monitor:
+        if not monitors:
             return {'success': False, 'message': 'Monitor not in live mode'}
 
-        # Call the generation logic from monitor
-        return monitor.action_generate_next_record()
\ No newline at end of file
+        # Call the generation logic from each monitor
+        results = {monitor.id: monitor.action_generate_next_record() for monitor in monitors}
+        return {
+            'success': any(result['success'] for result in results.values()),
+            'monitors': results,
+        }
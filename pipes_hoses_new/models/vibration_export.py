@@ -0,0 +1,228 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from ..tools import export
+
+_logger = logging.getLogger(__name__)
+
+
+class VibrationMonitor(models.Model):
+    _inherit = 'vibration.monitor'
+
+    # Cycle records fetched per round trip of the export cursor
+    _EXPORT_FETCH_SECONDS = 200
+
+    def _iter_export(self, encoder, date_from=None, date_to=None, cycle_from=None, cycle_to=None, stats=None):
+        """Yield this monitor's samples in the given ranges, encoded chunk by chunk.
+
+        Samples are rebuilt from the cycle waveforms, which hold every
+        sample whether or not data log rows were written or compacted. The
+        records are read through a server-side cursor, _EXPORT_FETCH_SECONDS
+        at a time, so memory use does not depend on the length of the run.
+        Must be consumed within the transaction of ``self.env.cr``.
+
+        :param stats: optional dict filled with the exported seconds, samples,
+            bytes and duration
+        """
+        self.ensure_one()
+        self.env['vibration.cycle.data'].check_access('read')
+        self.env['vibration.cycle.data'].flush_model()
+        started = time.perf_counter()
+        seconds = samples = size = 0
+
+        conditions = [SQL("monitor_id = %s", self.id)]
+        if date_from:
+            conditions.append(SQL("timestamp >= %s", date_from))
+        if date_to:
+            conditions.append(SQL("timestamp <= %s", date_to))
+        if cycle_from:
+            conditions.append(SQL("cycle_number >= %s", cycle_from))
+        if cycle_to:
+            conditions.append(SQL("cycle_number <= %s", cycle_to))
+        cursor_name = SQL.identifier(f'vibration_export_{self.id}')
+        self.env.cr.execute(SQL(
+            """
+            DECLARE %s NO SCROLL CURSOR FOR
+             SELECT cycle_number, timestamp, waveform, all_data_points
+               FROM vibration_cycle_data
+              WHERE %s
+           ORDER BY cycle_number
+            """, cursor_name, SQL(" AND ").join(conditions),
+        ))
+
+        Cycle = self.env['vibration.cycle.data']
+        frequency = self.frequency_value
+        chunk = encoder.open()
+        try:
+            while True:
+                yield chunk
+                size += len(chunk)
+                self.env.cr.execute(SQL("FETCH %s FROM %s", self._EXPORT_FETCH_SECONDS, cursor_name))
+                rows = self.env.cr.fetchall()
+                if not rows:
+                    break
+                parts = []
+                for cycle_number, timestamp, data, all_data_points in rows:
+                    arrays = Cycle._decode_waveform(data, all_data_points)
+                    if arrays is not None and len(arrays['time']):
+                        parts.append(export.second_samples(cycle_number, timestamp, arrays, frequency))
+                seconds += len(rows)
+                if parts:
+                    chunk_samples = np.concatenate(parts)
+                    samples += len(chunk_samples)
+                    chunk = encoder.encode(chunk_samples)
+                else:
+                    chunk = b''
+            chunk = encoder.close()
+            yield chunk
+            size += len(chunk)
+        finally:
+            self.env.cr.execute(SQL("CLOSE %s", cursor_name))
+
+        duration = time.perf_counter() - started
+        if stats is not None:
+            stats.update(seconds=seconds, samples=samples, bytes=size, duration=duration)
+        _logger.info(
+            "Exported %s samples (%s seconds, %s bytes) of monitor %s in %.2fs: %.0f samples/s",
+            samples, seconds, size, self.id, duration, samples / duration if duration else 0.0)
+
+    def action_open_export_wizard(self):
+        self.ensure_one()
+        return {
+            'name': 'Export Samples',
+            'type': 'ir.actions.act_window',
+            'res_model': 'vibration.export.wizard',
+            'view_mode': 'form',
+            'target': 'new',
+            'context': {'default_monitor_id': self.id},
+        }
+
+
+class VibrationExportWizard(models.TransientModel):
+    _name = 'vibration.export.wizard'
+    _description = 'Vibration Samples Export'
+
+    monitor_id = fields.Many2one('vibration.monitor', string='Monitor', required=True, ondelete='cascade')
+    date_from = fields.Datetime(string='From')
+    date_to = fields.Datetime(string='To')
+    cycle_from = fields.Integer(string='From Sr. No.')
+    cycle_to = fields.Integer(string='To Sr. No.')
+    file_format = fields.Selection([
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet'),
+        ('run', 'Recorded Run'),
+    ], string='Format', required=True, default='csv')
+    destination = fields.Selection([
+        ('download', 'Download'),
+        ('attachment', 'Attachment on the monitor'),
+    ], string='Destination', required=True, default='download',
+        help='Downloads are streamed as they are read; attachments are written '
+             'to the filestore as they are read')
+
+    @api.constrains('date_from', 'date_to', 'cycle_from', 'cycle_to')
+    def _check_ranges(self):
+        for wizard in self:
+            if wizard.date_from and wizard.date_to and wizard.date_from > wizard.date_to:
+                raise ValidationError('The export must end after it starts.')
+            if wizard.cycle_from and wizard.cycle_to and wizard.cycle_from > wizard.cycle_to:
+                raise ValidationError('The last Sr. No. must not be below the first one.')
+
+    def _get_export_params(self):
+        self.ensure_one()
+        return {
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+            'cycle_from': self.cycle_from,
+            'cycle_to': self.cycle_to,
+        }
+
+    def _get_export_filename(self, encoder):
+        self.ensure_one()
+        return f'vibration_{self.monitor_id.frequency_variant}_{self.monitor_id.id}.{encoder.extension}'
+
+    def _get_encoder(self):
+        self.ensure_one()
+        try:
+            return export.get_encoder(self.file_format)
+        except ImportError as e:
+            raise UserError(str(e))
+
+    def _store_export(self, encoder, stats):
+        """Write the export into an attachment on the monitor, chunk by chunk.
+
+        With the default file storage, chunks are written straight into a
+        temporary file of the filestore, moved under its checksum once
+        complete, so the export is never held in memory. Attachments stored
+        in the database get the whole content in one value.
+        """
+        self.ensure_one()
+        Attachment = self.env['ir.attachment']
+        values = {
+            'name': self._get_export_filename(encoder),
+            'mimetype': encoder.content_type,
+            'res_model': 'vibration.monitor',
+            'res_id': self.monitor_id.id,
+        }
+        chunks = self.monitor_id._iter_export(encoder, stats=stats, **self._get_export_params())
+        if Attachment._storage() != 'file':
+            return Attachment.create(dict(values, raw=b''.join(chunks)))
+
+        directory = Attachment._filestore()
+        os.makedirs(directory, exist_ok=True)
+        sha = hashlib.sha1()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=directory, prefix='.vibration_export_', delete=False) as file:
+            try:
+                for chunk in chunks:
+                    file.write(chunk)
+                    sha.update(chunk)
+                    size += len(chunk)
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        checksum = sha.hexdigest()
+        store_fname = f'{checksum[:2]}/{checksum}'
+        full_path = Attachment._full_path(store_fname)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        os.replace(file.name, full_path)
+        # Collected with the other filestore files if the transaction rolls back
+        Attachment._mark_for_gc(store_fname)
+        return Attachment.create(dict(values, store_fname=store_fname, checksum=checksum, file_size=size))
+
+    def action_export(self):
+        self.ensure_one()
+        encoder = self._get_encoder()
+        if self.destination == 'download':
+            # Streamed by the controller, see controllers/main.py
+            return {
+                'type': 'ir.actions.act_url',
+                'url': f'/vibration/export/{self.id}',
+                'target': 'self',
+            }
+
+        stats = {}
+        attachment = self._store_export(encoder, stats)
+        rate = stats['samples'] / stats['duration'] if stats['duration'] else 0.0
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'message': f"Exported {stats['samples']} samples ({stats['seconds']} seconds) "
+                           f"in {stats['duration']:.1f}s, {rate:.0f} samples/s",
+                'type': 'success',
+                'sticky': False,
+                'next': {
+                    'type': 'ir.actions.act_url',
+                    'url': f'/web/content/{attachment.id}?download=true',
+                },
+            }
+        }
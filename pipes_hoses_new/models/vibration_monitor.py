@@ -1,8 +1,23 @@
 from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL, config
+from odoo.tools.sql import create_index
+import base64
 import json
+import itertools
+import logging
 import math
+import os
+import time
 from datetime import datetime, timedelta
 
+import numpy as np
+import psycopg2
+
+from ..tools import decimation, drift, instrumentation, live_buffer, metrics, synthesis, waveform
+
+_logger = logging.getLogger(__name__)
+
 
 class VibrationMonitor(models.Model):
     _name = 'vibration.monitor'
@@ -31,6 +46,33 @@ class VibrationMonitor(models.Model):
 
     cycle_data_ids = fields.One2many('vibration.cycle.data', 'monitor_id', string='Data')
 
+    samples_per_cycle = fields.Integer(
+        string='Samples per Cycle', default=8,
+        help='Evenly spaced samples taken over each cycle, from 0° (included) to 360° (excluded)')
+
+    drift_band_percent = fields.Float(
+        string='Drift Band (%)', default=10.0,
+        help='Tolerance on the deviation between actual and planned values, '
+             'as a percentage of the amplitude threshold')
+    # Online deviation statistics per sampled degree, see tools/drift.py
+    drift_state = fields.Json(string='Drift Statistics', readonly=True, copy=False)
+
+    # Peak displacement (R) of the planned sine per variant, in MM
+    _AMPLITUDE_MAP = {'2hz': 50, '3hz': 25, '5hz': 12.5, '7hz': 8.3}
+    # Bounds of samples_per_cycle; at the maximum a 7 Hz monitor yields 7168 samples per second
+    _MIN_SAMPLES_PER_CYCLE = 4
+    _MAX_SAMPLES_PER_CYCLE = 1024
+    # Denser seconds are only kept as packed waveforms, never as vibration.data.log rows
+    _DATA_LOG_MAX_SAMPLES_PER_SECOND = 128
+
+    @api.constrains('samples_per_cycle')
+    def _check_samples_per_cycle(self):
+        for record in self:
+            if not self._MIN_SAMPLES_PER_CYCLE <= record.samples_per_cycle <= self._MAX_SAMPLES_PER_CYCLE:
+                raise ValidationError(
+                    f'Samples per cycle must be between {self._MIN_SAMPLES_PER_CYCLE} '
+                    f'and {self._MAX_SAMPLES_PER_CYCLE}.')
+
     @api.depends('frequency_variant')
     def _compute_frequency_value(self):
         freq_map = {'2hz': 2, '3hz': 3, '5hz': 5, '7hz': 7}
@@ -61,8 +103,42 @@ class VibrationMonitor(models.Model):
             record.movement_cycles = cycles_map.get(record.frequency_variant, 0)
 
     def _get_sample_points_for_cycle(self):
-        """Generate 9 sample points per cycle (0° to 360° in 45° increments)"""
-        return [0, 45, 90, 135, 180, 225, 270, 315, 360]
+        """Sampled degrees of one cycle, samples_per_cycle of them evenly spaced from 0°"""
+        self.ensure_one()
+        return synthesis.grid_degrees(self.samples_per_cycle or 8)
+
+    def _get_planned_template(self):
+        """Return the shared planned-waveform template of this monitor's variant and sampling"""
+        self.ensure_one()
+        return synthesis.get_planned_template(
+            self.frequency_value,
+            self._AMPLITUDE_MAP.get(self.frequency_variant, 50),
+            self._get_sample_points_for_cycle(),
+        )
+
+    def _get_drift_band(self):
+        """Tolerance on the deviation, in MM, derived from the variant's amplitude threshold"""
+        self.ensure_one()
+        return self._AMPLITUDE_MAP.get(self.frequency_variant, 50) * self.drift_band_percent / 100.0
+
+    def _get_drift_detector(self):
+        """Return the drift detector of this monitor, restored from its persisted state"""
+        self.ensure_one()
+        return drift.DriftDetector(self._get_sample_points_for_cycle(), self.drift_state)
+
+    def action_reset_drift_state(self):
+        """Forget the deviation statistics, e.g. after a maintenance"""
+        self.write({'drift_state': False})
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Drift Statistics Reset',
+                'message': 'Deviation statistics will be rebuilt from the next samples',
+                'type': 'info',
+                'sticky': False,
+            }
+        }
 
     def _calculate_displacement(self, degree, amplitude):
         """Calculate displacement using sine wave formula"""
@@ -73,93 +149,258 @@ class VibrationMonitor(models.Model):
         """Generate simulated vibration data for testing - 1 record per second containing all cycles"""
         self.ensure_one()
 
-        amplitude_map = {
-            '2hz': 50,
-            '3hz': 25,
-            '5hz': 12.5,
-            '7hz': 8.3
-        }
-        max_amplitude = amplitude_map.get(self.frequency_variant, 50)
-
-        sample_degrees = self._get_sample_points_for_cycle()
-        num_cycles = int(self.frequency_value)  # Number of cycles in 1 second
-
         # Delete existing logs
         self.env['vibration.data.log'].search([('monitor_id', '=', self.id)]).unlink()
         self.env['vibration.cycle.data'].search([('monitor_id', '=', self.id)]).unlink()
 
-        start_time = datetime.now()
-        total_duration = 1.0  # 1 second total
-        cycle_duration = total_duration / num_cycles  # Duration per cycle
+        # Just 1 record representing 1 second
+        self.ingest_seconds([self._prepare_second_payload(1)])
 
-        # Create ONE cycle data record for the entire 1 second
-        cycle_data = {
-            'monitor_id': self.id,
-            'cycle_number': 1,  # Just 1 record representing 1 second
-            'timestamp': start_time,
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'reload',
         }
 
-        # Store all data points across all cycles in this one record
-        all_data_points = []
-
-        # Generate data for each cycle within the 1 second
-        for cycle in range(num_cycles):
-            cycle_start_time_offset = cycle * cycle_duration
-
-            # Generate data for each degree in this cycle
-            for i, degree in enumerate(sample_degrees):
-                time_offset_in_cycle = (i / (len(sample_degrees) - 1)) * cycle_duration
-                time_in_second = cycle_start_time_offset + time_offset_in_cycle
-                timestamp = start_time + timedelta(seconds=time_in_second)
-
-                planned_value = self._calculate_displacement(degree, max_amplitude)
-                # Add small variation for actual value (±5%)
-                import random
-                actual_value = planned_value * random.uniform(0.95, 1.05)
-
-                # Store data point
-                all_data_points.append({
-                    'cycle': cycle + 1,
-                    'degree': degree,
-                    'time': time_in_second,
-                    'planned': planned_value,
-                    'actual': actual_value
-                })
-
-                # FIXED: Store actual_value in amplitude field, not planned_value
-                self.env['vibration.data.log'].create({
-                    'monitor_id': self.id,
-                    'cycle_number': 1,  # All in the same 1-second record
-                    'sub_cycle_number': cycle + 1,  # Which cycle within the second
-                    'degree': degree,
-                    'dimension': round(planned_value, 2),  # Planned value stays here
-                    'amplitude': round(actual_value, 2),  # FIXED: Use actual_value here!
-                    'timestamp': timestamp,
-                    'time_in_cycle': round(time_offset_in_cycle, 4),
-                    'time_actual': round(time_in_second, 4),
-                })
-
-        # Store the first cycle's degree data in the main fields for compatibility
-        for i, degree in enumerate(sample_degrees):
-            first_cycle_point = all_data_points[i]
-            cycle_data[f'degree_{degree}_planned'] = round(first_cycle_point['planned'], 2)
-            cycle_data[f'degree_{degree}_actual'] = round(first_cycle_point['actual'], 2)
-            cycle_data[f'degree_{degree}_planned_time'] = round(first_cycle_point['time'], 4)
-            cycle_data[f'degree_{degree}_actual_time'] = round(first_cycle_point['time'], 4)
-
-        # Store all data points as JSON for the chart
-        cycle_data['all_data_points'] = json.dumps(all_data_points)
-
-        # Create the single cycle record
-        self.env['vibration.cycle.data'].create(cycle_data)
-
-        self.last_update = fields.Datetime.now()
+    def _prepare_second_payload(self, cycle_number, start_time=None, rng=None):
+        """Build one second of simulated samples in the format expected by ingest_seconds"""
+        return self._prepare_seconds_payload(cycle_number, 1, start_time, rng)[0]
+
+    def _prepare_seconds_payload(self, first_cycle_number, seconds, start_time=None, rng=None):
+        """Build ``seconds`` consecutive seconds of simulated samples in one vectorised call.
+
+        Pass a seeded ``numpy.random.Generator`` as ``rng`` for reproducible data.
+        """
+        self.ensure_one()
+
+        arrays = synthesis.synthesize_seconds(self._get_planned_template(), seconds=seconds, rng=rng)
+
+        start_time = start_time or datetime.now()
+        return [{
+            'monitor_id': self.id,
+            'cycle_number': first_cycle_number + index,
+            'timestamp': start_time + timedelta(seconds=index),
+            'samples': {name: values[index] for name, values in arrays.items()},
+        } for index in range(seconds)]
+
+    @api.model
+    @instrumentation.timed('ingest_seconds')
+    def ingest_seconds(self, seconds, publish=True):
+        """Bulk-ingest one or more seconds of samples for one or more monitors.
+
+        Each item of ``seconds`` is a dict with ``monitor_id``, ``cycle_number``,
+        ``timestamp`` and either ``samples``, a dict of equally long arrays
+        (``cycle``, ``degree``, ``time``, ``time_in_cycle``, ``planned``,
+        ``actual``) as built by ``_prepare_second_payload``, or ``points``, a
+        list of dicts with the same keys (convenient over RPC). All data log
+        rows are written with a single multi-row INSERT and the matching cycle
+        records, carrying the packed waveform, with one batched create, in the
+        current transaction.
+
+        Seconds denser than _DATA_LOG_MAX_SAMPLES_PER_SECOND get no data log
+        rows: their packed waveform is the raw record, and seconds on the
+        planned grid only store their actual column (see tools/waveform.py).
+        The throughput target is to ingest one second of every variant at
+        the maximum density (1024 samples per cycle, 17 408 samples in all)
+        in under 250 ms, a quarter of the live tick.
+
+        :param publish: push the new points to live dashboards and the live
+            buffers; bulk imports of recorded runs turn it off
+        :return: ingestion statistics (rows and samples written, per second)
+        """
+        started = time.perf_counter()
+
+        log_rows = []
+        cycle_vals_list = []
+        live_seconds = {}
+        # Per monitor: what the ingestion adds to its snapshot, see vibration.monitor.snapshot
+        snapshot_states = {}
+        frequency_by_monitor = {}
+        template_by_monitor = {}
+        detector_by_monitor = {}
+        band_by_monitor = {}
+        sample_count = 0
+        for second in seconds:
+            monitor_id = second['monitor_id']
+            cycle_number = second['cycle_number']
+            start_time = fields.Datetime.to_datetime(second['timestamp'])
+            samples = self._get_ingest_samples(second)
+            sample_count += len(samples['time'])
+            if monitor_id not in frequency_by_monitor:
+                monitor = self.browse(monitor_id)
+                frequency_by_monitor[monitor_id] = monitor.frequency_value
+                template_by_monitor[monitor_id] = monitor._get_planned_template()
+                detector_by_monitor[monitor_id] = monitor._get_drift_detector()
+                band_by_monitor[monitor_id] = monitor._get_drift_band()
+
+            state = snapshot_states.setdefault(
+                monitor_id, {'cycle_count': 0, 'data_log_count': 0, 'last_cycle_number': 0})
+            state['cycle_count'] += 1
+            if len(samples['time']) <= self._DATA_LOG_MAX_SAMPLES_PER_SECOND:
+                self._prepare_data_log_rows(log_rows, monitor_id, cycle_number, start_time, samples)
+                state['data_log_count'] += len(samples['time'])
+
+            drifted = detector_by_monitor[monitor_id].update(
+                samples['degree'], samples['actual'] - samples['planned'], band_by_monitor[monitor_id])
+            second_metrics = metrics.compute_metrics(
+                samples['time'], samples['planned'], samples['actual'], frequency_by_monitor[monitor_id])
+            second_metrics = {name: float(values[0]) for name, values in second_metrics.items()}
+            cycle_vals_list.append({
+                'monitor_id': monitor_id,
+                'cycle_number': cycle_number,
+                'timestamp': start_time,
+                'waveform': base64.b64encode(
+                    self._pack_second_waveform(samples, template_by_monitor[monitor_id])),
+                **second_metrics,
+                **self.env['vibration.cycle.data']._prepare_chart_values(
+                    samples, template_by_monitor[monitor_id]),
+                'is_drifting': bool(drifted),
+                'drift_degrees': ', '.join('%g' % degree for degree in drifted) or False,
+            })
+
+            if publish:
+                live_seconds.setdefault(monitor_id, []).append(
+                    (cycle_number, self._prepare_live_buffer_second(samples)))
+            if cycle_number >= state['last_cycle_number']:
+                state.update(second_metrics, last_cycle_number=cycle_number,
+                             last_timestamp=start_time, is_drifting=bool(drifted))
+
+        if log_rows:
+            self.env['vibration.data.log']._insert_rows(log_rows)
+        cycles = self.env['vibration.cycle.data'].create(cycle_vals_list)
+        if publish:
+            cycles._publish_live_points()
+            self._write_live_buffers_postcommit(live_seconds)
+        self.env['vibration.monitor.snapshot']._record_ingestion(snapshot_states)
+
+        now = fields.Datetime.now()
+        for monitor in self.browse(list(snapshot_states)):
+            monitor.write({
+                'total_records_generated': snapshot_states[monitor.id]['last_cycle_number'],
+                'last_update': now,
+                'drift_state': detector_by_monitor[monitor.id].to_state(),
+            })
+
+        duration = time.perf_counter() - started
+        rows = len(log_rows) + len(cycle_vals_list)
+        stats = {
+            'seconds': len(seconds),
+            'monitors': len(snapshot_states),
+            'rows': rows,
+            'samples': sample_count,
+            'duration': duration,
+            'rows_per_second': rows / duration if duration else 0.0,
+            'samples_per_second': sample_count / duration if duration else 0.0,
+        }
+        instrumentation.increment('vibration_ingested_rows_total', rows)
+        instrumentation.increment('vibration_ingested_samples_total', sample_count)
+        instrumentation.increment('vibration_ingested_seconds_total', len(seconds))
+        if cycle_vals_list:
+            # One observation per ingestion: the mean stored chart payload of its seconds
+            instrumentation.observe(
+                'vibration_payload_bytes',
+                sum(len(vals['chart_data']) for vals in cycle_vals_list) / len(cycle_vals_list),
+                instrumentation.BYTES_BUCKETS, path='cycle_chart_data')
+        _logger.debug(
+            "Ingested %(samples)s samples in %(rows)s rows (%(seconds)s s for %(monitors)s monitors) "
+            "in %(duration).4fs: %(samples_per_second).0f samples/s", stats)
+        return stats
+
+    @api.model
+    def _prepare_data_log_rows(self, log_rows, monitor_id, cycle_number, start_time, samples):
+        """Append the vibration.data.log rows of one second to ``log_rows``"""
+        timestamps = np.datetime64(start_time, 'us') + np.round(
+            samples['time'] * 1e6).astype('timedelta64[us]')
+        log_rows.extend(zip(
+            itertools.repeat(monitor_id),
+            itertools.repeat(cycle_number),
+            samples['cycle'].astype(int).tolist(),
+            samples['degree'].tolist(),
+            np.round(samples['planned'], 2).tolist(),
+            np.round(samples['actual'], 2).tolist(),
+            timestamps.tolist(),
+            np.round(samples['time_in_cycle'], 4).tolist(),
+            np.round(samples['time'], 4).tolist(),
+        ))
+
+    @api.model
+    def _pack_second_waveform(self, samples, template):
+        """Pack one second, storing only the actual column when it lies on the planned grid"""
+        on_grid = (
+            len(samples['time']) == len(template.time)
+            and np.allclose(samples['degree'], template.degree, atol=1e-3)
+            and np.allclose(samples['time'], template.time, atol=1e-6)
+        )
+        if on_grid:
+            return waveform.pack_gridded(
+                template.frequency, template.amplitude, len(template.sample_degrees), samples['actual'])
+        return waveform.pack_waveform(*(samples[name] for name in waveform.WAVEFORM_COLUMNS))
+
+    @api.model
+    def _get_ingest_samples(self, second):
+        """Return the samples of one ingested second as float64 NumPy arrays"""
+        if 'samples' in second:
+            samples = second['samples']
+        else:
+            samples = {
+                name: [point[name] for point in second['points']]
+                for name in waveform.WAVEFORM_COLUMNS + ('time_in_cycle',)
+                if second['points'] and name in second['points'][0]
+            }
+        samples = {name: np.asarray(values, dtype=np.float64) for name, values in samples.items()}
+        if 'planned' not in samples:
+            # Acquired data only carries the actual trace
+            template = self.browse(second['monitor_id'])._get_planned_template()
+            samples['planned'] = template.planned_at(samples['degree'])
+        return samples
+
+    def _get_live_buffer_path(self):
+        """Path of the memory-mapped ring of this monitor's recent seconds, shared by the host's workers"""
+        self.ensure_one()
+        # The layout is part of the name, so that changing it never remaps a live file
+        return os.path.join(
+            config['data_dir'], 'vibration_live', self.env.cr.dbname,
+            f'monitor_{self.id}_{live_buffer.DEFAULT_SLOTS}x{live_buffer.DEFAULT_CAPACITY}.ring')
 
+    def _get_live_buffer(self):
+        """Return the shared ring of this monitor's recent seconds, or None if it cannot be opened"""
+        self.ensure_one()
+        try:
+            return live_buffer.get_buffer(self._get_live_buffer_path())
+        except OSError:
+            _logger.warning("Cannot open the live buffer of vibration monitor %s", self.id, exc_info=True)
+            return None
+
+    @api.model
+    def _prepare_live_buffer_second(self, samples):
+        """Reduce one ingested second to the live buffer columns, within its slot capacity"""
+        keep = slice(None)
+        if len(samples['time']) > live_buffer.DEFAULT_CAPACITY:
+            keep = decimation.minmax_indices(samples['actual'], live_buffer.DEFAULT_CAPACITY)
         return {
-            'type': 'ir.actions.client',
-            'tag': 'reload',
+            'time': samples['time'][keep],
+            'degree': samples['degree'][keep],
+            'actual': samples['actual'][keep],
+            'cycle': samples['cycle'][keep],
         }
 
+    @api.model
+    def _write_live_buffers_postcommit(self, live_seconds):
+        """Append ingested seconds to the monitors' live buffers once the transaction commits"""
+        monitors = self.browse(list(live_seconds))
+
+        def write_live_buffers():
+            for monitor in monitors:
+                buffer = monitor._get_live_buffer()
+                if buffer is not None:
+                    buffer.write(live_seconds[monitor.id])
+
+        self.env.cr.postcommit.add(write_live_buffers)
+
+    def _get_live_channel(self):
+        """Bus channel on which the monitor's newly ingested chart points are pushed"""
+        self.ensure_one()
+        return f'vibration_monitor_{self.id}'
+
     def action_connect_plc(self):
         """Connect to PLC"""
         self.ensure_one()
@@ -175,11 +416,13 @@ class VibrationMonitor(models.Model):
             }
 
         self.is_connected = True
+        # Acquisition runs server-side, see _cron_live_generation
+        self.env.ref('pipes_hoses_new.ir_cron_live_generation')._trigger()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
-                'message': f'Connected to PLC at {self.plc_ip_address} (Simulated)',
+                'message': f'Acquiring {self.plc_tag} from PLC at {self.plc_ip_address}:{self.plc_port}',
                 'type': 'info',
                 'sticky': False,
             }
@@ -236,21 +479,10 @@ class VibrationMonitor(models.Model):
             }
         }
 
+    # Read from the monitor's snapshot, see models/vibration_snapshot.py
     data_log_count = fields.Integer(string='Data Log Count', compute='_compute_data_log_count')
     cycle_data_count = fields.Integer(string='Cycle Count', compute='_compute_cycle_data_count')
 
-    def _compute_data_log_count(self):
-        for record in self:
-            record.data_log_count = self.env['vibration.data.log'].search_count([
-                ('monitor_id', '=', record.id)
-            ])
-
-    def _compute_cycle_data_count(self):
-        for record in self:
-            record.cycle_data_count = self.env['vibration.cycle.data'].search_count([
-                ('monitor_id', '=', record.id)
-            ])
-
     def action_view_data_logs(self):
         self.ensure_one()
         return {
@@ -285,80 +517,14 @@ class VibrationMonitor(models.Model):
         if not self.is_live:
             return {'success': False}
 
-        amplitude_map = {
-            '2hz': 50, '3hz': 25, '5hz': 12.5, '7hz': 8.3
-        }
-        max_amplitude = amplitude_map.get(self.frequency_variant, 50)
-        sample_degrees = self._get_sample_points_for_cycle()
-        num_cycles = int(self.frequency_value)
-
         # Get current record number
         current_record_num = self.total_records_generated + 1
-
-        start_time = datetime.now()
-        total_duration = 1.0
-        cycle_duration = total_duration / num_cycles
-
-        all_data_points = []
-
-        # Generate data for all cycles in this 1 second
-        for cycle in range(num_cycles):
-            cycle_start_time_offset = cycle * cycle_duration
-
-            for i, degree in enumerate(sample_degrees):
-                time_offset_in_cycle = (i / (len(sample_degrees) - 1)) * cycle_duration
-                time_in_second = cycle_start_time_offset + time_offset_in_cycle
-                timestamp = start_time + timedelta(seconds=time_in_second)
-
-                planned_value = self._calculate_displacement(degree, max_amplitude)
-                import random
-                actual_value = planned_value * random.uniform(0.95, 1.05)
-
-                all_data_points.append({
-                    'cycle': cycle + 1,
-                    'degree': degree,
-                    'time': time_in_second,
-                    'planned': planned_value,
-                    'actual': actual_value
-                })
-
-                # Create data log
-                self.env['vibration.data.log'].create({
-                    'monitor_id': self.id,
-                    'cycle_number': current_record_num,
-                    'sub_cycle_number': cycle + 1,
-                    'degree': degree,
-                    'dimension': round(planned_value, 2),
-                    'amplitude': round(actual_value, 2),
-                    'timestamp': timestamp,
-                    'time_in_cycle': round(time_offset_in_cycle, 4),
-                    'time_actual': round(time_in_second, 4),
-                })
-
-        # Create cycle data record
-        cycle_data = {
-            'monitor_id': self.id,
-            'cycle_number': current_record_num,
-            'timestamp': start_time,
-            'all_data_points': json.dumps(all_data_points)
-        }
-
-        # Add first cycle data to fields
-        for i, degree in enumerate(sample_degrees):
-            first_cycle_point = all_data_points[i]
-            cycle_data[f'degree_{degree}_planned'] = round(first_cycle_point['planned'], 2)
-            cycle_data[f'degree_{degree}_actual'] = round(first_cycle_point['actual'], 2)
-            cycle_data[f'degree_{degree}_planned_time'] = round(first_cycle_point['time'], 4)
-            cycle_data[f'degree_{degree}_actual_time'] = round(first_cycle_point['time'], 4)
-
-        self.env['vibration.cycle.data'].create(cycle_data)
-
-        # Update counter
-        self.write({'total_records_generated': current_record_num})
+        stats = self.ingest_seconds([self._prepare_second_payload(current_record_num)])
 
         return {
             'success': True,
-            'total_records': current_record_num
+            'total_records': current_record_num,
+            'rows_per_second': stats['rows_per_second'],
         }
 
 
@@ -377,6 +543,65 @@ class VibrationDataLog(models.Model):
     time_in_cycle = fields.Float(string='Time in Cycle')
     time_actual = fields.Float(string='Time in Second')
 
+    _INSERT_COLUMNS = (
+        'monitor_id', 'cycle_number', 'sub_cycle_number', 'degree', 'dimension',
+        'amplitude', 'timestamp', 'time_in_cycle', 'time_actual',
+    )
+
+    def init(self):
+        # Compaction looks up and deletes time windows per monitor
+        create_index(self.env.cr, 'vibration_data_log_monitor_timestamp_idx',
+                     self._table, ['monitor_id', 'timestamp'])
+
+    @api.model
+    def _insert_rows(self, rows):
+        """Insert raw sample rows (tuples ordered as _INSERT_COLUMNS) in one statement.
+
+        This bypasses create() on purpose: data logs have no computed fields or
+        relations to maintain, and the per-record ORM overhead dominates at
+        live sampling rates.
+        """
+        if not rows:
+            return
+        self.flush_model()
+        uid = self.env.uid
+        now = self.env.cr.now()
+        columns = SQL(", ").join(
+            SQL.identifier(name)
+            for name in self._INSERT_COLUMNS + ('create_uid', 'create_date', 'write_uid', 'write_date')
+        )
+        values = SQL(", ").join(
+            SQL("(%s)", SQL(", ").join(row + (uid, now, uid, now)))
+            for row in rows
+        )
+        self.env.cr.execute(SQL(
+            "INSERT INTO %s (%s) VALUES %s",
+            SQL.identifier(self._table), columns, values,
+        ))
+
+
+class PackedBinary(fields.Binary):
+    """Binary field whose column holds the raw bytes rather than their base64.
+
+    Values are base64 in the cache and through the ORM, like any Binary.
+    Rows written before the column held raw bytes still hold base64, told
+    apart by the packed waveform's magic, until _migrate_legacy_payloads
+    converts them.
+    """
+
+    def convert_to_column(self, value, record, values=None, validate=True):
+        if not value:
+            return None
+        if isinstance(value, str):
+            value = value.encode()
+        return psycopg2.Binary(base64.b64decode(value))
+
+    def convert_to_cache(self, value, record, validate=True):
+        if isinstance(value, memoryview):
+            value = bytes(value)
+            return base64.b64encode(value) if value.startswith(waveform.WAVEFORM_MAGIC) else value
+        return super().convert_to_cache(value, record, validate)
+
 
 class VibrationCycleData(models.Model):
     _name = 'vibration.cycle.data'
@@ -390,96 +615,386 @@ class VibrationCycleData(models.Model):
     frequency_value = fields.Float(string='Frequency (Hz)', related='monitor_id.frequency_value', store=False)
 
 
-    # Store all data points for multiple cycles in JSON format
+    # Packed float32 samples for every cycle in the second, see tools/waveform.py
+    waveform = PackedBinary(string='Waveform', attachment=False)
+
+    # Legacy JSON payload, only set on rows that predate the packed waveform
     all_data_points = fields.Text(string='All Data Points (JSON)')
 
-    # Keep the original fields for first cycle (for backward compatibility)
+    # Original fields for the first cycle (for backward compatibility), decoded
+    # from the waveform only when a view reads them
     # 0 degree
-    degree_0_planned = fields.Float(string='0° Planned Value')
-    degree_0_actual = fields.Float(string='0° Actual Value')
-    degree_0_planned_time = fields.Float(string='0° Planned Time')
-    degree_0_actual_time = fields.Float(string='0° Actual Time')
+    degree_0_planned = fields.Float(string='0° Planned Value', compute='_compute_legacy_degree_values')
+    degree_0_actual = fields.Float(string='0° Actual Value', compute='_compute_legacy_degree_values')
+    degree_0_planned_time = fields.Float(string='0° Planned Time', compute='_compute_legacy_degree_values')
+    degree_0_actual_time = fields.Float(string='0° Actual Time', compute='_compute_legacy_degree_values')
 
     # 45 degree
-    degree_45_planned = fields.Float(string='45° Planned Value')
-    degree_45_actual = fields.Float(string='45° Actual Value')
-    degree_45_planned_time = fields.Float(string='45° Planned Time')
-    degree_45_actual_time = fields.Float(string='45° Actual Time')
+    degree_45_planned = fields.Float(string='45° Planned Value', compute='_compute_legacy_degree_values')
+    degree_45_actual = fields.Float(string='45° Actual Value', compute='_compute_legacy_degree_values')
+    degree_45_planned_time = fields.Float(string='45° Planned Time', compute='_compute_legacy_degree_values')
+    degree_45_actual_time = fields.Float(string='45° Actual Time', compute='_compute_legacy_degree_values')
 
     # 90 degree
-    degree_90_planned = fields.Float(string='90° Planned Value')
-    degree_90_actual = fields.Float(string='90° Actual Value')
-    degree_90_planned_time = fields.Float(string='90° Planned Time')
-    degree_90_actual_time = fields.Float(string='90° Actual Time')
+    degree_90_planned = fields.Float(string='90° Planned Value', compute='_compute_legacy_degree_values')
+    degree_90_actual = fields.Float(string='90° Actual Value', compute='_compute_legacy_degree_values')
+    degree_90_planned_time = fields.Float(string='90° Planned Time', compute='_compute_legacy_degree_values')
+    degree_90_actual_time = fields.Float(string='90° Actual Time', compute='_compute_legacy_degree_values')
 
     # 135 degree
-    degree_135_planned = fields.Float(string='135° Planned Value')
-    degree_135_actual = fields.Float(string='135° Actual Value')
-    degree_135_planned_time = fields.Float(string='135° Planned Time')
-    degree_135_actual_time = fields.Float(string='135° Actual Time')
+    degree_135_planned = fields.Float(string='135° Planned Value', compute='_compute_legacy_degree_values')
+    degree_135_actual = fields.Float(string='135° Actual Value', compute='_compute_legacy_degree_values')
+    degree_135_planned_time = fields.Float(string='135° Planned Time', compute='_compute_legacy_degree_values')
+    degree_135_actual_time = fields.Float(string='135° Actual Time', compute='_compute_legacy_degree_values')
 
     # 180 degree
-    degree_180_planned = fields.Float(string='180° Planned Value')
-    degree_180_actual = fields.Float(string='180° Actual Value')
-    degree_180_planned_time = fields.Float(string='180° Planned Time')
-    degree_180_actual_time = fields.Float(string='180° Actual Time')
+    degree_180_planned = fields.Float(string='180° Planned Value', compute='_compute_legacy_degree_values')
+    degree_180_actual = fields.Float(string='180° Actual Value', compute='_compute_legacy_degree_values')
+    degree_180_planned_time = fields.Float(string='180° Planned Time', compute='_compute_legacy_degree_values')
+    degree_180_actual_time = fields.Float(string='180° Actual Time', compute='_compute_legacy_degree_values')
 
     # 225 degree
-    degree_225_planned = fields.Float(string='225° Planned Value')
-    degree_225_actual = fields.Float(string='225° Actual Value')
-    degree_225_planned_time = fields.Float(string='225° Planned Time')
-    degree_225_actual_time = fields.Float(string='225° Actual Time')
+    degree_225_planned = fields.Float(string='225° Planned Value', compute='_compute_legacy_degree_values')
+    degree_225_actual = fields.Float(string='225° Actual Value', compute='_compute_legacy_degree_values')
+    degree_225_planned_time = fields.Float(string='225° Planned Time', compute='_compute_legacy_degree_values')
+    degree_225_actual_time = fields.Float(string='225° Actual Time', compute='_compute_legacy_degree_values')
 
     # 270 degree
-    degree_270_planned = fields.Float(string='270° Planned Value')
-    degree_270_actual = fields.Float(string='270° Actual Value')
-    degree_270_planned_time = fields.Float(string='270° Planned Time')
-    degree_270_actual_time = fields.Float(string='270° Actual Time')
+    degree_270_planned = fields.Float(string='270° Planned Value', compute='_compute_legacy_degree_values')
+    degree_270_actual = fields.Float(string='270° Actual Value', compute='_compute_legacy_degree_values')
+    degree_270_planned_time = fields.Float(string='270° Planned Time', compute='_compute_legacy_degree_values')
+    degree_270_actual_time = fields.Float(string='270° Actual Time', compute='_compute_legacy_degree_values')
 
     # 315 degree
-    degree_315_planned = fields.Float(string='315° Planned Value')
-    degree_315_actual = fields.Float(string='315° Actual Value')
-    degree_315_planned_time = fields.Float(string='315° Planned Time')
-    degree_315_actual_time = fields.Float(string='315° Actual Time')
+    degree_315_planned = fields.Float(string='315° Planned Value', compute='_compute_legacy_degree_values')
+    degree_315_actual = fields.Float(string='315° Actual Value', compute='_compute_legacy_degree_values')
+    degree_315_planned_time = fields.Float(string='315° Planned Time', compute='_compute_legacy_degree_values')
+    degree_315_actual_time = fields.Float(string='315° Actual Time', compute='_compute_legacy_degree_values')
 
     # 360 degree
-    degree_360_planned = fields.Float(string='360° Planned Value')
-    degree_360_actual = fields.Float(string='360° Actual Value')
-    degree_360_planned_time = fields.Float(string='360° Planned Time')
-    degree_360_actual_time = fields.Float(string='360° Actual Time')
+    degree_360_planned = fields.Float(string='360° Planned Value', compute='_compute_legacy_degree_values')
+    degree_360_actual = fields.Float(string='360° Actual Value', compute='_compute_legacy_degree_values')
+    degree_360_planned_time = fields.Float(string='360° Planned Time', compute='_compute_legacy_degree_values')
+    degree_360_actual_time = fields.Float(string='360° Actual Time', compute='_compute_legacy_degree_values')
+
+    # Chart payloads, built once at ingestion (see _prepare_chart_values); the
+    # sparkline is the compact form drawn in list rows
+    chart_data = fields.Text(string='Chart', readonly=True)
+    chart_sparkline = fields.Char(string='Sparkline', readonly=True)
+
+    # Per-second metrics, computed at ingestion (see tools/metrics.py) and
+    # indexed so that history can be filtered and sorted in SQL
+    deviation_rms = fields.Float(string='Deviation RMS (MM)', digits=(16, 4), index=True, readonly=True)
+    peak_to_peak = fields.Float(string='Peak to Peak (MM)', digits=(16, 2), index=True, readonly=True)
+    crest_factor = fields.Float(string='Crest Factor', digits=(16, 3), index=True, readonly=True)
+    phase_lag = fields.Float(string='Phase Lag (°)', digits=(16, 2), index=True, readonly=True)
+    dominant_frequency = fields.Float(string='Dominant Frequency (Hz)', digits=(16, 2), index=True, readonly=True)
+
+    # Set at ingestion by the monitor's online drift detector
+    is_drifting = fields.Boolean(string='Drifting', index=True, readonly=True)
+    drift_degrees = fields.Char(string='Drifting Degrees', readonly=True)
+
+    _LEGACY_DEGREES = (0, 45, 90, 135, 180, 225, 270, 315, 360)
+    # Last id converted by _migrate_legacy_payloads
+    _PAYLOAD_MIGRATION_PARAM = 'pipes_hoses_new.payload_migration_id'
+    # Point budget per series for the per-second chart, decimated with LTTB
+    _CHART_MAX_POINTS = 1000
+    # Values of the sparkline, decimated with min/max to keep the peaks
+    _SPARKLINE_POINTS = 64
+
+    def init(self):
+        # Chart and delta reads are keyset ranges on cycle_number per monitor
+        create_index(self.env.cr, 'vibration_cycle_data_monitor_cycle_idx',
+                     self._table, ['monitor_id', 'cycle_number'])
+
+    def unlink(self):
+        monitors = self.monitor_id
+
+        def clear_live_buffers():
+            for monitor in monitors:
+                buffer = monitor._get_live_buffer()
+                if buffer is not None:
+                    buffer.clear()
+
+        self.env.cr.postcommit.add(clear_live_buffers)
+        return super().unlink()
+
+    def _get_waveform_arrays(self):
+        """Return the samples of this record as NumPy arrays, or None if it has none"""
+        self.ensure_one()
+        return self._decode_waveform(self.with_context(bin_size=False).waveform, self.all_data_points)
+
+    @api.model
+    def _decode_waveform(self, data, all_data_points):
+        """Samples of a record as NumPy arrays, from its waveform or legacy JSON points.
+
+        ``data`` is the packed waveform, raw as read from the column or base64
+        as read through the ORM.
+        """
+        if data:
+            data = bytes(data)
+            if not data.startswith(waveform.WAVEFORM_MAGIC):
+                data = base64.b64decode(data)
+            return waveform.unpack_waveform(data)
+        if all_data_points:
+            try:
+                return waveform.points_to_arrays(json.loads(all_data_points))
+            except (ValueError, KeyError, TypeError):
+                return None
+        return None
+
+    @api.depends('waveform', 'all_data_points')
+    def _compute_legacy_degree_values(self):
+        for record in self:
+            values = {}
+            for degree in self._LEGACY_DEGREES:
+                for suffix in ('planned', 'actual', 'planned_time', 'actual_time'):
+                    values[f'degree_{degree}_{suffix}'] = 0.0
+
+            arrays = record._get_waveform_arrays()
+            if arrays is not None and len(arrays['cycle']):
+                first_cycle = arrays['cycle'] == arrays['cycle'][0]
+                for degree, sample_time, planned, actual in zip(
+                        arrays['degree'][first_cycle], arrays['time'][first_cycle],
+                        arrays['planned'][first_cycle], arrays['actual'][first_cycle]):
+                    if abs(degree - round(float(degree))) > 1e-3:
+                        continue
+                    prefix = f'degree_{int(round(float(degree)))}'
+                    if f'{prefix}_planned' not in values:
+                        continue
+                    values[f'{prefix}_planned'] = round(float(planned), 2)
+                    values[f'{prefix}_actual'] = round(float(actual), 2)
+                    values[f'{prefix}_planned_time'] = round(float(sample_time), 4)
+                    values[f'{prefix}_actual_time'] = round(float(sample_time), 4)
+            record.update(values)
+
+    @api.model
+    def _prepare_chart_values(self, arrays, template):
+        """Stored chart payload and sparkline of one second's samples (``cycle``, ``degree``, ``time``, ``actual``).
+
+        Called once per ingested second: timed as part of ingest_seconds, not on its own.
+        """
+        if arrays is None or not len(arrays['time']):
+            return {'chart_data': json.dumps({'actual': []}), 'chart_sparkline': '[]'}
+
+        actual = np.asarray(arrays['actual'], dtype=np.float64)
+        keep = decimation.decimate_indices(arrays['time'], actual, self._CHART_MAX_POINTS, method='lttb')
+
+        # The planned trace is looked up by degree in the template client-side
+        actual_data = [{
+            'degree': degree,
+            'time': sample_time,
+            'value': value,
+            'cycle': cycle
+        } for cycle, degree, sample_time, value in zip(
+            np.asarray(arrays['cycle'])[keep].astype(int).tolist(),
+            np.round(np.asarray(arrays['degree'], dtype=np.float64)[keep], 4).tolist(),
+            np.round(np.asarray(arrays['time'], dtype=np.float64)[keep], 4).tolist(),
+            np.round(actual[keep], 2).tolist())]
+
+        sparkline = np.round(actual[decimation.minmax_indices(actual, self._SPARKLINE_POINTS)], 2)
+        chart_data = json.dumps({'actual': actual_data, 'template': template.to_dict()})
+        return {
+            'chart_data': chart_data,
+            'chart_sparkline': json.dumps(sparkline.tolist(), separators=(',', ':')),
+        }
+
+    def _publish_live_points(self):
+        """Push the chart points of these newly ingested records on their monitors' bus channels.
+
+        Sent once per monitor and ingestion, whatever the number of clients
+        listening; the bus only delivers it once the transaction commits.
+        """
+        Dashboard = self.env['vibration.dashboard']
+        for monitor in self.monitor_id:
+            cycles = self.filtered(lambda cycle: cycle.monitor_id == monitor).sorted('cycle_number')
+            first_cycle = cycles[0].cycle_number
+            payload = Dashboard._prepare_chart_payload(cycles, first_cycle - 1)
+            payload.update(monitor_id=monitor.id, first_cycle=first_cycle)
+            self.env['bus.bus']._sendone(monitor._get_live_channel(), 'vibration_points', payload)
+
+    @api.model
+    def _backfill_metrics(self, batch_size=1000, max_batches=None):
+        """Compute the metrics of records ingested before they existed, ``batch_size`` at a time.
+
+        Records of a batch sharing a frequency and a time grid are computed in
+        one vectorised call and written back with a single UPDATE.
+
+        :return: True if records without metrics remain
+        """
+        self.flush_model()
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            self.env.cr.execute(SQL(
+                "SELECT id FROM vibration_cycle_data WHERE deviation_rms IS NULL ORDER BY id LIMIT %s",
+                batch_size,
+            ))
+            ids = [row[0] for row in self.env.cr.fetchall()]
+            if not ids:
+                return False
+
+            groups = {}
+            values_by_id = {}
+            for record in self.browse(ids):
+                arrays = record._get_waveform_arrays()
+                if arrays is None or not len(arrays['time']):
+                    # Nothing to measure, store zeros so the record is not picked again
+                    values_by_id[record.id] = dict.fromkeys(metrics.METRIC_NAMES, 0.0)
+                    continue
+                key = (record.monitor_id.frequency_value, arrays['time'].tobytes())
+                groups.setdefault(key, []).append((record.id, arrays))
+
+            for (frequency, __), members in groups.items():
+                batch_metrics = metrics.compute_metrics(
+                    members[0][1]['time'],
+                    np.stack([arrays['planned'] for __, arrays in members]),
+                    np.stack([arrays['actual'] for __, arrays in members]),
+                    frequency,
+                )
+                for position, (record_id, __) in enumerate(members):
+                    values_by_id[record_id] = {
+                        name: float(values[position]) for name, values in batch_metrics.items()}
+
+            self.env.cr.execute(SQL(
+                """
+                UPDATE vibration_cycle_data AS cycle
+                   SET deviation_rms = v.deviation_rms,
+                       peak_to_peak = v.peak_to_peak,
+                       crest_factor = v.crest_factor,
+                       phase_lag = v.phase_lag,
+                       dominant_frequency = v.dominant_frequency
+                  FROM (VALUES %s) AS v(id, deviation_rms, peak_to_peak, crest_factor,
+                                        phase_lag, dominant_frequency)
+                 WHERE cycle.id = v.id
+                """,
+                SQL(', ').join(
+                    SQL('(%s, %s, %s, %s, %s, %s)', record_id, *(values[name] for name in metrics.METRIC_NAMES))
+                    for record_id, values in values_by_id.items()
+                ),
+            ))
+            self.invalidate_model(list(metrics.METRIC_NAMES))
+            batches += 1
+            _logger.info("Computed metrics of %s vibration cycle records", len(values_by_id))
+        return True
 
-    chart_data = fields.Text(string='Chart', compute='_compute_chart_data')
+    @api.model
+    def _cron_backfill_metrics(self):
+        """Backfill missing metrics a few batches per run, re-triggering until done"""
+        if self._backfill_metrics(max_batches=20):
+            self.env.ref('pipes_hoses_new.ir_cron_backfill_cycle_metrics')._trigger()
+
+    @api.model
+    def _backfill_charts(self, batch_size=1000, max_batches=None):
+        """Store the chart payloads of records ingested before they were stored, ``batch_size`` at a time.
+
+        :return: True if records without a chart payload remain
+        """
+        self.flush_model()
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            self.env.cr.execute(SQL(
+                "SELECT id FROM vibration_cycle_data WHERE chart_sparkline IS NULL ORDER BY id LIMIT %s",
+                batch_size,
+            ))
+            ids = [row[0] for row in self.env.cr.fetchall()]
+            if not ids:
+                return False
+
+            values_by_id = {
+                record.id: self._prepare_chart_values(
+                    record._get_waveform_arrays(), record.monitor_id._get_planned_template())
+                for record in self.browse(ids)
+            }
+            self.env.cr.execute(SQL(
+                """
+                UPDATE vibration_cycle_data AS cycle
+                   SET chart_data = v.chart_data,
+                       chart_sparkline = v.chart_sparkline
+                  FROM (VALUES %s) AS v(id, chart_data, chart_sparkline)
+                 WHERE cycle.id = v.id
+                """,
+                SQL(', ').join(
+                    SQL('(%s, %s, %s)', record_id, values['chart_data'], values['chart_sparkline'])
+                    for record_id, values in values_by_id.items()
+                ),
+            ))
+            self.invalidate_model(['chart_data', 'chart_sparkline'])
+            batches += 1
+            _logger.info("Stored the chart payloads of %s vibration cycle records", len(values_by_id))
+        return True
 
-    @api.depends('all_data_points')
-    def _compute_chart_data(self):
-        for record in self:
-            if record.all_data_points:
-                # Use the all_data_points JSON which contains all cycles
-                try:
-                    all_points = json.loads(record.all_data_points)
-
-                    planned_data = []
-                    actual_data = []
-
-                    for point in all_points:
-                        planned_data.append({
-                            'degree': point['degree'],
-                            'time': point['time'],
-                            'value': point['planned'],
-                            'cycle': point['cycle']
-                        })
-                        actual_data.append({
-                            'degree': point['degree'],
-                            'time': point['time'],
-                            'value': point['actual'],
-                            'cycle': point['cycle']
-                        })
-
-                    record.chart_data = json.dumps({
-                        'planned': planned_data,
-                        'actual': actual_data
-                    })
-                except:
-                    record.chart_data = json.dumps({'planned': [], 'actual': []})
-            else:
-                record.chart_data = json.dumps({'planned': [], 'actual': []})
\ No newline at end of file
+    @api.model
+    def _cron_backfill_charts(self):
+        """Backfill missing chart payloads a few batches per run, re-triggering until done"""
+        if self._backfill_charts(max_batches=20):
+            self.env.ref('pipes_hoses_new.ir_cron_backfill_cycle_charts')._trigger()
+
+    @api.model
+    def _migrate_legacy_payloads(self, batch_size=1000, max_batches=None):
+        """Convert legacy payloads to raw packed waveforms, ``batch_size`` ids at a time.
+
+        Rows still carrying the JSON payload get their packed waveform, and
+        waveforms stored as base64 are decoded in place, one id range per
+        statement. The range reached is kept in a system parameter, so each
+        run resumes where the previous one stopped.
+
+        :return: True if ids remain to be converted
+        """
+        self.flush_model()
+        Param = self.env['ir.config_parameter'].sudo()
+        last_id = int(Param.get_param(self._PAYLOAD_MIGRATION_PARAM, 0))
+        self.env.cr.execute(SQL("SELECT max(id) FROM vibration_cycle_data"))
+        max_id = self.env.cr.fetchone()[0] or 0
+        batches = 0
+        while last_id < max_id and (max_batches is None or batches < max_batches):
+            end_id = last_id + batch_size
+            self.env.cr.execute(SQL(
+                """
+                UPDATE vibration_cycle_data
+                   SET waveform = decode(convert_from(waveform, 'UTF8'), 'base64')
+                 WHERE id > %(start)s AND id <= %(end)s
+                   AND waveform IS NOT NULL
+                   AND substring(waveform from 1 for %(length)s) <> %(magic)s
+                """,
+                start=last_id, end=end_id,
+                length=len(waveform.WAVEFORM_MAGIC), magic=waveform.WAVEFORM_MAGIC,
+            ))
+            decoded = self.env.cr.rowcount
+
+            self.env.cr.execute(SQL(
+                """
+                SELECT id, all_data_points FROM vibration_cycle_data
+                 WHERE id > %s AND id <= %s AND waveform IS NULL AND all_data_points IS NOT NULL
+                """, last_id, end_id,
+            ))
+            packed = []
+            for record_id, all_data_points in self.env.cr.fetchall():
+                arrays = self._decode_waveform(None, all_data_points)
+                packed.append((record_id, waveform.pack_waveform(
+                    *(arrays[name] for name in waveform.WAVEFORM_COLUMNS)) if arrays is not None else None))
+            if packed:
+                self.env.cr.execute(SQL(
+                    """
+                    UPDATE vibration_cycle_data AS cycle
+                       SET waveform = v.waveform, all_data_points = NULL
+                      FROM (VALUES %s) AS v(id, waveform)
+                     WHERE cycle.id = v.id
+                    """,
+                    SQL(', ').join(SQL('(%s, %s::bytea)', record_id, data) for record_id, data in packed),
+                ))
+
+            last_id = end_id
+            Param.set_param(self._PAYLOAD_MIGRATION_PARAM, last_id)
+            batches += 1
+            if decoded or packed:
+                _logger.info(
+                    "Converted %s vibration cycle records to raw packed waveforms (ids up to %s)",
+                    decoded + len(packed), last_id)
+        self.invalidate_model(['waveform', 'all_data_points'])
+        return last_id < max_id
+
+    @api.model
+    def _cron_migrate_legacy_payloads(self):
+        """Convert legacy payloads a few batches per run, re-triggering until done"""
+        if self._migrate_legacy_payloads(max_batches=20):
+            self.env.ref('pipes_hoses_new.ir_cron_migrate_cycle_payloads')._trigger()
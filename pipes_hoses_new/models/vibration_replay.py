@@ -0,0 +1,300 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+import io
+import logging
+import time
+
+import numpy as np
+
+from ..tools import export
+
+_logger = logging.getLogger(__name__)
+
+
+class VibrationReplay(models.Model):
+    _name = 'vibration.replay'
+    _description = 'Vibration Run Replay'
+    _order = 'id desc'
+
+    # Seconds ingested per INSERT while importing a run
+    _IMPORT_BATCH_SECONDS = 200
+
+    name = fields.Char(string='Name', required=True, default='Recorded Run')
+    monitor_id = fields.Many2one('vibration.monitor', string='Monitor', required=True, ondelete='cascade')
+    file = fields.Binary(string='File', attachment=True,
+                         help='CSV or recorded run (.vwr), as written by Export Samples')
+    file_name = fields.Char(string='File Name')
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('ready', 'Ready'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+    ], string='State', required=True, default='draft')
+    speed = fields.Selection([
+        ('1', '1x'),
+        ('10', '10x'),
+        ('100', '100x'),
+    ], string='Speed', required=True, default='1',
+        help='Recorded seconds replayed per second')
+    first_cycle_number = fields.Integer(string='First Sr. No.', readonly=True)
+    last_cycle_number = fields.Integer(string='Last Sr. No.', readonly=True)
+    position = fields.Integer(string='Position', readonly=True,
+                              help='Last Sr. No. replayed')
+    second_count = fields.Integer(string='Seconds', readonly=True)
+    sample_count = fields.Integer(string='Samples', readonly=True)
+    import_duration = fields.Float(string='Import Duration (s)', readonly=True, digits=(16, 2))
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+
+    @api.depends('position', 'first_cycle_number', 'last_cycle_number')
+    def _compute_progress(self):
+        for replay in self:
+            total = replay.last_cycle_number - replay.first_cycle_number + 1
+            done = replay.position - replay.first_cycle_number + 1 if replay.position else 0
+            replay.progress = 100.0 * done / total if total > 0 else 0.0
+
+    def _open_file(self):
+        """Open the uploaded file as a binary stream, from the filestore when it lives there"""
+        self.ensure_one()
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name), ('res_field', '=', 'file'), ('res_id', '=', self.id),
+        ], limit=1)
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        return io.BytesIO(attachment.raw or b'')
+
+    def action_import(self):
+        """Ingest the file's seconds after the monitor's last cycle, without publishing them.
+
+        Samples keep their recorded timestamps; cycle numbers are renumbered
+        consecutively so the run follows whatever the monitor already holds.
+        The file is read _IMPORT_BATCH_SECONDS seconds at a time, each batch
+        ingested before the next is read.
+        """
+        self.ensure_one()
+        if self.state != 'draft':
+            raise UserError('This run has already been imported.')
+        if not self.file:
+            raise UserError('Select a file to import.')
+        monitor = self.monitor_id
+        if monitor.is_live or monitor.is_connected:
+            raise UserError(f'Stop live mode on {monitor.display_name} before importing a run.')
+        started = time.perf_counter()
+        Monitor = self.env['vibration.monitor']
+        first_cycle_number = monitor.last_cycle_number + 1
+        second_count = sample_count = 0
+        with self._open_file() as stream:
+            try:
+                for samples in export.iter_samples(stream, monitor.frequency_value, self._IMPORT_BATCH_SECONDS):
+                    boundaries = np.flatnonzero(np.diff(samples['cycle_number'])) + 1
+                    seconds = [{
+                        'monitor_id': monitor.id,
+                        'cycle_number': first_cycle_number + second_count + index,
+                        'timestamp': (second['timestamp'][0] - np.round(
+                            second['time_actual'][0] * 1e6).astype('timedelta64[us]')).item(),
+                        'samples': {
+                            'cycle': second['sub_cycle_number'],
+                            'degree': second['degree'],
+                            'time': second['time_actual'],
+                            'time_in_cycle': second['time_in_cycle'],
+                            'planned': second['dimension'],
+                            'actual': second['amplitude'],
+                        },
+                    } for index, second in enumerate(np.split(samples, boundaries))]
+                    Monitor.ingest_seconds(seconds, publish=False)
+                    second_count += len(seconds)
+                    sample_count += len(samples)
+            except ValueError as e:
+                raise UserError(f'Cannot read {self.file_name or "the file"}: {e}')
+        if not sample_count:
+            raise UserError('The file holds no samples.')
+
+        duration = time.perf_counter() - started
+        self.write({
+            'state': 'ready',
+            'first_cycle_number': first_cycle_number,
+            'last_cycle_number': first_cycle_number + second_count - 1,
+            'second_count': second_count,
+            'sample_count': sample_count,
+            'import_duration': duration,
+            # The samples now live in the cycle records
+            'file': False,
+        })
+        _logger.info(
+            "Imported %s samples (%s seconds) into monitor %s in %.2fs: %.0f samples/s",
+            sample_count, second_count, monitor.id, duration, sample_count / duration if duration else 0.0)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'message': f'Imported {sample_count} samples ({second_count} seconds) in {duration:.1f}s',
+                'type': 'success',
+                'sticky': False,
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
+
+    def action_play(self):
+        """Replay the run on its monitor's live channel, from where it stopped"""
+        for replay in self:
+            if replay.state not in ('ready', 'done'):
+                raise UserError('Import the run before replaying it.')
+            if replay.monitor_id.is_live or replay.monitor_id.is_connected:
+                raise UserError(f'Stop live mode on {replay.monitor_id.display_name} before replaying a run.')
+        # One replay per monitor at a time
+        self.search([('monitor_id', 'in', self.monitor_id.ids), ('state', '=', 'running')]).action_pause()
+        for replay in self:
+            replay.write({
+                'state': 'running',
+                'position': 0 if replay.state == 'done' else replay.position,
+            })
+        self.env.ref('pipes_hoses_new.ir_cron_live_generation')._trigger()
+        return True
+
+    def action_pause(self):
+        self.filtered(lambda replay: replay.state == 'running').write({'state': 'ready'})
+        return True
+
+    def action_rewind(self):
+        self.filtered(lambda replay: replay.state != 'draft').write({'state': 'ready', 'position': 0})
+        return True
+
+    def action_open_dashboard(self):
+        self.ensure_one()
+        dashboard = self.env['vibration.dashboard'].create({
+            'selected_frequency': self.monitor_id.frequency_variant,
+            'monitor_ids': [(6, 0, self.monitor_id.ids)],
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'vibration.dashboard',
+            'res_id': dashboard.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    def _replay_tick(self):
+        """Publish the next ``speed`` recorded seconds of every running replay.
+
+        Reads only what the chart can show: of the seconds a tick covers,
+        the last _CHART_WINDOW_SECONDS are sent, fetched for all replays in
+        one keyset query, as a live ingestion would have sent them.
+        """
+        Dashboard = self.env['vibration.dashboard']
+        bounds = {}
+        for replay in self:
+            start = max(replay.position, replay.first_cycle_number - 1)
+            bounds[replay] = (start, min(start + int(replay.speed), replay.last_cycle_number))
+        cycles_by_monitor = Dashboard._fetch_cycles_per_monitor(
+            {replay.monitor_id.id: end + 1 for replay, (__, end) in bounds.items()},
+            Dashboard._CHART_WINDOW_SECONDS, descending=True)
+
+        for replay, (start, end) in bounds.items():
+            monitor = replay.monitor_id
+            cycles = cycles_by_monitor.get(monitor.id, self.env['vibration.cycle.data']).filtered(
+                lambda cycle: cycle.cycle_number > start)
+            payload = Dashboard._prepare_chart_payload(cycles, start)
+            payload.update(
+                monitor_id=monitor.id,
+                first_cycle=cycles[:1].cycle_number or end,
+                cursor=end,
+                replay_id=replay.id,
+            )
+            self.env['bus.bus']._sendone(monitor._get_live_channel(), 'vibration_points', payload)
+            if end >= replay.last_cycle_number:
+                replay.write({'state': 'done', 'position': end})
+                self.env['bus.bus']._sendone(monitor._get_live_channel(), 'vibration_replay_done', {
+                    'monitor_id': monitor.id,
+                    'replay_id': replay.id,
+                })
+            else:
+                replay.position = end
+
+    @api.model
+    def _tick_running(self):
+        """Tick every running replay in its own transaction, from the live scheduler.
+
+        :return: whether any replay was running
+        """
+        replays = self.search([('state', '=', 'running')])
+        if not replays:
+            return False
+        try:
+            replays._replay_tick()
+            self.env.cr.commit()
+        except Exception:
+            self.env.cr.rollback()
+            _logger.exception("Vibration replay tick failed")
+        return True
+
+
+class VibrationMonitor(models.Model):
+    _inherit = 'vibration.monitor'
+
+    replay_ids = fields.One2many('vibration.replay', 'monitor_id', string='Recorded Runs')
+    is_replaying = fields.Boolean(string='Replaying', compute='_compute_is_replaying')
+
+    @api.depends('replay_ids.state')
+    def _compute_is_replaying(self):
+        running = {
+            monitor.id
+            for [monitor] in self.env['vibration.replay']._read_group(
+                [('monitor_id', 'in', self.ids), ('state', '=', 'running')], ['monitor_id'])
+        }
+        for monitor in self:
+            monitor.is_replaying = monitor.id in running
+
+    def write(self, vals):
+        if vals.get('is_live') or vals.get('is_connected'):
+            # Live samples take over the chart from any replay
+            self.env['vibration.replay'].search([
+                ('monitor_id', 'in', self.ids), ('state', '=', 'running'),
+            ]).action_pause()
+        return super().write(vals)
+
+    def action_start_live_mode(self):
+        """Starting over deletes the monitor's cycle records, imported runs included"""
+        imported = self.env['vibration.replay'].search([('monitor_id', 'in', self.ids), ('state', '!=', 'draft')])
+        if imported:
+            raise UserError(
+                f'{imported.monitor_id[:1].display_name} holds imported runs ({", ".join(imported.mapped("name"))}). '
+                'Delete them before starting live mode, which clears its data.')
+        return super().action_start_live_mode()
+
+    def action_open_replay_import(self):
+        self.ensure_one()
+        return {
+            'name': 'Import Recorded Run',
+            'type': 'ir.actions.act_window',
+            'res_model': 'vibration.replay',
+            'view_mode': 'form',
+            'target': 'new',
+            'context': {'default_monitor_id': self.id},
+        }
+
+
+class VibrationDashboard(models.Model):
+    _inherit = 'vibration.dashboard'
+
+    @api.depends('monitor_ids.is_live', 'monitor_ids.is_replaying')
+    def _compute_is_live_running(self):
+        """Replays feed the chart through the same channels as live mode"""
+        super()._compute_is_live_running()
+        for record in self:
+            record.is_live_running = record.is_live_running or any(record.monitor_ids.mapped('is_replaying'))
+
+    def action_stop_live_generation(self):
+        self.env['vibration.replay'].search([
+            ('monitor_id', 'in', self.monitor_ids.ids), ('state', '=', 'running'),
+        ]).action_pause()
+        return super().action_stop_live_generation()
+
+    def action_toggle_live_generation(self):
+        if any(self.monitor_ids.mapped('is_replaying')):
+            self.env['vibration.replay'].search([
+                ('monitor_id', 'in', self.monitor_ids.ids), ('state', '=', 'running'),
+            ]).action_pause()
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'reload',
+            }
+        return super().action_toggle_live_generation()
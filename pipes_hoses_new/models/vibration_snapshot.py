@@ -0,0 +1,211 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+from ..tools import metrics
+
+
+class VibrationMonitorSnapshot(models.Model):
+    """Latest state of each monitor, maintained at ingestion.
+
+    Overview counters and fleet lists read this table, one row per monitor,
+    rather than counting or sorting the cycle and data log tables.
+    """
+    _name = 'vibration.monitor.snapshot'
+    _description = 'Vibration Monitor Snapshot'
+    _order = 'frequency_variant, monitor_id'
+    _rec_name = 'monitor_id'
+
+    monitor_id = fields.Many2one('vibration.monitor', string='Monitor', required=True, ondelete='cascade')
+    frequency_variant = fields.Selection(
+        related='monitor_id.frequency_variant', store=True, index=True, string='Frequency')
+    is_live = fields.Boolean(related='monitor_id.is_live', store=True, index=True, string='Live Mode')
+    last_cycle_number = fields.Integer(string='Last Sr. No.', readonly=True)
+    last_timestamp = fields.Datetime(string='Last Second', readonly=True)
+    cycle_count = fields.Integer(string='Cycle Count', readonly=True)
+    data_log_count = fields.Integer(string='Data Log Count', readonly=True)
+
+    # Metrics of the last ingested second
+    deviation_rms = fields.Float(string='Deviation RMS (MM)', digits=(16, 4), readonly=True)
+    peak_to_peak = fields.Float(string='Peak to Peak (MM)', digits=(16, 2), readonly=True)
+    crest_factor = fields.Float(string='Crest Factor', digits=(16, 3), readonly=True)
+    phase_lag = fields.Float(string='Phase Lag (°)', digits=(16, 2), readonly=True)
+    dominant_frequency = fields.Float(string='Dominant Frequency (Hz)', digits=(16, 2), readonly=True)
+    is_drifting = fields.Boolean(string='Drifting', readonly=True)
+
+    _sql_constraints = [
+        ('monitor_unique', 'unique(monitor_id)', 'A monitor has a single snapshot.'),
+    ]
+
+    _STATE_COLUMNS = (
+        'last_cycle_number', 'last_timestamp', 'cycle_count', 'data_log_count',
+    ) + metrics.METRIC_NAMES + ('is_drifting',)
+
+    def init(self):
+        # Monitors that predate the snapshots, or were created without the ORM
+        self.env.cr.execute(SQL(
+            "SELECT id FROM vibration_monitor m WHERE NOT EXISTS "
+            "(SELECT 1 FROM %s s WHERE s.monitor_id = m.id)", SQL.identifier(self._table),
+        ))
+        monitor_ids = [row[0] for row in self.env.cr.fetchall()]
+        if monitor_ids:
+            self._refresh(monitor_ids)
+
+    def _upsert_sql(self, select, increment):
+        """INSERT of the snapshot rows returned by ``select``, updating existing ones.
+
+        ``select`` yields ``monitor_id`` and the _STATE_COLUMNS. With
+        ``increment``, its counts are added to the stored ones instead of
+        replacing them.
+        """
+        columns = ('monitor_id',) + self._STATE_COLUMNS
+        assignments = [
+            SQL("%(column)s = snapshot.%(column)s + EXCLUDED.%(column)s", column=SQL.identifier(name))
+            if increment and name in ('cycle_count', 'data_log_count')
+            else SQL("%(column)s = EXCLUDED.%(column)s", column=SQL.identifier(name))
+            for name in self._STATE_COLUMNS
+        ]
+        return SQL(
+            """
+            INSERT INTO %(table)s AS snapshot (%(columns)s, frequency_variant, is_live,
+                                               create_uid, create_date, write_uid, write_date)
+            SELECT %(source_columns)s, monitor.frequency_variant, monitor.is_live,
+                   %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM (%(select)s) AS source
+              JOIN vibration_monitor monitor ON monitor.id = source.monitor_id
+            ON CONFLICT (monitor_id) DO UPDATE SET %(assignments)s,
+                   write_uid = EXCLUDED.write_uid, write_date = EXCLUDED.write_date
+            """,
+            table=SQL.identifier(self._table),
+            columns=SQL(', ').join(SQL.identifier(name) for name in columns),
+            source_columns=SQL(', ').join(SQL.identifier('source', name) for name in columns),
+            uid=self.env.uid, now=self.env.cr.now(), select=select,
+            assignments=SQL(', ').join(assignments),
+        )
+
+    @api.model
+    def _record_ingestion(self, states):
+        """Fold newly ingested seconds into the snapshots, in one statement.
+
+        :param states: dict mapping monitor ids to a dict of the _STATE_COLUMNS,
+            where the counts are those of the ingested rows and the other values
+            those of the monitor's last ingested second
+        """
+        if not states:
+            return
+        self.env['vibration.monitor'].flush_model(['frequency_variant', 'is_live'])
+        self.flush_model()
+        columns = ('monitor_id',) + self._STATE_COLUMNS
+        rows = SQL(', ').join(
+            SQL('(%s)', SQL(', ').join([monitor_id] + [state[name] for name in self._STATE_COLUMNS]))
+            for monitor_id, state in states.items()
+        )
+        self.env.cr.execute(self._upsert_sql(SQL(
+            "SELECT * FROM (VALUES %s) AS v(%s)",
+            rows, SQL(', ').join(SQL.identifier(name) for name in columns),
+        ), increment=True))
+        self.invalidate_model(self._STATE_COLUMNS)
+
+    @api.model
+    def _refresh(self, monitor_ids):
+        """Recount the snapshots of the given monitors from the cycle and data log tables"""
+        if not monitor_ids:
+            return
+        self.env['vibration.cycle.data'].flush_model()
+        self.env['vibration.data.log'].flush_model(['monitor_id'])
+        self.flush_model()
+        metric_columns = SQL(', ').join(
+            SQL.identifier('latest', name) for name in metrics.METRIC_NAMES + ('is_drifting',))
+        self.env.cr.execute(self._upsert_sql(SQL(
+            """
+            SELECT monitor.id AS monitor_id,
+                   COALESCE(latest.cycle_number, 0) AS last_cycle_number,
+                   latest.timestamp AS last_timestamp,
+                   cycles.count AS cycle_count,
+                   logs.count AS data_log_count,
+                   %(metric_columns)s
+              FROM vibration_monitor monitor
+              LEFT JOIN LATERAL (
+                    SELECT * FROM vibration_cycle_data
+                     WHERE monitor_id = monitor.id
+                  ORDER BY cycle_number DESC LIMIT 1
+              ) latest ON TRUE
+             CROSS JOIN LATERAL (
+                    SELECT count(*) FROM vibration_cycle_data WHERE monitor_id = monitor.id
+              ) cycles
+             CROSS JOIN LATERAL (
+                    SELECT count(*) FROM vibration_data_log WHERE monitor_id = monitor.id
+              ) logs
+             WHERE monitor.id = ANY(%(monitor_ids)s)
+            """, metric_columns=metric_columns, monitor_ids=list(monitor_ids),
+        ), increment=False))
+        self.invalidate_model(self._STATE_COLUMNS)
+
+    @api.model
+    def _add_data_log_count(self, monitor_id, count):
+        """Adjust the data log count of a monitor after raw inserts or deletes"""
+        self.flush_model(['data_log_count'])
+        self.env.cr.execute(SQL(
+            "UPDATE %s SET data_log_count = GREATEST(data_log_count + %s, 0) WHERE monitor_id = %s",
+            SQL.identifier(self._table), count, monitor_id,
+        ))
+        self.invalidate_model(['data_log_count'])
+
+
+class VibrationMonitor(models.Model):
+    _inherit = 'vibration.monitor'
+
+    snapshot_ids = fields.One2many('vibration.monitor.snapshot', 'monitor_id', string='Snapshot')
+    last_cycle_number = fields.Integer(string='Last Sr. No.', compute='_compute_snapshot_values')
+    last_cycle_timestamp = fields.Datetime(string='Last Second', compute='_compute_snapshot_values')
+    last_deviation_rms = fields.Float(
+        string='Deviation RMS (MM)', digits=(16, 4), compute='_compute_snapshot_values')
+    is_drifting = fields.Boolean(string='Drifting', compute='_compute_snapshot_values')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        monitors = super().create(vals_list)
+        self.env['vibration.monitor.snapshot']._refresh(monitors.ids)
+        return monitors
+
+    @api.depends('snapshot_ids.last_cycle_number')
+    def _compute_snapshot_values(self):
+        # One read of the snapshots for the whole recordset
+        snapshots = self.snapshot_ids.grouped('monitor_id')
+        for record in self:
+            snapshot = snapshots.get(record, self.env['vibration.monitor.snapshot'])
+            record.last_cycle_number = snapshot.last_cycle_number
+            record.last_cycle_timestamp = snapshot.last_timestamp
+            record.last_deviation_rms = snapshot.deviation_rms
+            record.is_drifting = snapshot.is_drifting
+
+    @api.depends('snapshot_ids.cycle_count')
+    def _compute_cycle_data_count(self):
+        snapshots = self.snapshot_ids.grouped('monitor_id')
+        for record in self:
+            record.cycle_data_count = snapshots.get(record, self.env['vibration.monitor.snapshot']).cycle_count
+
+    @api.depends('snapshot_ids.data_log_count')
+    def _compute_data_log_count(self):
+        snapshots = self.snapshot_ids.grouped('monitor_id')
+        for record in self:
+            record.data_log_count = snapshots.get(record, self.env['vibration.monitor.snapshot']).data_log_count
+
+
+class VibrationDataLog(models.Model):
+    _inherit = 'vibration.data.log'
+
+    def unlink(self):
+        monitor_ids = self.monitor_id.ids
+        res = super().unlink()
+        self.env['vibration.monitor.snapshot']._refresh(monitor_ids)
+        return res
+
+
+class VibrationCycleData(models.Model):
+    _inherit = 'vibration.cycle.data'
+
+    def unlink(self):
+        monitor_ids = self.monitor_id.ids
+        res = super().unlink()
+        self.env['vibration.monitor.snapshot']._refresh(monitor_ids)
+        return res
@@ -0,0 +1,185 @@
+/** @odoo-module **/
+
+// Parses, windows and decimates dashboard chart payloads off the UI thread.
+//
+// parseChartColumns is self-contained: its source is also the body of the
+// Web Worker, built from a Blob, and it runs inline where workers are not
+// available. Points come back as typed arrays, one per column, transferred
+// to the UI thread rather than copied.
+
+export function parseChartColumns(text, windowSeconds, maxPoints) {
+    const data = text ? JSON.parse(text) : { monitors: [] };
+    const monitors = data.monitors || [];
+
+    let latestTime = null;
+    for (const monitor of monitors) {
+        for (const point of monitor.actual) {
+            if (latestTime === null || point.time > latestTime) {
+                latestTime = point.time;
+            }
+        }
+    }
+    const windowStart = latestTime === null ? 0 : latestTime - windowSeconds;
+
+    // Min/max decimation on time buckets, which keeps the peaks
+    function decimate(points) {
+        if (points.length <= maxPoints) {
+            return points;
+        }
+        const buckets = Math.max(1, Math.floor(maxPoints / 2));
+        const first = points[0].time;
+        const span = points[points.length - 1].time - first || 1;
+        const kept = [];
+        let bucket = -1;
+        let low = null;
+        let high = null;
+        const flush = () => {
+            if (low === null) return;
+            if (low === high) {
+                kept.push(low);
+            } else if (low.time <= high.time) {
+                kept.push(low, high);
+            } else {
+                kept.push(high, low);
+            }
+        };
+        for (const point of points) {
+            const index = Math.min(buckets - 1, Math.floor(((point.time - first) / span) * buckets));
+            if (index !== bucket) {
+                flush();
+                bucket = index;
+                low = high = point;
+            } else {
+                if (point.value < low.value) low = point;
+                if (point.value > high.value) high = point;
+            }
+        }
+        flush();
+        return kept;
+    }
+
+    const transfer = [];
+    const result = monitors.map((monitor) => {
+        const points = decimate(monitor.actual.filter((point) => point.time >= windowStart));
+        const columns = {
+            time: new Float64Array(points.length),
+            value: new Float64Array(points.length),
+            degree: new Float64Array(points.length),
+            cycle: new Int32Array(points.length),
+            subCycle: new Int32Array(points.length),
+        };
+        points.forEach((point, index) => {
+            columns.time[index] = point.time;
+            columns.value[index] = point.value;
+            columns.degree[index] = point.degree;
+            columns.cycle[index] = point.cycle || 1;
+            columns.subCycle[index] = point.sub_cycle || 1;
+        });
+        transfer.push(...Object.values(columns).map((column) => column.buffer));
+        return {
+            monitor_id: monitor.monitor_id,
+            name: monitor.name,
+            is_live: monitor.is_live,
+            template: monitor.template,
+            cursor: monitor.cursor,
+            columns,
+        };
+    });
+    return { result: { monitors: result, latestTime }, transfer };
+}
+
+// Rebuild the point objects of the chart payloads from parsed columns
+export function columnsToPoints(columns) {
+    const points = new Array(columns.time.length);
+    for (let index = 0; index < points.length; index++) {
+        points[index] = {
+            time: columns.time[index],
+            value: columns.value[index],
+            degree: columns.degree[index],
+            cycle: columns.cycle[index],
+            sub_cycle: columns.subCycle[index],
+        };
+    }
+    return points;
+}
+
+const WORKER_SOURCE = `
+const parseChartColumns = ${parseChartColumns.toString()};
+self.onmessage = (event) => {
+    const { id, text, windowSeconds, maxPoints } = event.data;
+    try {
+        const { result, transfer } = parseChartColumns(text, windowSeconds, maxPoints);
+        self.postMessage({ id, result }, transfer);
+    } catch (error) {
+        self.postMessage({ id, error: String(error) });
+    }
+};
+`;
+
+export class ChartDataWorker {
+    constructor() {
+        this.worker = null;
+        this.requests = new Map();
+        this.nextId = 1;
+        try {
+            this.url = URL.createObjectURL(new Blob([WORKER_SOURCE], { type: "text/javascript" }));
+            this.worker = new Worker(this.url);
+            this.worker.onmessage = (event) => this.onMessage(event.data);
+            this.worker.onerror = (event) => this.onError(event);
+        } catch (error) {
+            console.warn("Chart worker unavailable, parsing on the main thread:", error);
+            this.worker = null;
+        }
+    }
+
+    // Resolve with { monitors, latestTime }, each monitor's points as typed columns
+    parse(text, { windowSeconds, maxPoints }) {
+        if (!this.worker) {
+            return Promise.resolve(parseChartColumns(text, windowSeconds, maxPoints).result);
+        }
+        const id = this.nextId++;
+        return new Promise((resolve, reject) => {
+            this.requests.set(id, { resolve, reject, text, windowSeconds, maxPoints });
+            this.worker.postMessage({ id, text, windowSeconds, maxPoints });
+        });
+    }
+
+    onMessage({ id, result, error }) {
+        const request = this.requests.get(id);
+        if (!request) return;
+        this.requests.delete(id);
+        if (error) {
+            request.reject(new Error(error));
+        } else {
+            request.resolve(result);
+        }
+    }
+
+    onError(event) {
+        // The worker could not start (e.g. blocked by a content security
+        // policy): answer pending and later requests on the main thread
+        event.preventDefault?.();
+        console.warn("Chart worker failed, parsing on the main thread:", event.message);
+        this.destroy();
+        const pending = [...this.requests.values()];
+        this.requests.clear();
+        for (const { resolve, reject, text, windowSeconds, maxPoints } of pending) {
+            try {
+                resolve(parseChartColumns(text, windowSeconds, maxPoints).result);
+            } catch (error) {
+                reject(error);
+            }
+        }
+    }
+
+    destroy() {
+        if (this.worker) {
+            this.worker.terminate();
+            this.worker = null;
+        }
+        if (this.url) {
+            URL.revokeObjectURL(this.url);
+            this.url = null;
+        }
+    }
+}
@@ -1,91 +1,126 @@
 /** @odoo-module **/
 
 import { registry } from "@web/core/registry";
-import { Component, onMounted, useRef, onWillUnmount } from "@odoo/owl";
+import { Component, onMounted, onPatched, useRef, onWillUnmount } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 
-// Small inline chart for tree view
+// Rows of a list scrolled into view, or about to be; one observer for all rows
+const sparklineCallbacks = new WeakMap();
+let sparklineObserver = null;
+
+function observeSparkline(el, callback) {
+    if (!window.IntersectionObserver) {
+        callback(true);
+        return;
+    }
+    if (!sparklineObserver) {
+        sparklineObserver = new IntersectionObserver((entries) => {
+            for (const entry of entries) {
+                sparklineCallbacks.get(entry.target)?.(entry.isIntersecting);
+            }
+        }, { rootMargin: "200px 0px" });
+    }
+    sparklineCallbacks.set(el, callback);
+    sparklineObserver.observe(el);
+}
+
+function unobserveSparkline(el) {
+    sparklineCallbacks.delete(el);
+    sparklineObserver?.unobserve(el);
+}
+
+// Sparkline of a cycle for list rows, drawn from the stored sparkline values
+// on a bare canvas, only while the row is in or near the viewport; its
+// backing store is released when the row scrolls away
 class CycleChartWidget extends Component {
     setup() {
-        this.notification = useService("notification");
+        this.containerRef = useRef("container");
         this.chartRef = useRef("chart");
-        this.chart = null;
+        this.isVisible = false;
 
         onMounted(() => {
-            this.renderChart();
+            observeSparkline(this.containerRef.el, (isVisible) => {
+                this.isVisible = isVisible;
+                if (isVisible) {
+                    this.draw();
+                } else {
+                    this.release();
+                }
+            });
         });
 
-        onWillUnmount(() => {
-            if (this.chart) {
-                this.chart.destroy();
+        onPatched(() => {
+            if (this.isVisible) {
+                this.draw();
             }
         });
-    }
-
-    renderChart() {
-        const chartData = this.props.record.data[this.props.name];
 
-        if (!chartData || !this.chartRef.el) {
-            return;
-        }
+        onWillUnmount(() => {
+            unobserveSparkline(this.containerRef.el);
+            this.release();
+        });
+    }
 
+    get values() {
+        const value = this.props.record.data[this.props.name];
+        if (!value) return [];
         try {
-            const data = JSON.parse(chartData);
-            const ctx = this.chartRef.el.getContext('2d');
+            const values = JSON.parse(value);
+            return Array.isArray(values) ? values : [];
+        } catch {
+            return [];
+        }
+    }
 
-            // Destroy existing chart
-            if (this.chart) {
-                this.chart.destroy();
+    draw() {
+        const canvas = this.chartRef.el;
+        const container = this.containerRef.el;
+        if (!canvas || !container) return;
+
+        const ratio = window.devicePixelRatio || 1;
+        const width = container.clientWidth;
+        const height = container.clientHeight;
+        canvas.width = Math.round(width * ratio);
+        canvas.height = Math.round(height * ratio);
+        canvas.style.width = `${width}px`;
+        canvas.style.height = `${height}px`;
+
+        const values = this.values;
+        if (values.length < 2) return;
+
+        let low = values[0];
+        let high = values[0];
+        for (const value of values) {
+            if (value < low) low = value;
+            if (value > high) high = value;
+        }
+        const span = high - low || 1;
+        const margin = 2;
+
+        const ctx = canvas.getContext("2d");
+        ctx.scale(ratio, ratio);
+        ctx.strokeStyle = "rgb(75, 192, 192)";
+        ctx.lineWidth = 1.5;
+        ctx.lineJoin = "round";
+        ctx.beginPath();
+        values.forEach((value, index) => {
+            const x = (index / (values.length - 1)) * width;
+            const y = margin + (1 - (value - low) / span) * (height - 2 * margin);
+            if (index === 0) {
+                ctx.moveTo(x, y);
+            } else {
+                ctx.lineTo(x, y);
             }
+        });
+        ctx.stroke();
+    }
 
-            // Prepare data points using time for x-axis
-            const actualData = data.actual.map(d => ({
-                x: d.time || 0,
-                y: d.value
-            }));
-
-            // Create new chart with Chart.js
-            this.chart = new Chart(ctx, {
-                type: 'scatter',
-                data: {
-                    datasets: [
-                        {
-                            label: 'Dimension (MM)',
-                            data: actualData,
-                            borderColor: 'rgb(75, 192, 192)',
-                            backgroundColor: 'rgba(75, 192, 192, 0.5)',
-                            borderWidth: 2,
-                            pointRadius: 2,
-                            showLine: true,
-                            tension: 0.4,
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: {
-                        legend: {
-                            display: false
-                        },
-                        tooltip: {
-                            enabled: false
-                        }
-                    },
-                    scales: {
-                        x: {
-                            display: false,
-                            type: 'linear'
-                        },
-                        y: {
-                            display: false
-                        }
-                    },
-                    animation: false
-                }
-            });
-        } catch (e) {
-            console.error('Error rendering chart:', e);
+    release() {
+        const canvas = this.chartRef.el;
+        if (canvas) {
+            // Frees the canvas backing store
+            canvas.width = 0;
+            canvas.height = 0;
         }
     }
 }
@@ -126,14 +161,20 @@ class CycleChartDetailWidget extends Component {
                 this.chart.destroy();
             }
 
-            // Use time values directly from the data
-            const plannedData = data.planned.map(d => ({
-                x: d.time,
-                y: d.value,
-                degree: d.degree,
-                cycle: d.cycle,
-                dimension: d.value
-            }));
+            // Planned values come from the template, looked up by degree
+            const template = data.template || { degrees: [], planned: [] };
+            const plannedByDegree = new Map(
+                template.degrees.map((degree, index) => [degree, template.planned[index]])
+            );
+            const plannedData = data.actual
+                .filter(d => plannedByDegree.has(d.degree))
+                .map(d => ({
+                    x: d.time,
+                    y: plannedByDegree.get(d.degree),
+                    degree: d.degree,
+                    cycle: d.cycle,
+                    dimension: plannedByDegree.get(d.degree)
+                }));
 
             const actualData = data.actual.map(d => ({
                 x: d.time,
@@ -0,0 +1,124 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { Component, onWillStart, onWillUpdateProps, useState } from "@odoo/owl";
+import { useService } from "@web/core/utils/hooks";
+import { standardWidgetProps } from "@web/views/widgets/standard_widget_props";
+
+// Cycle records of the dashboard's monitors, one server-side page at a time
+// (see vibration.dashboard.get_cycle_page). Only mounted, hence only fetching,
+// while its notebook page is open.
+export class VibrationCyclePager extends Component {
+    static template = "vibration_monitoring.VibrationCyclePager";
+    static props = {
+        ...standardWidgetProps,
+    };
+
+    setup() {
+        this.orm = useService("orm");
+        this.action = useService("action");
+        this.state = useState({
+            rows: [],
+            total: 0,
+            next: null,
+            loading: false,
+        });
+        // Keys of the pages before the current one; empty on the first page
+        this.previousKeys = [];
+        this.currentKey = null;
+
+        onWillStart(() => this.loadPage(null));
+
+        onWillUpdateProps((nextProps) => {
+            const monitorIds = this.getMonitorIds(nextProps);
+            if (monitorIds.join() !== this.monitorIds.join()) {
+                this.previousKeys = [];
+                return this.loadPage(null, nextProps);
+            }
+            // Form reloaded while live: only the newest page moves
+            if (!this.currentKey) {
+                return this.loadPage(null, nextProps);
+            }
+        });
+    }
+
+    getMonitorIds(props = this.props) {
+        return props.record.data.monitor_ids?.currentIds || [];
+    }
+
+    get firstRow() {
+        return this.state.rows.length ? this.previousKeys.length * this.pageSize + 1 : 0;
+    }
+
+    get lastRow() {
+        return this.previousKeys.length * this.pageSize + this.state.rows.length;
+    }
+
+    get profileContext() {
+        // Opt-in server-side profiling, see tools/instrumentation.py
+        return new URLSearchParams(window.location.search).has("vibration_profile")
+            ? { vibration_profile: true }
+            : {};
+    }
+
+    get pageSize() {
+        // Same as the server default, _CYCLE_PAGE_SIZE
+        return 80;
+    }
+
+    async loadPage(key, props = this.props) {
+        this.monitorIds = this.getMonitorIds(props);
+        this.currentKey = key;
+        if (!this.monitorIds.length) {
+            Object.assign(this.state, { rows: [], total: 0, next: null });
+            return;
+        }
+        this.state.loading = true;
+        try {
+            const page = await this.orm.call(
+                "vibration.dashboard",
+                "get_cycle_page",
+                [this.monitorIds, key, this.pageSize],
+                { context: this.profileContext }
+            );
+            Object.assign(this.state, { rows: page.rows, total: page.total, next: page.next });
+        } finally {
+            this.state.loading = false;
+        }
+    }
+
+    async onNext() {
+        if (!this.state.next || this.state.loading) return;
+        this.previousKeys.push(this.currentKey);
+        await this.loadPage(this.state.next);
+    }
+
+    async onPrevious() {
+        if (!this.previousKeys.length || this.state.loading) return;
+        await this.loadPage(this.previousKeys.pop());
+    }
+
+    async onFirst() {
+        if (this.state.loading) return;
+        this.previousKeys = [];
+        await this.loadPage(null);
+    }
+
+    openCycle(row) {
+        this.action.doAction({
+            type: "ir.actions.act_window",
+            res_model: "vibration.cycle.data",
+            res_id: row.id,
+            views: [[false, "form"]],
+            target: "current",
+        });
+    }
+
+    formatNumber(value, digits) {
+        return value === false || value === undefined ? "" : value.toFixed(digits);
+    }
+}
+
+registry.category("view_widgets").add("vibration_cycle_pager", {
+    component: VibrationCyclePager,
+});
@@ -1,9 +1,21 @@
 /** @odoo-module **/
 
-import { Component, onMounted, onWillUnmount, useRef, useState, onWillUpdateProps } from "@odoo/owl";
+import { Component, onMounted, onWillStart, onWillUnmount, useRef, useState, onWillUpdateProps } from "@odoo/owl";
 import { registry } from "@web/core/registry";
 import { useService } from "@web/core/utils/hooks";
 import { standardFieldProps } from "@web/views/fields/standard_field_props";
+import { ChartDataWorker, columnsToPoints } from "./chart_data_worker";
+import { PointRing } from "./point_ring";
+
+// Seconds of the chart payload kept, as sent by the server, and the points
+// kept per monitor after decimation
+const CHART_WINDOW_SECONDS = 10;
+const CHART_MAX_POINTS = 2000;
+// Points held per dataset: the window at the server's density, twice over
+const SERIES_CAPACITY = 4000;
+// Queued points are played back at the pace they were sampled, unless
+// they fall further behind than this, in seconds
+const MAX_PLAYBACK_LAG_SECONDS = 1.5;
 
 export class VibrationLiveChartField extends Component {
     static template = "vibration_monitoring.VibrationLiveChartField";
@@ -16,13 +28,24 @@ export class VibrationLiveChartField extends Component {
         this.chartContainerRef = useRef("chartContainer");
         this.chart = null;
         this.notification = useService("notification");
-        this.refreshInterval = null;
-        this.lastDataLength = 0;
+        this.orm = useService("orm");
+        this.busService = useService("bus_service");
+        this.liveChannels = [];
+        this.onLivePoints = (payload) => this.receiveLivePoints(payload);
+        this.onReplayDone = (payload) => this.receiveReplayDone(payload);
+        this.isFetchingDelta = false;
+        // One entry per traced monitor, by monitor id: its cursor (the last
+        // cycle number received, see get_chart_delta), planned value per
+        // sampled degree, queue of points to animate and chart datasets
+        this.series = new Map();
 
-        // Queue for single-point animation
-        this.pointQueue = [];
         this.isProcessingQueue = false;
-        this.pointInterval = null;
+        this.animationFrame = null;
+
+        // The chart_data field, parsed in a worker once per value (see loadChartData)
+        this.chartWorker = new ChartDataWorker();
+        this.parsedText = undefined;
+        this.parsed = null;
 
         // Add state for controlling live updates and fullscreen
         this.state = useState({
@@ -30,20 +53,27 @@ export class VibrationLiveChartField extends Component {
             isFullscreen: false
         });
 
+        onWillStart(() => this.loadChartData());
+
         onMounted(() => {
             this.renderChart();
             this.syncWithDashboard();
             this.setupFullscreenListener();
         });
 
-        onWillUpdateProps((nextProps) => {
+        onWillUpdateProps(async (nextProps) => {
+            const changed = await this.loadChartData(nextProps);
             this.syncWithDashboard(nextProps);
+            if (changed && !this.state.isRunning) {
+                this.updateChart();
+            }
         });
 
         onWillUnmount(() => {
             this.stopAutoUpdate();
             this.stopPointAnimation();
             this.removeFullscreenListener();
+            this.chartWorker.destroy();
             if (this.chart) {
                 this.chart.destroy();
             }
@@ -87,6 +117,13 @@ export class VibrationLiveChartField extends Component {
         }
     }
 
+    get profileContext() {
+        // Opt-in server-side profiling of the chart calls, see tools/instrumentation.py
+        return new URLSearchParams(window.location.search).has("vibration_profile")
+            ? { vibration_profile: true }
+            : {};
+    }
+
     get selectedFrequency() {
         const freq = this.props.record.data.selected_frequency;
         if (!freq) return '';
@@ -106,88 +143,247 @@ export class VibrationLiveChartField extends Component {
     }
 
     startAutoUpdate() {
-        if (this.refreshInterval) return;
+        if (this.liveChannels.length) return;
 
         this.state.isRunning = true;
 
-        this.refreshInterval = setInterval(() => {
-            const data = this.chartData;
-            if (!data || !data.actual || data.actual.length === 0) return;
-
-            const newPointCount = data.actual.length - this.lastDataLength;
-            if (newPointCount > 0) {
-                const newPoints = data.actual.slice(-newPointCount);
-                this.queuePoints(newPoints);
-                this.lastDataLength = data.actual.length;
+        // Replay the window loaded with the form, then follow the server cursors
+        for (const monitor of this.parsed?.monitors || []) {
+            const series = this.getSeries(monitor);
+            if (series.cursor === 0) {
+                this.appendPoints(series, { actual: columnsToPoints(monitor.columns), cursor: monitor.cursor });
             }
-        }, 125);
+        }
+
+        // New points are pushed by the server as they are ingested
+        this.liveChannels = [...this.series.keys()].map((monitorId) => `vibration_monitor_${monitorId}`);
+        for (const channel of this.liveChannels) {
+            this.busService.addChannel(channel);
+        }
+        if (this.liveChannels.length) {
+            this.busService.subscribe("vibration_points", this.onLivePoints);
+            this.busService.subscribe("vibration_replay_done", this.onReplayDone);
+        }
+        // Catch up on anything ingested since the form was loaded
+        this.fetchDelta();
 
         this.startPointAnimation();
     }
 
-    queuePoints(newPoints) {
-        this.pointQueue.push(...newPoints);
+    getSeries(monitor) {
+        let series = this.series.get(monitor.monitor_id);
+        if (!series) {
+            series = {
+                monitorId: monitor.monitor_id,
+                name: monitor.name || `#${monitor.monitor_id}`,
+                cursor: 0,
+                plannedByDegree: new Map(),
+                templateKey: null,
+                pointQueue: [],
+                // Time of the queued points drawn up to, see drainQueues
+                playhead: null,
+                // Recorded run being replayed on the series, see vibration.replay
+                replayId: null,
+                plannedRing: new PointRing(SERIES_CAPACITY),
+                actualRing: new PointRing(SERIES_CAPACITY),
+                plannedDataset: null,
+                actualDataset: null,
+            };
+            this.series.set(monitor.monitor_id, series);
+            this.addSeriesDatasets(series);
+        }
+        this.setTemplate(series, monitor.template);
+        return series;
+    }
+
+    receiveLivePoints(payload) {
+        const series = this.series.get(payload.monitor_id);
+        if (!this.liveChannels.length || !series) {
+            return;
+        }
+        if (payload.replay_id) {
+            this.receiveReplayPoints(series, payload);
+            return;
+        }
+        if (series.replayId) {
+            // Replay paused for live mode: the rest of the run is skipped
+            series.replayId = null;
+            series.plannedRing.clear();
+            series.actualRing.clear();
+            this.chart?.update('none');
+            series.cursor = payload.first_cycle - 1;
+        }
+        if (payload.cursor <= series.cursor) {
+            return;
+        }
+        if (payload.first_cycle > series.cursor + 1) {
+            // Missed notifications (reconnect, slow tab): resync from the cursors
+            this.fetchDelta();
+            return;
+        }
+        this.appendPoints(series, payload);
+    }
+
+    receiveReplayPoints(series, payload) {
+        if (series.replayId !== payload.replay_id) {
+            // The run follows the monitor's own records on the time axis: start over
+            series.replayId = payload.replay_id;
+            series.pointQueue = [];
+            series.playhead = null;
+            series.plannedRing.clear();
+            series.actualRing.clear();
+            this.chart?.update('none');
+        }
+        // Up to 100 recorded seconds arrive per tick: draw them at once
+        // rather than through the point animation
+        this.addPoints(series, payload.actual);
+        series.cursor = payload.cursor;
+        if (payload.actual.length) {
+            this.slideWindow(payload.actual[payload.actual.length - 1].time);
+        }
+    }
+
+    receiveReplayDone(payload) {
+        const series = this.series.get(payload.monitor_id);
+        if (!series || series.replayId !== payload.replay_id) {
+            return;
+        }
+        series.replayId = null;
+        // Live records, if any, come after the run
+        this.fetchDelta();
+    }
+
+    setTemplate(series, template) {
+        if (!template || template.key === series.templateKey) return;
+        series.templateKey = template.key;
+        series.plannedByDegree = new Map(
+            template.degrees.map((degree, index) => [degree, template.planned[index]])
+        );
+    }
+
+    appendPoints(series, payload) {
+        for (const point of payload.actual) {
+            series.pointQueue.push(point);
+        }
+        series.cursor = payload.cursor;
+    }
+
+    async fetchDelta() {
+        if (!this.series.size || this.isFetchingDelta) return;
+
+        this.isFetchingDelta = true;
+        try {
+            const cursors = {};
+            for (const [monitorId, series] of this.series) {
+                cursors[monitorId] = series.cursor;
+            }
+            // One call for all monitors; recent seconds come from the server's live buffers
+            const delta = await this.orm.call('vibration.dashboard', 'get_chart_delta', [cursors], {
+                context: this.profileContext,
+            });
+            for (const monitor of delta.monitors) {
+                const series = this.series.get(monitor.monitor_id);
+                if (!series) continue;
+                this.setTemplate(series, monitor.template);
+                if (monitor.cursor > series.cursor) {
+                    this.appendPoints(series, monitor);
+                }
+            }
+        } catch (error) {
+            console.error('Error fetching chart delta:', error);
+        } finally {
+            this.isFetchingDelta = false;
+        }
     }
 
     startPointAnimation() {
-        if (this.pointInterval) return;
+        if (this.animationFrame) return;
+
+        let previous = null;
+        const frame = (now) => {
+            this.animationFrame = requestAnimationFrame(frame);
+            const elapsed = previous === null ? 0 : (now - previous) / 1000;
+            previous = now;
+            this.drainQueues(elapsed);
+        };
+        this.animationFrame = requestAnimationFrame(frame);
+    }
 
-        this.pointInterval = setInterval(() => {
-            if (this.pointQueue.length > 0) {
-                const point = this.pointQueue.shift();
-                this.addSinglePoint(point);
+    /**
+     * Move the queued points that are due into the charts, in one batch per
+     * series and a single chart update per animation frame.
+     */
+    drainQueues(elapsed) {
+        let latestTime = null;
+        for (const series of this.series.values()) {
+            const queue = series.pointQueue;
+            if (!queue.length) continue;
+            const newest = queue[queue.length - 1].time;
+            series.playhead = Math.min(
+                newest,
+                Math.max((series.playhead ?? queue[0].time) + elapsed, newest - MAX_PLAYBACK_LAG_SECONDS)
+            );
+            let due = 0;
+            while (due < queue.length && queue[due].time <= series.playhead) {
+                due++;
             }
-        }, 125);
+            if (!due) continue;
+            const batch = queue.splice(0, due);
+            this.addPoints(series, batch);
+            latestTime = Math.max(latestTime ?? -Infinity, batch[batch.length - 1].time);
+        }
+        if (latestTime !== null) {
+            this.slideWindow(latestTime);
+        }
     }
 
     stopPointAnimation() {
-        if (this.pointInterval) {
-            clearInterval(this.pointInterval);
-            this.pointInterval = null;
+        if (this.animationFrame) {
+            cancelAnimationFrame(this.animationFrame);
+            this.animationFrame = null;
+        }
+        for (const series of this.series.values()) {
+            series.pointQueue = [];
+            series.playhead = null;
         }
-        this.pointQueue = [];
     }
 
-    addSinglePoint(point) {
-        if (!this.chart) return;
-
-        const actualDataset = this.chart.data.datasets[1];
-        const plannedDataset = this.chart.data.datasets[0];
-
-        actualDataset.data.push({
+    toChartPoint(point, value) {
+        return {
             x: point.time,
-            y: point.value,
+            y: value,
             degree: point.degree,
-            dimension: point.value,
+            dimension: value,
             cycle: point.cycle || 1,
             sub_cycle: point.sub_cycle || 1
-        });
-
-        if (this.plannedDataFull && this.plannedDataFull.length > 0) {
-            const plannedPoint = this.plannedDataFull.find(p =>
-                p.degree === point.degree &&
-                p.cycle === point.cycle &&
-                p.sub_cycle === point.sub_cycle
-            );
+        };
+    }
 
-            if (plannedPoint) {
-                plannedDataset.data.push({
-                    x: point.time,
-                    y: plannedPoint.y,
-                    degree: plannedPoint.degree,
-                    dimension: plannedPoint.dimension,
-                    cycle: plannedPoint.cycle,
-                    sub_cycle: plannedPoint.sub_cycle
-                });
+    addPoints(series, points) {
+        const actual = [];
+        const planned = [];
+        for (const point of points) {
+            actual.push(this.toChartPoint(point, point.value));
+            // Planned values only depend on the degree: one map lookup
+            const plannedValue = series.plannedByDegree.get(point.degree);
+            if (plannedValue !== undefined) {
+                planned.push(this.toChartPoint(point, plannedValue));
             }
         }
+        series.actualRing.append(actual);
+        series.plannedRing.append(planned);
+    }
+
+    slideWindow(latestTime) {
+        if (!this.chart) return;
 
-        const latestTime = point.time;
         const windowStart = Math.max(0, latestTime - 5);
 
         const removeThreshold = windowStart - 1;
-        actualDataset.data = actualDataset.data.filter(d => d.x > removeThreshold);
-        plannedDataset.data = plannedDataset.data.filter(d => d.x > removeThreshold);
+        for (const series of this.series.values()) {
+            series.plannedRing.dropBefore(removeThreshold);
+            series.actualRing.dropBefore(removeThreshold);
+        }
 
         this.chart.options.scales.x.min = windowStart;
         this.chart.options.scales.x.max = latestTime + 0.5;
@@ -198,9 +394,13 @@ export class VibrationLiveChartField extends Component {
     stopAutoUpdate() {
         this.state.isRunning = false;
 
-        if (this.refreshInterval) {
-            clearInterval(this.refreshInterval);
-            this.refreshInterval = null;
+        if (this.liveChannels.length) {
+            this.busService.unsubscribe("vibration_points", this.onLivePoints);
+            this.busService.unsubscribe("vibration_replay_done", this.onReplayDone);
+            for (const channel of this.liveChannels) {
+                this.busService.deleteChannel(channel);
+            }
+            this.liveChannels = [];
         }
         this.stopPointAnimation();
     }
@@ -213,29 +413,31 @@ export class VibrationLiveChartField extends Component {
         }
     }
 
-    get chartData() {
+    /**
+     * Parse the chart_data value of ``props`` in the worker, unless it is
+     * the one already parsed; resolves to whether it changed. The result
+     * only holds the window shown, decimated, as typed columns.
+     */
+    async loadChartData(props = this.props) {
+        const text = props.record.data[props.name] || "";
+        if (text === this.parsedText) {
+            return false;
+        }
+        this.parsedText = text;
+        let parsed = null;
         try {
-            const value = this.props.record.data[this.props.name];
-            if (!value) {
-                console.warn('No chart data value found');
-                return null;
-            }
-            const parsed = JSON.parse(value);
-
-            if (parsed) {
-                console.log('Chart data structure:', {
-                    hasPlanned: !!parsed.planned,
-                    plannedLength: parsed.planned?.length || 0,
-                    hasActual: !!parsed.actual,
-                    actualLength: parsed.actual?.length || 0
-                });
-            }
-
-            return parsed;
+            parsed = await this.chartWorker.parse(text, {
+                windowSeconds: CHART_WINDOW_SECONDS,
+                maxPoints: CHART_MAX_POINTS,
+            });
         } catch (error) {
             console.error('Error parsing chart data:', error);
-            return null;
         }
+        // A newer value may have been parsed in the meantime
+        if (this.parsedText === text) {
+            this.parsed = parsed;
+        }
+        return true;
     }
 
     updateChart() {
@@ -244,47 +446,67 @@ export class VibrationLiveChartField extends Component {
             return;
         }
 
-        const data = this.chartData;
-        if (!data || !data.actual || data.actual.length === 0) {
+        const data = this.parsed;
+        const monitors = (data?.monitors || []).filter((m) => m.columns.time.length);
+        if (!monitors.length) {
             return;
         }
 
-        const latestTime = Math.max(...data.actual.map(d => d.time));
+        const latestTime = data.latestTime;
         const windowStart = Math.max(0, latestTime - 5);
         const windowEnd = latestTime + 0.5;
 
         this.chart.options.scales.x.min = windowStart;
         this.chart.options.scales.x.max = windowEnd;
 
-        const plannedData = data.planned.map((d) => ({
-            x: d.time,
-            y: d.value,
-            degree: d.degree,
-            dimension: d.value,
-            cycle: d.cycle,
-            sub_cycle: d.sub_cycle
-        }));
-
-        const actualData = data.actual.map((d) => ({
-            x: d.time,
-            y: d.value,
-            degree: d.degree,
-            dimension: d.value,
-            cycle: d.cycle || 1,
-            sub_cycle: d.sub_cycle || 1
-        }));
-
-        this.chart.data.datasets[0].data = plannedData;
-        this.chart.data.datasets[1].data = actualData;
+        for (const monitor of monitors) {
+            const series = this.getSeries(monitor);
+            series.plannedRing.clear();
+            series.actualRing.clear();
+            this.addPoints(series, columnsToPoints(monitor.columns));
+        }
 
         this.chart.update('none');
     }
 
+    addSeriesDatasets(series) {
+        // Each machine gets its own colour, its planned trace dashed
+        const hue = (this.series.size - 1) * 137 % 360;
+        series.plannedDataset = {
+            label: `Planned ${series.name}`,
+            // Read through the ring's ordered view, redrawn by chart.update()
+            data: series.plannedRing.data,
+            parsing: false,
+            borderColor: `hsla(${hue}, 50%, 55%, 1)`,
+            backgroundColor: `hsla(${hue}, 50%, 55%, 0.1)`,
+            borderWidth: 2,
+            borderDash: [5, 5],
+            tension: 0.4,
+            pointRadius: 1,
+            pointHoverRadius: 4,
+            showLine: true,
+        };
+        series.actualDataset = {
+            label: `Actual ${series.name}`,
+            data: series.actualRing.data,
+            parsing: false,
+            borderColor: `hsl(${hue}, 70%, 25%)`,
+            backgroundColor: `hsla(${hue}, 70%, 25%, 0.1)`,
+            borderWidth: 2,
+            pointRadius: 1,
+            tension: 0.4,
+            showLine: true,
+        };
+        if (this.chart) {
+            this.chart.data.datasets.push(series.plannedDataset, series.actualDataset);
+        }
+    }
+
     renderChart() {
         const canvas = this.chartRef.el;
         if (!canvas) return;
 
-        const data = this.chartData;
+        const data = this.parsed;
         if (!data) {
             this.initializeEmptyChart(canvas);
             return;
@@ -293,52 +515,17 @@ export class VibrationLiveChartField extends Component {
         const ctx = canvas.getContext('2d');
         ctx.canvas.style.backgroundColor = 'white';
 
-        const latestTime = data.actual && data.actual.length > 0
-            ? Math.max(...data.actual.map(d => d.time))
-            : 5;
+        const latestTime = data.latestTime ?? 5;
         const windowStart = Math.max(0, latestTime - 5);
         const windowEnd = latestTime + 0.5;
 
-        this.plannedDataFull = [];
-        if (data.planned && Array.isArray(data.planned) && data.planned.length > 0) {
-            this.plannedDataFull = data.planned.map((d) => ({
-                x: d.time,
-                y: d.value,
-                degree: d.degree,
-                dimension: d.value,
-                cycle: d.cycle,
-                sub_cycle: d.sub_cycle
-            }));
-            console.log('Planned data stored:', this.plannedDataFull.length, 'points');
-        }
-
-        const plannedData = [];
-        const actualData = [];
-
-        const datasets = [
-            {
-                label: 'Planned',
-                data: plannedData,
-                borderColor: 'rgba(75, 192, 192, 1)',
-                backgroundColor: 'rgba(75, 192, 192, 0.1)',
-                borderWidth: 2,
-                borderDash: [5, 5],
-                tension: 0.4,
-                pointRadius: 1,
-                pointHoverRadius: 4,
-                showLine: true,
-            },
-            {
-                label: 'Actual',
-                data: actualData,
-                borderColor: 'rgb(0, 0, 0)',
-                backgroundColor: 'rgba(0, 0, 0, 0.1)',
-                borderWidth: 2,
-                pointRadius: 1,
-                tension: 0.4,
-                showLine: true,
-            }
-        ];
+        this.series = new Map();
+        for (const monitor of data.monitors || []) {
+            this.getSeries(monitor);
+        }
+        const datasets = [...this.series.values()].flatMap(
+            (series) => [series.plannedDataset, series.actualDataset]
+        );
 
         this.chart = new Chart(ctx, {
             type: 'scatter',
@@ -449,8 +636,6 @@ export class VibrationLiveChartField extends Component {
                 }
             }
         });
-
-        this.lastDataLength = 0;
     }
 
     initializeEmptyChart(canvas) {
@@ -508,10 +693,12 @@ export class VibrationLiveChartField extends Component {
 
         try {
             const data = JSON.parse(chartData);
-            let csv = 'Type,Record,Cycle,Degree,Time,Value (MM)\n';
+            let csv = 'Type,Monitor,Record,Cycle,Degree,Time,Value (MM)\n';
 
-            data.actual.forEach(point => {
-                csv += `Actual,${point.cycle || 1},${point.sub_cycle || 1},${point.degree},${point.time.toFixed(4)},${point.value.toFixed(2)}\n`;
+            (data.monitors || []).forEach(monitor => {
+                monitor.actual.forEach(point => {
+                    csv += `Actual,${monitor.name},${point.cycle || 1},${point.sub_cycle || 1},${point.degree},${point.time.toFixed(4)},${point.value.toFixed(2)}\n`;
+                });
             });
 
             const blob = new Blob([csv], { type: 'text/csv' });
@@ -2,13 +2,15 @@
 
 import { FormController } from "@web/views/form/form_controller";
 import { registry } from "@web/core/registry";
-import { useService } from "@web/core/utils/hooks";
 import { onMounted, onWillUnmount } from "@odoo/owl";
 
+// Delay between two full form reloads while live (cycle table, live state);
+// data itself is generated server-side and the chart pulls its own deltas
+const FORM_RELOAD_INTERVAL_MS = 10000;
+
 export class LiveVibrationController extends FormController {
     setup() {
         super.setup();
-        this.orm = useService("orm");
         this.dataGenInterval = null;
 
         onMounted(() => {
@@ -43,7 +45,8 @@ export class LiveVibrationController extends FormController {
                 const recordId = this.model.root.resId;
                 if (!recordId) return;
 
-                const selectedFreq = this.model.root.data.selected_frequency;
+                // Monitors picked by frequency or by hand alike
+                const monitorCount = this.model.root.data.monitor_ids?.count || 0;
                 const isLiveRunning = this.model.root.data.is_live_running;
 
                 // Stop if live is not running
@@ -52,22 +55,14 @@ export class LiveVibrationController extends FormController {
                     return;
                 }
 
-                if (!selectedFreq) return;
-
-                // Generate data for selected frequency
-                await this.orm.call(
-                    'vibration.dashboard',
-                    'generate_live_data_for_frequency',
-                    [selectedFreq]
-                );
+                if (!monitorCount) return;
 
-                // Reload dashboard to show new data
                 await this.model.root.load();
 
             } catch (error) {
-                console.error('Live generation error:', error);
+                console.error('Live refresh error:', error);
             }
-        }, 1000); // Every 1 second
+        }, FORM_RELOAD_INTERVAL_MS);
     }
 
     stopAutoRefresh() {
@@ -0,0 +1,110 @@
+/** @odoo-module **/
+
+// Fixed-capacity circular buffer of chart points, ordered by x.
+//
+// Points live in a preallocated array indexed from a moving head: appending
+// writes the slots after the newest point, overwriting the oldest once full,
+// and expiring points only advances the head, so no call shifts or copies
+// the held points. ``data`` is a read-only, array-like view of the points in
+// order, handed to Chart.js as a dataset's data with ``parsing: false``:
+// Chart.js then reads the points through it rather than parsing a copy, and
+// the owner calls chart.update() after changing the ring.
+export class PointRing {
+    constructor(capacity) {
+        this.capacity = capacity;
+        this.slots = new Array(capacity);
+        // Slot of the oldest point
+        this.head = 0;
+        this.size = 0;
+        const ring = this;
+        this.data = new Proxy([], {
+            get(target, property, receiver) {
+                if (property === "length") {
+                    return ring.size;
+                }
+                if (typeof property === "string") {
+                    const index = Number(property);
+                    if (Number.isInteger(index) && index >= 0) {
+                        return ring.at(index);
+                    }
+                }
+                return Reflect.get(target, property, receiver);
+            },
+            has(target, property) {
+                if (typeof property === "string") {
+                    const index = Number(property);
+                    if (Number.isInteger(index) && index >= 0) {
+                        return index < ring.size;
+                    }
+                }
+                return Reflect.has(target, property);
+            },
+        });
+    }
+
+    get length() {
+        return this.size;
+    }
+
+    get last() {
+        return this.at(this.size - 1);
+    }
+
+    // Point at ``index`` from the oldest, or undefined
+    at(index) {
+        if (index < 0 || index >= this.size) {
+            return undefined;
+        }
+        return this.slots[(this.head + index) % this.capacity];
+    }
+
+    // Append points sorted by x, overwriting the oldest beyond the capacity
+    append(points) {
+        let from = 0;
+        if (points.length >= this.capacity) {
+            // Only the newest points fit
+            from = points.length - this.capacity;
+            this.head = 0;
+            this.size = 0;
+        }
+        for (let index = from; index < points.length; index++) {
+            this.slots[(this.head + this.size) % this.capacity] = points[index];
+            if (this.size < this.capacity) {
+                this.size++;
+            } else {
+                this.head = (this.head + 1) % this.capacity;
+            }
+        }
+    }
+
+    // Drop the points whose x is below ``x``
+    dropBefore(x) {
+        let low = 0;
+        let high = this.size;
+        while (low < high) {
+            const middle = (low + high) >>> 1;
+            if (this.at(middle).x < x) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        this.drop(low);
+    }
+
+    // Drop the ``count`` oldest points
+    drop(count) {
+        count = Math.min(count, this.size);
+        for (let index = 0; index < count; index++) {
+            // Release the points for the garbage collector
+            this.slots[(this.head + index) % this.capacity] = undefined;
+        }
+        this.head = (this.head + count) % this.capacity;
+        this.size -= count;
+    }
+
+    clear() {
+        this.drop(this.size);
+        this.head = 0;
+    }
+}
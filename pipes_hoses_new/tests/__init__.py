@@ -0,0 +1,9 @@
+from . import test_archive
+from . import test_benchmark
+from . import test_decimation
+from . import test_drift
+from . import test_export
+from . import test_live_buffer
+from . import test_metrics
+from . import test_plc
+from . import test_waveform
@@ -0,0 +1,46 @@
+import os
+import tempfile
+
+import numpy as np
+
+from odoo.tests import BaseCase
+
+from ..tools import archive
+
+
+class TestArchive(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        # 100 seconds of 56 samples each, over several blocks
+        self.samples = np.zeros(100 * 56, dtype=archive.SAMPLE_DTYPE)
+        self.samples['cycle_number'] = np.repeat(np.arange(1, 101), 56)
+        self.samples['sub_cycle_number'] = np.tile(np.repeat(np.arange(1, 8), 8), 100)
+        self.samples['amplitude'] = np.random.default_rng(0).normal(size=len(self.samples))
+        self.samples['timestamp'] = np.datetime64('2024-01-01', 'us') + np.arange(len(self.samples)).astype(
+            'timedelta64[ms]')
+        self.data = archive.write_archive(self.samples, block_rows=1000)
+
+    def test_round_trip(self):
+        reader = archive.ArchiveReader(self.data)
+        self.assertEqual(len(reader.index), 6)
+        np.testing.assert_array_equal(reader.read(), self.samples)
+
+    def test_range_reads(self):
+        reader = archive.ArchiveReader(self.data)
+        selected = self.samples[(self.samples['cycle_number'] >= 40) & (self.samples['cycle_number'] <= 42)]
+        np.testing.assert_array_equal(reader.read(40, 42), selected)
+        np.testing.assert_array_equal(reader.read(first_cycle=99), self.samples[-2 * 56:])
+        self.assertEqual(len(reader.read(101, 200)), 0)
+
+    def test_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'monitor.var')
+            with open(path, 'wb') as file:
+                file.write(self.data)
+            with archive.MappedArchive(path) as reader:
+                np.testing.assert_array_equal(reader.read(10, 10), self.samples[9 * 56:10 * 56])
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            archive.ArchiveReader(b'VWR\x01' + bytes(12))
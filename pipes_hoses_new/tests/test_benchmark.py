@@ -0,0 +1,65 @@
+from odoo.tests import TransactionCase, tagged
+
+from ..tools import benchmark
+
+
+@tagged('post_install', '-at_install')
+class TestBenchmark(TransactionCase):
+
+    def test_report(self):
+        """A small run seeds every variant and times each measure"""
+        report = benchmark.run(self.env, monitors=1, hours=30 / 3600, refreshes=2)
+        self.assertEqual(report['version'], benchmark.REPORT_VERSION)
+        self.assertEqual(set(report['results']), set(benchmark.VARIANTS))
+        for variant, result in report['results'].items():
+            with self.subTest(variant=variant):
+                self.assertEqual(result['ingestion']['seconds'], 30)
+                self.assertGreater(result['ingestion']['samples'], 0)
+                self.assertEqual(result['dashboard_chart_data']['runs'], 2)
+                self.assertEqual(result['dashboard_refresh']['runs'], 2)
+                self.assertGreater(result['dashboard_refresh']['payload_bytes_mean'], 0)
+                # vibration.cycle.data._prepare_chart_values, once per recent cycle
+                self.assertEqual(result['cycle_chart_data']['runs'], 30)
+                self.assertGreater(result['cycle_chart_data']['payload_bytes_mean'], 0)
+        self.assertEqual(benchmark.compare(report, report), [])
+
+    def test_compare(self):
+        """Slower timings, larger payloads and lower rates are regressions"""
+        baseline = {'results': {'2hz': {
+            'ingestion': {'rows_per_second': 1000.0},
+            'dashboard_refresh': {'p95_ms': 10.0, 'payload_bytes_mean': 5000.0},
+        }}}
+        report = {'results': {'2hz': {
+            'ingestion': {'rows_per_second': 850.0},
+            'dashboard_refresh': {'p95_ms': 10.5, 'payload_bytes_mean': 6000.0},
+        }}}
+        self.assertEqual(benchmark.compare(report, baseline), [
+            '2hz.ingestion.rows_per_second: 1000.0 -> 850.0 (-15%)',
+            '2hz.dashboard_refresh.payload_bytes_mean: 5000.0 -> 6000.0 (+20%)',
+        ])
+
+    def test_compare_with_older_baseline(self):
+        """Scenarios and metrics the baseline lacks are reported as missing, not compared"""
+        baseline = {'results': {
+            '2hz': {'dashboard_refresh': {'p95_ms': 10.0}, 'cycle_chart_data': None},
+            '3hz': 'skipped',
+        }}
+        report = {'results': {
+            '2hz': {
+                'dashboard_refresh': {'p95_ms': 20.0, 'payload_bytes_mean': 6000.0},
+                'cycle_chart_data': {'p95_ms': 1.0},
+            },
+            '3hz': {'dashboard_refresh': {'p95_ms': 10.0}},
+            '5hz': {'ingestion': {'rows_per_second': 1000.0, 'runs': 3}},
+        }}
+        missing = []
+        self.assertEqual(benchmark.compare(report, baseline, missing=missing), [
+            '2hz.dashboard_refresh.p95_ms: 10.0 -> 20.0 (+100%)',
+        ])
+        self.assertEqual(missing, [
+            '2hz.dashboard_refresh.payload_bytes_mean',
+            '2hz.cycle_chart_data.p95_ms',
+            '3hz.dashboard_refresh.p95_ms',
+            '5hz.ingestion.rows_per_second',
+        ])
+        self.assertEqual(benchmark.compare(report, {}), [])
@@ -0,0 +1,38 @@
+import numpy as np
+
+from odoo.tests import BaseCase
+
+from ..tools import decimation
+
+
+class TestDecimation(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(0)
+        self.x = np.arange(5000, dtype=np.float64)
+        self.y = np.sin(self.x / 200) + rng.normal(scale=0.1, size=len(self.x))
+        # Isolated spikes, narrower than any bucket
+        self.y[1234] = 10.0
+        self.y[3210] = -10.0
+
+    def test_short_series_are_kept(self):
+        np.testing.assert_array_equal(decimation.decimate_indices(self.x[:50], self.y[:50], 200), np.arange(50))
+
+    def test_minmax_keeps_extremes(self):
+        indices = decimation.decimate_indices(self.x, self.y, 200, 'minmax')
+        self.assertLessEqual(len(indices), 200)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        for index in (0, 1234, 3210, len(self.y) - 1):
+            self.assertIn(index, indices)
+
+    def test_lttb_keeps_extremes(self):
+        indices = decimation.decimate_indices(self.x, self.y, 200, 'lttb')
+        self.assertLessEqual(len(indices), 202)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        for index in (0, 1234, 3210, len(self.y) - 1):
+            self.assertIn(index, indices)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            decimation.decimate_indices(self.x, self.y, 200, 'average')
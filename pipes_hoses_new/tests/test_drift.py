@@ -0,0 +1,52 @@
+import numpy as np
+
+from odoo.tests import BaseCase
+
+from ..tools import drift
+
+DEGREES = [0.0, 90.0, 180.0, 270.0]
+
+
+class TestDrift(BaseCase):
+
+    def _feed(self, detector, offset, seconds=30, noise=0.1, seed=0):
+        """Feed ``seconds`` of 4 rounds over DEGREES, return the degrees that drifted"""
+        rng = np.random.default_rng(seed)
+        drifted = set()
+        for __ in range(seconds):
+            degrees = np.tile(DEGREES, 4)
+            deviations = offset + rng.normal(scale=noise, size=len(degrees))
+            drifted.update(detector.update(degrees, deviations, band=1.0))
+        return drifted
+
+    def test_no_alarm_on_noise(self):
+        detector = drift.DriftDetector(DEGREES)
+        self.assertEqual(self._feed(detector, 0.0), set())
+
+    def test_cusum_alarm_on_bias(self):
+        """A bias inside the band, too small for the EWMA, accumulates into a CUSUM alarm"""
+        detector = drift.DriftDetector(DEGREES)
+        self.assertEqual(self._feed(detector, 0.7, seconds=10), set(DEGREES))
+        self.assertTrue(np.all(np.abs(detector.ewma) < 1.0))
+
+    def test_ewma_alarm_on_offset(self):
+        detector = drift.DriftDetector(DEGREES)
+        self.assertEqual(detector.update([90.0], [2.0], band=1.0), [90.0])
+
+    def test_cusum_restarts_after_alarm(self):
+        detector = drift.DriftDetector(DEGREES)
+        # 0.8 over the 0.5 slack per sample: the 4.0 limit is crossed at the 14th sample
+        for __ in range(13):
+            self.assertEqual(detector.update([0.0], [0.8], band=1.0), [])
+        self.assertEqual(detector.update([0.0], [0.8], band=1.0), [0.0])
+        self.assertEqual(detector.cusum_high[0], 0.0)
+        self.assertEqual(detector.update([0.0], [0.8], band=1.0), [])
+
+    def test_state(self):
+        """The state resumes a detector, and is dropped when the sampled degrees change"""
+        detector = drift.DriftDetector(DEGREES)
+        self._feed(detector, 0.3, seconds=2)
+        resumed = drift.DriftDetector(DEGREES, detector.to_state())
+        for name in ('count', 'ewma', 'cusum_high', 'cusum_low'):
+            np.testing.assert_array_equal(getattr(resumed, name), getattr(detector, name))
+        np.testing.assert_array_equal(drift.DriftDetector(DEGREES[:2], detector.to_state()).count, [0, 0])
@@ -0,0 +1,39 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestExport(TransactionCase):
+
+    def test_attachment_spans_fetch_batches(self):
+        """An export read over several FETCH batches stores every sample once"""
+        monitor = self.env['vibration.monitor'].create({
+            'frequency_variant': '2hz',
+            'samples_per_cycle': 8,
+        })
+        seconds = monitor._prepare_seconds_payload(
+            1, 10, datetime(2024, 1, 1), rng=np.random.default_rng(0))
+        self.env['vibration.monitor'].ingest_seconds(seconds, publish=False)
+        sample_count = sum(len(second['samples']['time']) for second in seconds)
+
+        wizard = self.env['vibration.export.wizard'].create({
+            'monitor_id': monitor.id,
+            'file_format': 'csv',
+            'destination': 'attachment',
+        })
+        with patch.object(type(monitor), '_EXPORT_FETCH_SECONDS', 3):
+            wizard.action_export()
+
+        attachment = self.env['ir.attachment'].search([
+            ('res_model', '=', 'vibration.monitor'), ('res_id', '=', monitor.id),
+        ])
+        self.assertEqual(len(attachment), 1)
+        lines = attachment.raw.decode().splitlines()
+        self.assertEqual(len(lines) - 1, sample_count)
+        self.assertEqual(attachment.file_size, len(attachment.raw))
+        cycle_numbers = [int(line.split(',')[0]) for line in lines[1:]]
+        self.assertEqual(sorted(set(cycle_numbers)), list(range(1, 11)))
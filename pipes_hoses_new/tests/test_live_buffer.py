@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+import numpy as np
+
+from odoo.tests import BaseCase
+
+from ..tools import live_buffer
+
+
+def _second(value, count=4):
+    return {name: np.full(count, value, dtype=np.float32) for name in ('time', 'degree', 'actual', 'cycle')}
+
+
+class TestLiveBuffer(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.buffer = live_buffer.LiveBuffer(os.path.join(directory.name, 'monitor.ring'), slots=4, capacity=8)
+        self.addCleanup(self.buffer.close)
+
+    def _cycle_numbers(self, seconds):
+        return None if seconds is None else [cycle_number for cycle_number, __ in seconds]
+
+    def test_read_after(self):
+        self.buffer.write([(number, _second(number)) for number in range(1, 4)])
+        self.assertEqual(self._cycle_numbers(self.buffer.read_after(0)), [1, 2, 3])
+        self.assertEqual(self._cycle_numbers(self.buffer.read_after(1)), [2, 3])
+        self.assertEqual(self._cycle_numbers(self.buffer.read_after(1, limit=1)), [2])
+        self.assertEqual(self.buffer.read_after(3), [])
+        cycle_number, arrays = self.buffer.read_after(2)[0]
+        np.testing.assert_array_equal(arrays['actual'], _second(3)['actual'])
+
+    def test_gap_falls_back(self):
+        """Seconds overwritten since the cursor, even for a fresh client, make the ring unable to answer"""
+        self.buffer.write([(number, _second(number)) for number in range(1, 7)])
+        self.assertIsNone(self.buffer.read_after(0))
+        self.assertIsNone(self.buffer.read_after(1))
+        self.assertEqual(self._cycle_numbers(self.buffer.read_after(2)), [3, 4, 5, 6])
+
+    def test_cursor_ahead_falls_back(self):
+        """A cursor beyond the newest second, e.g. after the monitor started over elsewhere"""
+        self.buffer.write([(number, _second(number)) for number in range(1, 3)])
+        self.assertIsNone(self.buffer.read_after(5))
+
+    def test_restart_clears(self):
+        self.buffer.write([(number, _second(number)) for number in range(5, 8)])
+        self.buffer.write([(1, _second(1))])
+        self.assertEqual(self._cycle_numbers(self.buffer.read_after(0)), [1])
+
+    def test_seqlock(self):
+        """Reads never return while a write is in progress"""
+        self.buffer.write([(1, _second(1))])
+        sequence, head, last_write = self.buffer._header()
+        self.buffer._set_header(sequence + 1, head, last_write)
+        self.assertIsNone(self.buffer.read_after(0))
+        self.buffer._set_header(sequence + 2, head, last_write)
+        self.assertEqual(self._cycle_numbers(self.buffer.read_after(0)), [1])
+
+    def test_truncates_to_capacity(self):
+        self.buffer.write([(1, _second(1, count=20))])
+        __, arrays = self.buffer.read_after(0)[0]
+        self.assertEqual(len(arrays['time']), 8)
@@ -0,0 +1,21 @@
+import numpy as np
+
+from odoo.tests import BaseCase
+
+from ..tools import metrics, synthesis
+
+
+class TestMetrics(BaseCase):
+
+    def test_dominant_frequency_of_pure_sine(self):
+        """A clean sine on the planned grid reads its own frequency"""
+        for frequency in (2, 3, 5, 7):
+            for samples_per_cycle in (4, 8, 64, 1024):
+                with self.subTest(frequency=frequency, samples_per_cycle=samples_per_cycle):
+                    template = synthesis.get_planned_template(
+                        frequency, 50, synthesis.grid_degrees(samples_per_cycle))
+                    result = metrics.compute_metrics(
+                        template.time, template.planned, template.planned, frequency)
+                    self.assertAlmostEqual(result['dominant_frequency'][0], frequency, places=6)
+                    self.assertAlmostEqual(result['deviation_rms'][0], 0.0)
+                    self.assertAlmostEqual(result['phase_lag'][0], 0.0, places=6)
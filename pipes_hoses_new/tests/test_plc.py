@@ -0,0 +1,49 @@
+import numpy as np
+
+from odoo.tests import BaseCase
+
+from ..tools import plc
+
+
+def _samples(first_index, count):
+    samples = np.zeros(count, dtype=plc.SAMPLE_DTYPE)
+    samples['index'] = np.arange(first_index, first_index + count)
+    return samples
+
+
+class TestSubscription(BaseCase):
+
+    def test_partial_first_second_is_discarded(self):
+        """A subscription starting mid-second only hands out whole seconds"""
+        subscription = plc.Subscription(1, 'VIB_7HZ', 56)
+        subscription.receive(_samples(56 * 10 + 51, 56 * 2 + 10))
+        drained = subscription.drain_complete_seconds()
+        self.assertEqual(drained['index'].tolist(), list(range(56 * 11, 56 * 13)))
+        self.assertEqual(subscription.discarded, 5)
+
+    def test_missing_samples_discard_their_second(self):
+        subscription = plc.Subscription(1, 'VIB_7HZ', 56, resume_index=56 * 10)
+        subscription.receive(_samples(56 * 10, 30))
+        subscription.receive(_samples(56 * 10 + 40, 16 + 56))
+        drained = subscription.drain_complete_seconds()
+        self.assertEqual(drained['index'].tolist(), list(range(56 * 11, 56 * 12)))
+        self.assertEqual(subscription.discarded, 46)
+
+    def test_restored_seconds_come_first(self):
+        """Seconds of a failed flush are handed out again, ahead of newer ones"""
+        subscription = plc.Subscription(1, 'VIB_7HZ', 56, resume_index=56 * 10)
+        subscription.receive(_samples(56 * 10, 56))
+        subscription.restore(subscription.drain_complete_seconds())
+        subscription.receive(_samples(56 * 11, 56))
+        drained = subscription.drain_complete_seconds()
+        self.assertEqual(drained['index'].tolist(), list(range(56 * 10, 56 * 12)))
+        self.assertEqual(len(subscription.drain_complete_seconds()), 0)
+
+    def test_skip_before(self):
+        """Samples ingested by another process are skipped, in the buffer and on replay"""
+        subscription = plc.Subscription(1, 'VIB_7HZ', 56, resume_index=56 * 10)
+        subscription.receive(_samples(56 * 10, 56 * 2))
+        subscription.skip_before(56 * 13)
+        subscription.receive(_samples(56 * 12, 56 * 2))
+        drained = subscription.drain_complete_seconds()
+        self.assertEqual(drained['index'].tolist(), list(range(56 * 13, 56 * 14)))
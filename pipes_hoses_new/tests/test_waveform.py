@@ -0,0 +1,69 @@
+import io
+
+import numpy as np
+
+from odoo.tests import BaseCase
+
+from ..tools import synthesis, waveform
+
+
+class TestWaveform(BaseCase):
+
+    def _columns(self, count=10):
+        rng = np.random.default_rng(0)
+        return {name: rng.normal(size=count).astype(np.float32) for name in waveform.WAVEFORM_COLUMNS}
+
+    def test_round_trip(self):
+        columns = self._columns()
+        data = waveform.pack_waveform(*(columns[name] for name in waveform.WAVEFORM_COLUMNS))
+        self.assertTrue(data.startswith(waveform.WAVEFORM_MAGIC))
+        self.assertEqual(len(data), 8 + 20 * 10)
+        arrays = waveform.unpack_waveform(data)
+        for name in waveform.WAVEFORM_COLUMNS:
+            np.testing.assert_array_equal(arrays[name], columns[name])
+
+    def test_points_match_arrays(self):
+        columns = self._columns(3)
+        points = [
+            {name: float(columns[name][index]) for name in waveform.WAVEFORM_COLUMNS}
+            for index in range(3)
+        ]
+        arrays = waveform.unpack_waveform(waveform.pack_points(points))
+        for name, values in waveform.points_to_arrays(points).items():
+            np.testing.assert_array_equal(arrays[name], values)
+
+    def test_gridded_round_trip(self):
+        """Gridded seconds store the actual column only and rebuild the rest from the template"""
+        template = synthesis.get_planned_template(7, 8.3, synthesis.grid_degrees(8))
+        actual = np.asarray(template.planned, dtype=np.float32) + 0.25
+        data = waveform.pack_gridded(7, 8.3, 8, actual)
+        self.assertEqual(len(data), 8 + 20 + 4 * len(actual))
+        arrays = waveform.unpack_waveform(data)
+        np.testing.assert_array_equal(arrays['actual'], actual)
+        for name in ('cycle', 'degree', 'time', 'planned'):
+            np.testing.assert_allclose(arrays[name], getattr(template, name), rtol=1e-6)
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            waveform.unpack_waveform(b'{"points": []}')
+        with self.assertRaises(ValueError):
+            waveform.unpack_waveform(waveform.WAVEFORM_MAGIC + bytes([9]) + bytes(4))
+        with self.assertRaises(ValueError):
+            waveform.pack_waveform([1], [1], [1], [1], [1, 2])
+
+    def test_run_round_trip(self):
+        columns = self._columns(4)
+        packed = waveform.pack_waveform(*(columns[name] for name in waveform.WAVEFORM_COLUMNS))
+        start = np.datetime64('2024-01-01T00:00:00', 'us')
+        data = waveform.pack_run_header() + b''.join(
+            waveform.pack_run_second(cycle_number, start + np.timedelta64(cycle_number, 's'), packed)
+            for cycle_number in (1, 2, 3))
+        seconds = list(waveform.iter_run(io.BytesIO(data)))
+        self.assertEqual([cycle_number for cycle_number, __, __ in seconds], [1, 2, 3])
+        self.assertEqual(seconds[2][1], start + np.timedelta64(3, 's'))
+        np.testing.assert_array_equal(seconds[0][2]['actual'], columns['actual'])
+
+        with self.assertRaises(ValueError):
+            list(waveform.iter_run(io.BytesIO(data[:-1])))
+        with self.assertRaises(ValueError):
+            list(waveform.iter_run(io.BytesIO(b'cycle_number,degree\r\n')))
@@ -0,0 +1,9 @@
+from . import archive
+from . import decimation
+from . import drift
+from . import export
+from . import instrumentation
+from . import live_buffer
+from . import metrics
+from . import synthesis
+from . import waveform
@@ -0,0 +1,132 @@
+"""Compressed, memory-mappable archive files for raw ``vibration.data.log`` rows.
+
+An archive is a sequence of independently zlib-compressed blocks followed by
+a fixed-width block index::
+
+    magic (3s) | version (B) | block count (I) | index offset (Q)
+    block 0 | block 1 | ... | index[block count]
+
+Each block holds up to ``BLOCK_ROWS`` samples stored column by column (which
+compresses far better than row-wise records), and each index entry gives the
+cycle range, offset, length and row count of one block. Readers map the file
+and only decompress the blocks overlapping the requested cycle range, so
+reading a few seconds out of a large archive never loads the whole file.
+"""
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+ARCHIVE_MAGIC = b'VAR'
+ARCHIVE_VERSION = 1
+BLOCK_ROWS = 8192
+
+SAMPLE_DTYPE = np.dtype([
+    ('cycle_number', '<i4'),
+    ('sub_cycle_number', '<i4'),
+    ('degree', '<f4'),
+    ('dimension', '<f4'),
+    ('amplitude', '<f4'),
+    ('timestamp', '<M8[us]'),
+    ('time_in_cycle', '<f4'),
+    ('time_actual', '<f4'),
+])
+
+_HEADER = struct.Struct('<3sBIQ')
+_INDEX_DTYPE = np.dtype([
+    ('first_cycle', '<i4'),
+    ('last_cycle', '<i4'),
+    ('offset', '<u8'),
+    ('length', '<u4'),
+    ('rows', '<u4'),
+])
+
+
+def write_archive(samples, block_rows=BLOCK_ROWS):
+    """Serialise a SAMPLE_DTYPE array, sorted by cycle number, into archive bytes"""
+    samples = np.asarray(samples, dtype=SAMPLE_DTYPE)
+    blocks = []
+    index = np.zeros(-(-len(samples) // block_rows), dtype=_INDEX_DTYPE)
+    offset = _HEADER.size
+    for position, start in enumerate(range(0, len(samples), block_rows)):
+        block = samples[start:start + block_rows]
+        payload = zlib.compress(b''.join(
+            np.ascontiguousarray(block[name]).tobytes() for name in SAMPLE_DTYPE.names))
+        index[position] = (
+            block['cycle_number'][0], block['cycle_number'][-1], offset, len(payload), len(block))
+        blocks.append(payload)
+        offset += len(payload)
+    return b''.join([
+        _HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(index), offset),
+        *blocks,
+        index.tobytes(),
+    ])
+
+
+class ArchiveReader:
+    """Random access to the blocks of an archive held in a buffer or a mapped file"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        magic, version, block_count, index_offset = _HEADER.unpack_from(buffer)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError("Not a vibration data archive")
+        if version != ARCHIVE_VERSION:
+            raise ValueError("Unsupported archive version %s" % version)
+        self.index = np.frombuffer(buffer, dtype=_INDEX_DTYPE, count=block_count, offset=index_offset)
+
+    def _read_block(self, entry):
+        rows = int(entry['rows'])
+        raw = zlib.decompress(self.buffer[int(entry['offset']):int(entry['offset']) + int(entry['length'])])
+        block = np.empty(rows, dtype=SAMPLE_DTYPE)
+        position = 0
+        for name in SAMPLE_DTYPE.names:
+            size = rows * SAMPLE_DTYPE[name].itemsize
+            block[name] = np.frombuffer(raw, dtype=SAMPLE_DTYPE[name], count=rows, offset=position)
+            position += size
+        return block
+
+    def read(self, first_cycle=None, last_cycle=None):
+        """Return the samples whose cycle number lies in [first_cycle, last_cycle]"""
+        mask = np.ones(len(self.index), dtype=bool)
+        if first_cycle is not None:
+            mask &= self.index['last_cycle'] >= first_cycle
+        if last_cycle is not None:
+            mask &= self.index['first_cycle'] <= last_cycle
+        blocks = [self._read_block(entry) for entry in self.index[mask]]
+        if not blocks:
+            return np.empty(0, dtype=SAMPLE_DTYPE)
+        samples = np.concatenate(blocks)
+        keep = np.ones(len(samples), dtype=bool)
+        if first_cycle is not None:
+            keep &= samples['cycle_number'] >= first_cycle
+        if last_cycle is not None:
+            keep &= samples['cycle_number'] <= last_cycle
+        return samples[keep]
+
+
+class MappedArchive(ArchiveReader):
+    """ArchiveReader over a memory-mapped archive file, usable as a context manager"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        super().__init__(self._map)
+
+    def close(self):
+        # Drop the numpy view on the map first, mmap refuses to close while exported
+        self.index = None
+        self.buffer = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
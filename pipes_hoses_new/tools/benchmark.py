@@ -0,0 +1,267 @@
+"""Reproducible benchmark of ingestion, dashboard compute and chart payloads.
+
+Seeds ``monitors`` monitors per frequency variant with ``hours`` of
+simulated data each, through ingest_seconds, then times:
+
+* ingestion, in rows and samples per second;
+* ``vibration.dashboard._compute_chart_data`` per variant;
+* ``vibration.dashboard.get_dashboard_refresh_data`` and the size of its
+  JSON payload, i.e. what one dashboard refresh costs the server and sends;
+* ``vibration.cycle.data._prepare_chart_values``, which builds the chart
+  payload stored on each cycle record at ingestion, on the latest records,
+  and the size of that payload (reported as ``cycle_chart_data``).
+
+Like Odoo's test cases, everything runs in one transaction that is rolled
+back at the end, so any database of the module can be used and is left
+untouched. The noise is seeded, so two runs with the same parameters
+ingest the same samples. The report is written as JSON; compare two of them
+with ``--baseline``. Run it with::
+
+    python -m odoo.addons.pipes_hoses_new.tools.benchmark -c odoo.conf -d bench \\
+        --monitors 2 --hours 0.5 --output report.json
+
+tests/test_benchmark.py runs it on a few seconds of data with Odoo's test
+runner (``--test-tags /pipes_hoses_new``), so the harness keeps working as
+the models change.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+_logger = logging.getLogger(__name__)
+
+VARIANTS = ('2hz', '3hz', '5hz', '7hz')
+REPORT_VERSION = 1
+
+# Seconds per ingest_seconds call while seeding
+_SEED_BATCH_SECONDS = 200
+# Cycle records whose chart is computed, per variant
+_CYCLE_CHART_SAMPLE = 50
+
+
+def _timings(durations):
+    """Summary of a list of durations in seconds, in milliseconds"""
+    durations = sorted(durations)
+    return {
+        'runs': len(durations),
+        'mean_ms': statistics.fmean(durations) * 1e3,
+        'p50_ms': durations[len(durations) // 2] * 1e3,
+        'p95_ms': durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1e3,
+        'max_ms': durations[-1] * 1e3,
+    }
+
+
+def seed(env, monitors, hours, samples_per_cycle, rng):
+    """Create ``monitors`` monitors per variant and ingest ``hours`` of data into each.
+
+    :return: dict of variant to (monitors, ingestion statistics)
+    """
+    Monitor = env['vibration.monitor']
+    seconds = max(1, round(hours * 3600))
+    start_time = datetime(2024, 1, 1) - timedelta(seconds=seconds)
+    seeded = {}
+    for variant in VARIANTS:
+        variant_monitors = Monitor.create([{
+            'frequency_variant': variant,
+            'samples_per_cycle': samples_per_cycle,
+        } for __ in range(monitors)])
+        rows = samples = 0
+        duration = 0.0
+        for first in range(0, seconds, _SEED_BATCH_SECONDS):
+            count = min(_SEED_BATCH_SECONDS, seconds - first)
+            payload = [
+                second
+                for monitor in variant_monitors
+                for second in monitor._prepare_seconds_payload(
+                    first + 1, count, start_time + timedelta(seconds=first), rng=rng)
+            ]
+            stats = Monitor.ingest_seconds(payload, publish=False)
+            rows += stats['rows']
+            samples += stats['samples']
+            duration += stats['duration']
+        env.flush_all()
+        seeded[variant] = (variant_monitors, {
+            'monitors': monitors,
+            'seconds': seconds * monitors,
+            'rows': rows,
+            'samples': samples,
+            'duration_s': duration,
+            'rows_per_second': rows / duration if duration else 0.0,
+            'samples_per_second': samples / duration if duration else 0.0,
+        })
+        _logger.info("Seeded %s: %s rows in %.2fs", variant, rows, duration)
+    return seeded
+
+
+def measure(env, seeded, refreshes):
+    """Time the dashboard and cycle chart computes over the seeded monitors"""
+    Dashboard = env['vibration.dashboard']
+    results = {}
+    for variant, (monitors, ingestion) in seeded.items():
+        dashboard = Dashboard.create({
+            'selected_frequency': variant,
+            'monitor_ids': [(6, 0, monitors.ids)],
+        })
+        env.flush_all()
+
+        chart_durations = []
+        for __ in range(refreshes):
+            env.invalidate_all()
+            started = time.perf_counter()
+            dashboard._compute_chart_data()
+            chart_durations.append(time.perf_counter() - started)
+
+        refresh_durations = []
+        payload_bytes = []
+        for __ in range(refreshes):
+            env.invalidate_all()
+            started = time.perf_counter()
+            payload = dashboard.get_dashboard_refresh_data()
+            refresh_durations.append(time.perf_counter() - started)
+            payload_bytes.append(len(json.dumps(payload).encode()))
+
+        cycles = env['vibration.cycle.data'].search(
+            [('monitor_id', 'in', monitors.ids)], order='id desc', limit=_CYCLE_CHART_SAMPLE)
+        cycle_durations = []
+        cycle_bytes = []
+        for cycle in cycles:
+            arrays = cycle._get_waveform_arrays()
+            template = cycle.monitor_id._get_planned_template()
+            started = time.perf_counter()
+            values = cycle._prepare_chart_values(arrays, template)
+            cycle_durations.append(time.perf_counter() - started)
+            cycle_bytes.append(len(values['chart_data'].encode()))
+
+        results[variant] = {
+            'ingestion': ingestion,
+            'dashboard_chart_data': _timings(chart_durations),
+            'dashboard_refresh': {
+                **_timings(refresh_durations),
+                'payload_bytes_mean': statistics.fmean(payload_bytes),
+                'payload_bytes_max': max(payload_bytes),
+            },
+            'cycle_chart_data': {
+                **(_timings(cycle_durations) if cycle_durations else {'runs': 0}),
+                'payload_bytes_mean': statistics.fmean(cycle_bytes) if cycle_bytes else 0.0,
+            },
+        }
+    return results
+
+
+def run(env, monitors=1, hours=0.25, samples_per_cycle=8, refreshes=20, seed_value=0):
+    """Seed, measure and return the report; the caller rolls the transaction back"""
+    rng = np.random.default_rng(seed_value)
+    env.cr.execute("SHOW server_version")
+    server_version = env.cr.fetchone()[0]
+    seeded = seed(env, monitors, hours, samples_per_cycle, rng)
+    return {
+        'version': REPORT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'parameters': {
+            'monitors': monitors,
+            'hours': hours,
+            'samples_per_cycle': samples_per_cycle,
+            'refreshes': refreshes,
+            'seed': seed_value,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'postgresql': server_version,
+            'machine': platform.machine(),
+        },
+        'results': measure(env, seeded, refreshes),
+    }
+
+
+def compare(report, baseline, threshold=0.1, missing=None):
+    """Return the lines describing metrics more than ``threshold`` worse than in ``baseline``.
+
+    Metrics the baseline does not have, e.g. because an older version of the
+    benchmark wrote it, are skipped, and their paths appended to ``missing``
+    when a list is given.
+    """
+    regressions = []
+
+    def walk(current, previous, path):
+        for key, value in current.items():
+            before = previous.get(key) if isinstance(previous, dict) else None
+            if isinstance(value, dict):
+                walk(value, before, path + (key,))
+                continue
+            lower_is_better = key.endswith('_ms') or key.startswith('payload_bytes')
+            if not (lower_is_better or key.endswith('_per_second')):
+                continue
+            if not isinstance(before, (int, float)):
+                if missing is not None:
+                    missing.append('.'.join(path + (key,)))
+                continue
+            if lower_is_better:
+                if before and value > before * (1 + threshold):
+                    regressions.append((path + (key,), before, value))
+            elif before and value < before * (1 - threshold):
+                regressions.append((path + (key,), before, value))
+
+    walk(report['results'], baseline.get('results'), ())
+    return [
+        "%s: %.1f -> %.1f (%+.0f%%)" % ('.'.join(path), before, after, (after / before - 1) * 100)
+        for path, before, after in regressions
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vibration module benchmark")
+    parser.add_argument('-c', '--config', help="Odoo configuration file")
+    parser.add_argument('-d', '--database', required=True, help="Database with the module installed")
+    parser.add_argument('--monitors', type=int, default=1, help="Monitors per frequency variant")
+    parser.add_argument('--hours', type=float, default=0.25, help="Hours of data per monitor")
+    parser.add_argument('--samples-per-cycle', type=int, default=8)
+    parser.add_argument('--refreshes', type=int, default=20, help="Timed runs per measure")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the simulated noise")
+    parser.add_argument('--output', help="Report file, standard output by default")
+    parser.add_argument('--baseline', help="Earlier report to compare with")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Relative change reported as a regression")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    import odoo
+    from odoo import SUPERUSER_ID, api
+    from odoo.modules.registry import Registry
+
+    odoo.tools.config.parse_config(['-c', args.config] if args.config else [])
+    with Registry(args.database).cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        try:
+            report = run(env, args.monitors, args.hours, args.samples_per_cycle, args.refreshes, args.seed)
+        finally:
+            cr.rollback()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            missing = []
+            regressions = compare(report, json.load(file), args.threshold, missing)
+        for path in missing:
+            _logger.info("Not in the baseline: %s", path)
+        for line in regressions:
+            _logger.warning("Regression: %s", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
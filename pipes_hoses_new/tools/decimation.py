@@ -0,0 +1,77 @@
+"""Point-budget decimation for chart payloads.
+
+Both strategies return sorted sample *indices* rather than values, so the
+caller can carry the per-point metadata (degree, cycle, ...) of the kept
+samples along, and apply the same selection to several series sharing an
+x axis.
+"""
+import numpy as np
+
+
+def minmax_indices(y, max_points):
+    """Keep the minimum and maximum of equal buckets, plus both end samples.
+
+    This is the classic per-pixel-column reduction: every local peak that
+    would be visible at the target resolution survives.
+    """
+    y = np.asarray(y)
+    count = len(y)
+    buckets = (max_points - 2) // 2
+    if buckets < 1 or count <= max_points:
+        return np.arange(count)
+
+    size = -(-count // buckets)
+    padded = np.pad(y, (0, size * buckets - count), mode='edge').reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    indices = np.concatenate([
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1),
+        [0, count - 1],
+    ])
+    return np.unique(np.minimum(indices, count - 1))
+
+
+def lttb_indices(x, y, max_points):
+    """Largest-Triangle-Three-Buckets downsampling to ``max_points`` samples"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(x)
+    if max_points < 3 or count <= max_points:
+        return np.arange(count)
+
+    # max_points - 2 buckets between the fixed first and last samples
+    edges = np.linspace(1, count - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+
+    anchor = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else count
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[anchor] - avg_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(areas.argmax())
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def decimate_indices(x, y, max_points, method='minmax'):
+    """Indices of the samples to keep so a series fits in ``max_points``.
+
+    The global minimum and maximum of ``y`` are always kept, so LTTB may
+    return up to two points over budget.
+    """
+    y = np.asarray(y)
+    if not max_points or len(y) <= max_points:
+        return np.arange(len(y))
+    if method == 'lttb':
+        indices = lttb_indices(x, y, max_points)
+        return np.union1d(indices, [int(y.argmin()), int(y.argmax())])
+    if method == 'minmax':
+        return minmax_indices(y, max_points)
+    raise ValueError("Unknown decimation method %r" % method)
@@ -0,0 +1,96 @@
+"""Online drift detection on the deviation (actual minus planned) of each sampled degree.
+
+A DriftDetector keeps, for every sampled degree of a monitor, a handful of
+running statistics updated sample by sample and never re-reading history:
+
+- the number of samples seen
+- an exponentially weighted moving average (EWMA) of the deviation
+- two-sided CUSUM sums, accumulating deviations beyond a slack
+
+A degree drifts when its EWMA leaves the tolerance band or one of its CUSUM
+sums crosses the decision limit (the sums are then restarted). Both the
+slack and the limit are expressed as fractions of the band. The state is a
+small JSON-serialisable dict, O(number of degrees) whatever the history.
+"""
+import numpy as np
+
+# Weight of the newest sample in the EWMA
+EWMA_ALPHA = 0.1
+# CUSUM slack and decision limit, in units of the tolerance band
+CUSUM_SLACK = 0.5
+CUSUM_LIMIT = 4.0
+
+_STATE_ARRAYS = ('count', 'ewma', 'cusum_high', 'cusum_low')
+
+
+class DriftDetector:
+    """Running deviation statistics of one monitor, one slot per sampled degree"""
+
+    def __init__(self, degrees, state=None):
+        self.degrees = [round(float(degree), 4) for degree in degrees]
+        width = len(self.degrees)
+        if state and state.get('degrees') == self.degrees:
+            for name in _STATE_ARRAYS:
+                setattr(self, name, np.array(state[name], dtype=np.float64))
+        else:
+            # No state yet, or the sampling changed: start over
+            for name in _STATE_ARRAYS:
+                setattr(self, name, np.zeros(width))
+
+    def to_state(self):
+        """JSON-serialisable state, to be persisted between ingestions"""
+        state = {name: getattr(self, name).tolist() for name in _STATE_ARRAYS}
+        state['degrees'] = self.degrees
+        return state
+
+    def _to_rounds(self, degrees, deviations):
+        """Lay the samples out as (rounds, degrees), NaN where a degree has no sample.
+
+        Round ``n`` holds the ``n``-th sample of every degree, so that replaying
+        the rounds in order updates each degree in time order. Samples at
+        degrees outside the sampling grid are ignored.
+        """
+        grid = np.asarray(self.degrees)
+        rounded = np.round(np.asarray(degrees, dtype=np.float64), 4)
+        index = np.clip(np.searchsorted(grid, rounded), 0, len(grid) - 1)
+        known = grid[index] == rounded
+        index, deviations = index[known], np.asarray(deviations, dtype=np.float64)[known]
+        if not len(index):
+            return np.empty((0, len(grid)))
+
+        counts = np.bincount(index, minlength=len(grid))
+        order = np.argsort(index, kind='stable')
+        occurrence = np.empty(len(index), dtype=np.intp)
+        occurrence[order] = np.arange(len(index)) - np.repeat(np.cumsum(counts) - counts, counts)
+        rounds = np.full((counts.max(), len(grid)), np.nan)
+        rounds[occurrence, index] = deviations
+        return rounds
+
+    def update(self, degrees, deviations, band):
+        """Feed the samples of one ingested second, in time order.
+
+        :param degrees: sampled degree of each sample
+        :param deviations: actual minus planned value of each sample, in MM
+        :param band: tolerance band on the deviation, in MM
+        :return: sorted list of the degrees that drifted during the second
+        """
+        slack = CUSUM_SLACK * band
+        limit = CUSUM_LIMIT * band
+        drifted = np.zeros(len(self.degrees), dtype=bool)
+        for row in self._to_rounds(degrees, deviations):
+            sampled = ~np.isnan(row)
+            value = np.where(sampled, row, 0.0)
+
+            self.ewma = np.where(
+                sampled,
+                np.where(self.count == 0, value, EWMA_ALPHA * value + (1 - EWMA_ALPHA) * self.ewma),
+                self.ewma)
+            self.count = self.count + sampled
+
+            self.cusum_high = np.where(sampled, np.maximum(0.0, self.cusum_high + value - slack), self.cusum_high)
+            self.cusum_low = np.where(sampled, np.maximum(0.0, self.cusum_low - value - slack), self.cusum_low)
+            alarm = (self.cusum_high > limit) | (self.cusum_low > limit)
+            drifted |= alarm | (sampled & (np.abs(self.ewma) > band))
+            self.cusum_high[alarm] = 0.0
+            self.cusum_low[alarm] = 0.0
+        return [degree for degree, flag in zip(self.degrees, drifted) if flag]
@@ -0,0 +1,229 @@
+"""Streaming encoders for exported vibration samples, and the matching readers.
+
+Samples are handed to an encoder chunk by chunk, as ``archive.SAMPLE_DTYPE``
+arrays (the columns of ``vibration.data.log``), and each call returns the
+bytes to emit for that chunk, so memory use depends on the chunk size and
+never on the number of exported rows. CSV is written row by row; Parquet
+writes one row group per chunk, with the file footer emitted by ``close``;
+recorded runs (see tools/waveform.py) hold one packed waveform per second.
+Parquet needs the optional ``pyarrow`` package.
+
+CSV files and recorded runs can be read back with iter_samples, e.g. to
+import a run into another monitor, a few seconds at a time.
+"""
+import csv
+import io
+
+import numpy as np
+
+from . import archive, waveform
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_FORMATS = ('csv', 'parquet', 'run')
+
+
+def second_samples(cycle_number, timestamp, arrays, frequency):
+    """Samples of one stored second, from its waveform arrays, as a SAMPLE_DTYPE array"""
+    time = arrays['time'].astype(np.float64)
+    samples = np.empty(len(time), dtype=archive.SAMPLE_DTYPE)
+    samples['cycle_number'] = cycle_number
+    samples['sub_cycle_number'] = arrays['cycle']
+    samples['degree'] = arrays['degree']
+    samples['dimension'] = arrays['planned']
+    samples['amplitude'] = arrays['actual']
+    samples['timestamp'] = np.datetime64(timestamp, 'us') + np.round(time * 1e6).astype('timedelta64[us]')
+    samples['time_in_cycle'] = time - (arrays['cycle'] - 1) / frequency if frequency else 0.0
+    samples['time_actual'] = time
+    return samples
+
+
+class CsvEncoder:
+    """CSV with a header line, values rounded as in vibration.data.log"""
+
+    content_type = 'text/csv'
+    extension = 'csv'
+
+    # Decimals per float column, None for the exact value
+    _DECIMALS = {
+        'degree': 4, 'dimension': 2, 'amplitude': 2, 'time_in_cycle': 4, 'time_actual': 4,
+    }
+
+    def open(self):
+        return (','.join(archive.SAMPLE_DTYPE.names) + '\r\n').encode()
+
+    def encode(self, samples):
+        columns = []
+        for name in archive.SAMPLE_DTYPE.names:
+            values = samples[name]
+            if name == 'timestamp':
+                columns.append(np.datetime_as_string(values, unit='us'))
+            elif name in self._DECIMALS:
+                # Through float64, or float32 values print with spurious digits
+                columns.append(np.round(values.astype(np.float64), self._DECIMALS[name]).tolist())
+            else:
+                columns.append(values.tolist())
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(zip(*columns))
+        return buffer.getvalue().encode()
+
+    def close(self):
+        return b''
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting the bytes written since the last ``take``"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ParquetEncoder:
+    """Columnar Parquet, one row group per chunk"""
+
+    content_type = 'application/vnd.apache.parquet'
+    extension = 'parquet'
+
+    def __init__(self):
+        if pyarrow is None:
+            raise ImportError("Parquet export requires the pyarrow package")
+        self._schema = pyarrow.schema([
+            (name, pyarrow.timestamp('us') if name == 'timestamp' else pyarrow.from_numpy_dtype(dtype))
+            for name, (dtype, __) in archive.SAMPLE_DTYPE.fields.items()
+        ])
+        self._sink = _ChunkSink()
+        self._writer = None
+
+    def open(self):
+        self._writer = pyarrow.parquet.ParquetWriter(self._sink, self._schema, compression='zstd')
+        return self._sink.take()
+
+    def encode(self, samples):
+        self._writer.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(np.ascontiguousarray(samples[name])) for name in self._schema.names],
+            schema=self._schema,
+        ))
+        return self._sink.take()
+
+    def close(self):
+        self._writer.close()
+        return self._sink.take()
+
+
+class RunEncoder:
+    """Recorded run, one packed waveform per second"""
+
+    content_type = 'application/octet-stream'
+    extension = 'vwr'
+
+    def open(self):
+        return waveform.pack_run_header()
+
+    def encode(self, samples):
+        # Chunks hold whole seconds, sorted by cycle number
+        boundaries = np.flatnonzero(np.diff(samples['cycle_number'])) + 1
+        return b''.join(
+            waveform.pack_run_second(
+                int(second['cycle_number'][0]),
+                second['timestamp'][0] - np.round(second['time_actual'][0] * 1e6).astype('timedelta64[us]'),
+                waveform.pack_waveform(
+                    second['sub_cycle_number'], second['degree'], second['time_actual'],
+                    second['dimension'], second['amplitude']),
+            )
+            for second in np.split(samples, boundaries)
+        )
+
+    def close(self):
+        return b''
+
+
+def get_encoder(file_format):
+    """Return a new encoder for one of EXPORT_FORMATS"""
+    if file_format == 'run':
+        return RunEncoder()
+    if file_format == 'parquet':
+        return ParquetEncoder()
+    if file_format == 'csv':
+        return CsvEncoder()
+    raise ValueError("Unknown export format %r" % file_format)
+
+
+def _csv_chunk(header, rows):
+    samples = np.empty(len(rows), dtype=archive.SAMPLE_DTYPE)
+    columns = list(zip(*rows))
+    for name in archive.SAMPLE_DTYPE.names:
+        samples[name] = np.array(
+            columns[header.index(name)], dtype='datetime64[us]' if name == 'timestamp' else np.float64)
+    return samples
+
+
+def _iter_csv(stream, chunk_seconds):
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = next(reader, None)
+    if header is None:
+        return
+    missing = set(archive.SAMPLE_DTYPE.names) - set(header)
+    if missing:
+        raise ValueError("Missing CSV columns: %s" % ', '.join(sorted(missing)))
+    column = header.index('cycle_number')
+    rows = []
+    seconds = 0
+    previous = None
+    for row in reader:
+        if row[column] != previous:
+            if seconds == chunk_seconds:
+                yield _csv_chunk(header, rows)
+                rows = []
+                seconds = 0
+            previous = row[column]
+            seconds += 1
+        rows.append(row)
+    if rows:
+        yield _csv_chunk(header, rows)
+
+
+def _iter_run(stream, frequency, chunk_seconds):
+    parts = []
+    for cycle_number, start, arrays in waveform.iter_run(stream):
+        parts.append(second_samples(cycle_number, start, arrays, frequency))
+        if len(parts) == chunk_seconds:
+            yield np.concatenate(parts)
+            parts = []
+    if parts:
+        yield np.concatenate(parts)
+
+
+def iter_samples(stream, frequency, chunk_seconds=200):
+    """Read an exported CSV file or recorded run back from a binary file, ``chunk_seconds`` at a time.
+
+    Yields SAMPLE_DTYPE arrays of whole seconds, in file order, so memory
+    use depends on the chunk and not on the file. ``frequency`` rebuilds the
+    time in cycle of recorded runs, which do not store it.
+    """
+    stream = io.BufferedReader(stream) if not hasattr(stream, 'peek') else stream
+    if stream.peek(len(waveform.RUN_MAGIC))[:len(waveform.RUN_MAGIC)] == waveform.RUN_MAGIC:
+        yield from _iter_run(stream, frequency, chunk_seconds)
+    else:
+        yield from _iter_csv(stream, chunk_seconds)
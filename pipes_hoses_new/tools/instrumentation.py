@@ -0,0 +1,347 @@
+"""Timings and counters of the module's hot paths, in the Prometheus text format.
+
+Paths are wrapped with ``timed`` (model methods) or ``measure`` (blocks);
+each call records its duration and the SQL queries it ran on the
+environment's cursor in histograms labelled with the path. ``observe``
+and ``increment`` record anything else, e.g. payload sizes and row counts.
+
+Each process records in its own memory. Under Odoo, every process also
+writes a snapshot of its metrics to ``<pid>.json`` in
+``<data_dir>/vibration_metrics`` (created on first use, or the directory
+given to ``set_directory``), at most ``DUMP_INTERVAL`` seconds after
+recording, and ``render`` (see controllers/main.py) sums the snapshots of
+all the host's workers, so a scrape sees the same totals whichever worker
+answers it. Snapshots of processes that exited are folded into ``exited.json``, so
+their counts are kept until the directory is emptied.
+
+Calls made by administrators with ``vibration_profile`` in their context
+are also run under cProfile, and their top functions kept in ``PROFILES``
+(latest first). The dashboard widgets add it to their calls when the page
+URL has a ``vibration_profile`` parameter.
+"""
+import collections
+import contextlib
+import cProfile
+import functools
+import fcntl
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+# Upper bounds of the histogram buckets, per unit
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 10000, 50000)
+BYTES_BUCKETS = (1e3, 5e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7)
+
+# Seconds between recording a metric and writing the process's snapshot
+DUMP_INTERVAL = 1.0
+
+# Profiles kept in memory, and the functions listed per profile
+PROFILE_HISTORY = 20
+PROFILE_LINES = 30
+
+_HELP = {
+    'vibration_call_duration_seconds': ('histogram', "Duration of instrumented calls"),
+    'vibration_call_sql_queries': ('histogram', "SQL queries run per instrumented call"),
+    'vibration_payload_bytes': ('histogram', "Size of the JSON chart payloads built"),
+    'vibration_ingested_rows_total': ('counter', "Rows written by ingestion"),
+    'vibration_ingested_samples_total': ('counter', "Samples ingested"),
+    'vibration_ingested_seconds_total': ('counter', "Seconds of samples ingested"),
+    'vibration_chart_points_total': ('counter', "Chart points sent to dashboards"),
+}
+
+
+class Histogram:
+    """Cumulative histogram over fixed bucket bounds"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+_EXITED = 'exited'
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = collections.Counter()
+_local = threading.local()
+_directory = None
+_dump_timer = None
+
+PROFILES = collections.deque(maxlen=PROFILE_HISTORY)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def set_directory(path):
+    """Share this process's metrics with the other processes writing to ``path``"""
+    global _directory
+    _directory = path
+
+
+def _get_directory():
+    """Directory shared by the host's processes, created on first use; None outside Odoo"""
+    global _directory
+    if _directory is None:
+        try:
+            from odoo.tools import config
+        except ImportError:
+            return None
+        _directory = os.path.join(config['data_dir'], 'vibration_metrics')
+    os.makedirs(_directory, exist_ok=True)
+    return _directory
+
+
+def _schedule_dump():
+    """Write this process's snapshot within DUMP_INTERVAL; call with _lock held"""
+    global _dump_timer
+    if _dump_timer is not None:
+        return
+    _dump_timer = threading.Timer(DUMP_INTERVAL, _dump)
+    _dump_timer.daemon = True
+    _dump_timer.start()
+
+
+def _snapshot():
+    """This process's metrics as JSON-serialisable lists; call with _lock held"""
+    return {
+        'histograms': [
+            [name, labels, h.buckets, list(h.counts), h.count, h.sum]
+            for (name, labels), h in _histograms.items()
+        ],
+        'counters': [[name, labels, value] for (name, labels), value in _counters.items()],
+    }
+
+
+def _write_snapshot(path, snapshot):
+    # Readers only ever see a complete snapshot
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w') as file:
+        json.dump(snapshot, file)
+    os.replace(temporary, path)
+
+
+def _dump():
+    global _dump_timer
+    with _lock:
+        _dump_timer = None
+        snapshot = _snapshot()
+    try:
+        directory = _get_directory()
+        if directory is not None:
+            _write_snapshot(os.path.join(directory, f'{os.getpid()}.json'), snapshot)
+    except OSError:
+        pass
+
+
+def _forget():
+    """Start afresh in a forked child: its parent's metrics are the parent's own"""
+    global _lock, _dump_timer
+    _lock = threading.Lock()
+    _dump_timer = None
+    _histograms.clear()
+    _counters.clear()
+    PROFILES.clear()
+
+
+os.register_at_fork(after_in_child=_forget)
+
+
+def observe(name, value, buckets=DURATION_BUCKETS, **labels):
+    """Add ``value`` to the histogram ``name`` with ``labels``"""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+        _schedule_dump()
+
+
+def increment(name, value=1, **labels):
+    """Add ``value`` to the counter ``name`` with ``labels``"""
+    with _lock:
+        _counters[_key(name, labels)] += value
+        _schedule_dump()
+
+
+def reset():
+    """Forget everything recorded by this process"""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        PROFILES.clear()
+        _schedule_dump()
+
+
+@contextlib.contextmanager
+def measure(path, env=None):
+    """Record the duration and SQL queries of the block, profiling it if ``env`` asks to"""
+    cr = env.cr if env is not None else None
+    queries = getattr(cr, 'sql_log_count', None)
+    # cProfile cannot nest: only the outermost profiled block is profiled
+    profiler = None
+    if (env is not None and env.context.get('vibration_profile')
+            and not getattr(_local, 'profiling', False) and env.user._is_system()):
+        profiler = cProfile.Profile()
+        _local.profiling = True
+        profiler.enable()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+            _local.profiling = False
+            _store_profile(path, duration, profiler)
+        observe('vibration_call_duration_seconds', duration, path=path)
+        if queries is not None:
+            observe('vibration_call_sql_queries', cr.sql_log_count - queries, COUNT_BUCKETS, path=path)
+
+
+def timed(path):
+    """Decorate a model method with ``measure``"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with measure(path, self.env):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _store_profile(path, duration, profiler):
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_LINES)
+    PROFILES.appendleft({
+        'path': path,
+        'time': time.time(),
+        'duration': duration,
+        'stats': stream.getvalue(),
+    })
+
+
+def _format_labels(labels, **extra):
+    labels = dict(labels, **extra)
+    if not labels:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in sorted(labels.items()))
+
+
+def _merge(histograms, counters, snapshot):
+    """Add a snapshot's metrics to ``histograms`` and ``counters``"""
+    for name, labels, buckets, counts, count, total in snapshot['histograms']:
+        key = _key(name, dict(labels))
+        merged = histograms.get(key)
+        if merged is None:
+            histograms[key] = (tuple(buckets), list(counts), count, total)
+        elif merged[0] == tuple(buckets):
+            histograms[key] = (
+                merged[0], [a + b for a, b in zip(merged[1], counts)], merged[2] + count, merged[3] + total)
+    for name, labels, value in snapshot['counters']:
+        counters[_key(name, dict(labels))] += value
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _collect_exited(directory):
+    """Fold the snapshots of processes that exited into exited.json"""
+    exited_path = os.path.join(directory, f'{_EXITED}.json')
+    with open(os.path.join(directory, '.lock'), 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        histograms, counters = {}, collections.Counter()
+        paths = []
+        for entry in os.scandir(directory):
+            pid, extension = os.path.splitext(entry.name)
+            if extension == '.json' and pid.isdigit() and not _is_running(int(pid)):
+                snapshot = _read_snapshot(entry.path)
+                if snapshot is not None:
+                    _merge(histograms, counters, snapshot)
+                paths.append(entry.path)
+        if not paths:
+            return
+        snapshot = _read_snapshot(exited_path)
+        if snapshot is not None:
+            _merge(histograms, counters, snapshot)
+        _write_snapshot(exited_path, {
+            'histograms': [
+                [name, labels, buckets, counts, count, total]
+                for (name, labels), (buckets, counts, count, total) in histograms.items()
+            ],
+            'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+        })
+        for path in paths:
+            os.remove(path)
+
+
+def render():
+    """All metrics of the host's processes, or of this one outside Odoo, in the
+    Prometheus text exposition format"""
+    histograms, counters = {}, collections.Counter()
+    with _lock:
+        _merge(histograms, counters, _snapshot())
+    try:
+        directory = _get_directory()
+        names = []
+        if directory is not None:
+            _collect_exited(directory)
+            own = f'{os.getpid()}.json'
+            names = [name for name in os.listdir(directory) if name.endswith('.json') and name != own]
+    except OSError:
+        names = []
+    for name in names:
+        snapshot = _read_snapshot(os.path.join(directory, name))
+        if snapshot is not None:
+            _merge(histograms, counters, snapshot)
+
+    lines = []
+    names = sorted({name for name, __ in histograms} | {name for name, __ in counters})
+    for name in names:
+        kind, description = _HELP.get(name, ('untyped', name))
+        lines.append('# HELP %s %s' % (name, description))
+        lines.append('# TYPE %s %s' % (name, kind))
+        for (metric, labels), (buckets, counts, count, total) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, bucket_count in zip(buckets, counts):
+                lines.append('%s_bucket%s %d' % (name, _format_labels(labels, le='%g' % bound), bucket_count))
+            lines.append('%s_bucket%s %d' % (name, _format_labels(labels, le='+Inf'), count))
+            lines.append('%s_sum%s %r' % (name, _format_labels(labels), float(total)))
+            lines.append('%s_count%s %d' % (name, _format_labels(labels), count))
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append('%s%s %r' % (name, _format_labels(labels), value))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,172 @@
+"""Fixed-size ring of a monitor's most recent seconds, shared between processes.
+
+Each monitor gets a memory-mapped file holding its last ``slots`` ingested
+seconds, so that live views can be served from memory by any worker of the
+host without querying PostgreSQL. Layout::
+
+    header: magic (4s) | version (B) | pad (3x) | slots (I) | capacity (I)
+            | sequence (Q) | head (Q) | last write (d)
+    slot[slots]: cycle number (q) | count (I) | pad (4x)
+                 | time, degree, actual, sub-cycle (f4 * capacity each)
+
+Writers serialise on an exclusive ``flock`` of the file. Readers take no
+lock: they use the sequence as a seqlock (odd while a write is in progress)
+and retry when it moved while they copied the slots. ``head`` counts the
+seconds ever written; the newest one lives in slot ``(head - 1) % slots``.
+"""
+import contextlib
+import fcntl
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+BUFFER_MAGIC = b'VLRB'
+BUFFER_VERSION = 1
+DEFAULT_SLOTS = 16
+DEFAULT_CAPACITY = 4096
+
+_HEADER = struct.Struct('<4sB3xIIQQd')
+_SLOT_HEADER = struct.Struct('<qI4x')
+_SEQUENCE_OFFSET = 16
+_COLUMNS = ('time', 'degree', 'actual', 'cycle')
+_READ_ATTEMPTS = 5
+
+_buffers = {}
+
+
+class LiveBuffer:
+    """Ring of recent seconds in a memory-mapped file"""
+
+    def __init__(self, path, slots=DEFAULT_SLOTS, capacity=DEFAULT_CAPACITY):
+        self.path = path
+        self.slots = slots
+        self.capacity = capacity
+        self.slot_size = _SLOT_HEADER.size + len(_COLUMNS) * 4 * capacity
+        size = _HEADER.size + slots * self.slot_size
+
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b')
+        with self._locked():
+            header = self._read_file_header()
+            if header != (BUFFER_MAGIC, BUFFER_VERSION, slots, capacity):
+                # New file, or created with another layout: start empty
+                self._file.truncate(0)
+                self._file.truncate(size)
+                self._file.seek(0)
+                self._file.write(_HEADER.pack(BUFFER_MAGIC, BUFFER_VERSION, slots, capacity, 0, 0, 0.0))
+                self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _read_file_header(self):
+        self._file.seek(0)
+        data = self._file.read(_HEADER.size)
+        if len(data) < _HEADER.size:
+            return None
+        return _HEADER.unpack(data)[:4]
+
+    def _header(self):
+        __, __, __, __, sequence, head, last_write = _HEADER.unpack_from(self._map)
+        return sequence, head, last_write
+
+    def _set_header(self, sequence, head, last_write):
+        struct.pack_into('<QQd', self._map, _SEQUENCE_OFFSET, sequence, head, last_write)
+
+    def _slot_offset(self, position):
+        return _HEADER.size + (position % self.slots) * self.slot_size
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def clear(self):
+        """Forget every second, e.g. once the monitor's records are deleted"""
+        with self._locked():
+            sequence, __, __ = self._header()
+            self._set_header(sequence + 2, 0, 0.0)
+
+    def write(self, seconds):
+        """Append seconds, given as ``(cycle_number, arrays)`` with the _COLUMNS arrays.
+
+        Seconds with more samples than the slot capacity are truncated, so
+        callers should decimate them first. A cycle number not above the
+        newest one held means the monitor started over: the ring is cleared.
+        """
+        with self._locked():
+            sequence, head, __ = self._header()
+            self._set_header(sequence + 1, head, time.time())
+            try:
+                for cycle_number, arrays in seconds:
+                    if head:
+                        newest, __ = _SLOT_HEADER.unpack_from(self._map, self._slot_offset(head - 1))
+                        if cycle_number <= newest:
+                            head = 0
+                    offset = self._slot_offset(head)
+                    count = min(len(arrays['time']), self.capacity)
+                    _SLOT_HEADER.pack_into(self._map, offset, cycle_number, count)
+                    column_offset = offset + _SLOT_HEADER.size
+                    for name in _COLUMNS:
+                        column = np.frombuffer(self._map, dtype='<f4', count=self.capacity, offset=column_offset)
+                        column[:count] = arrays[name][:count]
+                        del column
+                        column_offset += 4 * self.capacity
+                    head += 1
+            finally:
+                self._set_header(sequence + 2, head, time.time())
+
+    def _read_slot(self, position):
+        offset = self._slot_offset(position)
+        cycle_number, count = _SLOT_HEADER.unpack_from(self._map, offset)
+        arrays = {}
+        column_offset = offset + _SLOT_HEADER.size
+        for name in _COLUMNS:
+            arrays[name] = np.frombuffer(self._map, dtype='<f4', count=count, offset=column_offset).copy()
+            column_offset += 4 * self.capacity
+        return cycle_number, arrays
+
+    def read_after(self, after_cycle_number, limit=None):
+        """Return the held seconds numbered above ``after_cycle_number``, oldest first.
+
+        :return: list of ``(cycle_number, arrays)``, or None when the ring
+            cannot answer exactly (seconds missing since the cursor, or a
+            write kept racing the read); callers then fall back to the database
+        """
+        for __ in range(_READ_ATTEMPTS):
+            sequence, head, __ = self._header()
+            if sequence % 2:
+                continue
+            held = range(max(0, head - self.slots), head)
+            seconds = [self._read_slot(position) for position in held]
+            if self._header()[0] != sequence:
+                continue
+            if not seconds or seconds[-1][0] < after_cycle_number:
+                return None
+            seconds = [second for second in seconds if second[0] > after_cycle_number]
+            # Also for a fresh client (cursor 0): the ring must hold every
+            # second since the cursor, or the history would come back truncated
+            if seconds and seconds[0][0] != after_cycle_number + 1:
+                return None
+            return seconds[:limit] if limit else seconds
+        return None
+
+    @property
+    def last_write(self):
+        return self._header()[2]
+
+
+def get_buffer(path, slots=DEFAULT_SLOTS, capacity=DEFAULT_CAPACITY):
+    """Return the process-wide LiveBuffer mapped on ``path``, opening it on first use"""
+    buffer = _buffers.get(path)
+    if buffer is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        buffer = _buffers[path] = LiveBuffer(path, slots, capacity)
+    return buffer
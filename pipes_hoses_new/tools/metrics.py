@@ -0,0 +1,87 @@
+"""Vectorised per-second vibration metrics.
+
+Every metric is computed for a batch of seconds at once: the samples are
+passed as ``(seconds, samples)`` arrays sharing one time grid, which is the
+case for every second recorded with the same sampling. A single second may
+be passed as 1-D arrays.
+
+- ``deviation_rms``: RMS of actual minus planned, in MM
+- ``peak_to_peak``: max minus min of the actual trace, in MM
+- ``crest_factor``: peak absolute actual value over its RMS
+- ``phase_lag``: phase of the planned fundamental minus that of the actual
+  one, in degrees within (-180, 180]; positive when the actual trace lags
+- ``dominant_frequency``: frequency of the strongest non-DC bin of the FFT
+  of the actual trace, resampled on a uniform grid, in Hz
+"""
+import numpy as np
+
+METRIC_NAMES = ('deviation_rms', 'peak_to_peak', 'crest_factor', 'phase_lag', 'dominant_frequency')
+
+
+def _fundamental_phase(time, values, frequency):
+    """Phase of the ``frequency`` component of each row, in radians.
+
+    Least-squares fit of ``a sin(wt) + b cos(wt) + c`` solved for all rows at
+    once, which stays exact on non-uniform or overlapping sample grids.
+    """
+    omega_t = 2.0 * np.pi * frequency * time
+    design = np.column_stack([np.sin(omega_t), np.cos(omega_t), np.ones_like(time)])
+    coefficients = np.linalg.lstsq(design, values.T, rcond=None)[0]
+    return np.arctan2(coefficients[1], coefficients[0])
+
+
+def _resample_uniform(time, values):
+    """Linearly resample each row on a uniform grid of the same length over the time span.
+
+    Both ends are kept, so the grid's sample period is the span over ``count - 1``.
+    """
+    count = len(time)
+    grid = np.linspace(time[0], time[-1], count)
+    right = np.clip(np.searchsorted(time, grid, side='right'), 1, count - 1)
+    left = right - 1
+    span = time[right] - time[left]
+    weight = np.divide(grid - time[left], span, out=np.zeros_like(grid), where=span > 0)
+    return values[:, left] * (1.0 - weight) + values[:, right] * weight
+
+
+def compute_metrics(time, planned, actual, frequency):
+    """Compute the metrics of a batch of seconds.
+
+    :param time: 1-D array of sample times within the second, non-decreasing
+    :param planned: planned values, shaped like ``actual``
+    :param actual: ``(seconds, samples)`` array, or 1-D for a single second
+    :param frequency: nominal frequency of the movement, in Hz
+    :return: dict mapping each name of METRIC_NAMES to a 1-D float64 array
+        with one value per second
+    """
+    time = np.asarray(time, dtype=np.float64)
+    planned = np.atleast_2d(np.asarray(planned, dtype=np.float64))
+    actual = np.atleast_2d(np.asarray(actual, dtype=np.float64))
+    seconds = actual.shape[0]
+    if time.size < 2 or not seconds:
+        return {name: np.zeros(seconds) for name in METRIC_NAMES}
+
+    deviation = actual - planned
+    actual_rms = np.sqrt(np.mean(actual ** 2, axis=1))
+    peak = np.max(np.abs(actual), axis=1)
+
+    lag = np.degrees(
+        _fundamental_phase(time, planned, frequency) - _fundamental_phase(time, actual, frequency))
+    lag = 180.0 - np.mod(180.0 - lag, 360.0)
+
+    uniform = _resample_uniform(time, actual)
+    spectrum = np.abs(np.fft.rfft(uniform - uniform.mean(axis=1, keepdims=True), axis=1))
+    # Bin k is k / (N * period) Hz, the period being the resampled grid's
+    period = (time[-1] - time[0]) / (time.size - 1)
+    if spectrum.shape[1] > 1 and period > 0:
+        dominant = (np.argmax(spectrum[:, 1:], axis=1) + 1) / (time.size * period)
+    else:
+        dominant = np.zeros(seconds)
+
+    return {
+        'deviation_rms': np.sqrt(np.mean(deviation ** 2, axis=1)),
+        'peak_to_peak': np.ptp(actual, axis=1),
+        'crest_factor': np.divide(peak, actual_rms, out=np.zeros(seconds), where=actual_rms > 0),
+        'phase_lag': lag,
+        'dominant_frequency': dominant,
+    }
@@ -0,0 +1,428 @@
+"""Asynchronous, push-style acquisition of vibration samples from PLCs.
+
+The PLC exposes each vibration sensor as a tag sampled at a fixed integer
+rate; sample ``n`` of a tag is taken at ``n / sample_rate`` seconds since the
+Unix epoch. A client subscribes to tags once per connection and the PLC then
+streams frames of consecutive samples on its own, so there is no request per
+sample. Every message is framed as::
+
+    magic (4s) | version (B) | type (B) | payload length (I) | payload
+
+``SUBSCRIBE`` (client to PLC) payload::
+
+    channel (I) | sample rate (I) | resume index (Q) | tag length (H) | tag (utf-8)
+
+A resume index of 0 starts from the current sample, otherwise the PLC
+replays from that sample as far as its history allows, so a reconnecting
+client loses nothing. ``FRAME`` (PLC to client) payload::
+
+    channel (I) | first index (Q) | count (I) | degree (f4 * count) | actual (f4 * count)
+
+AcquisitionService keeps one connection per PLC address whatever the number
+of monitors subscribed on it, reconnects with an exponential backoff, buffers
+the samples of each subscription in a bounded RingBuffer and hands complete
+seconds to a flush callback in batches. The connections run on an event loop
+in a thread of their own, so sockets keep being read while the caller's
+thread ingests a flush into the database, and between the owner's runs; they
+are closed after IDLE_TIMEOUT seconds without a flush and reopened by
+``resume``. Only whole seconds are handed out: the samples a subscription
+receives before its first second boundary, and seconds missing samples, are
+discarded. Seconds whose flush failed are handed out again at the next one.
+"""
+import asyncio
+import itertools
+import logging
+import random
+import struct
+import threading
+import time
+
+import numpy as np
+
+_logger = logging.getLogger(__name__)
+
+PLC_MAGIC = b'VPLC'
+PLC_VERSION = 1
+MSG_SUBSCRIBE = 1
+MSG_FRAME = 2
+
+_HEADER = struct.Struct('<4sBBI')
+_SUBSCRIBE = struct.Struct('<IIQH')
+_FRAME = struct.Struct('<IQI')
+
+SAMPLE_DTYPE = np.dtype([
+    ('index', '<i8'),
+    ('degree', '<f4'),
+    ('actual', '<f4'),
+])
+
+# Reconnect delays, in seconds: doubled after each failure up to the maximum
+BACKOFF_INITIAL = 0.5
+BACKOFF_MAX = 30.0
+# Seconds without a flush after which the connections are closed
+IDLE_TIMEOUT = 30.0
+
+
+def pack_message(msg_type, payload):
+    return _HEADER.pack(PLC_MAGIC, PLC_VERSION, msg_type, len(payload)) + payload
+
+
+def pack_subscribe(channel, sample_rate, resume_index, tag):
+    tag = tag.encode()
+    return pack_message(MSG_SUBSCRIBE, _SUBSCRIBE.pack(channel, sample_rate, resume_index, len(tag)) + tag)
+
+
+def unpack_subscribe(payload):
+    channel, sample_rate, resume_index, tag_length = _SUBSCRIBE.unpack_from(payload)
+    tag = bytes(payload[_SUBSCRIBE.size:_SUBSCRIBE.size + tag_length]).decode()
+    return channel, sample_rate, resume_index, tag
+
+
+def pack_frame(channel, first_index, degree, actual):
+    count = len(degree)
+    return pack_message(MSG_FRAME, b''.join([
+        _FRAME.pack(channel, first_index, count),
+        np.asarray(degree, dtype='<f4').tobytes(),
+        np.asarray(actual, dtype='<f4').tobytes(),
+    ]))
+
+
+def unpack_frame(payload):
+    """Return the channel and the samples of a frame as a SAMPLE_DTYPE array"""
+    channel, first_index, count = _FRAME.unpack_from(payload)
+    samples = np.empty(count, dtype=SAMPLE_DTYPE)
+    samples['index'] = np.arange(first_index, first_index + count)
+    samples['degree'] = np.frombuffer(payload, dtype='<f4', count=count, offset=_FRAME.size)
+    samples['actual'] = np.frombuffer(payload, dtype='<f4', count=count, offset=_FRAME.size + 4 * count)
+    return channel, samples
+
+
+async def read_message(reader):
+    """Read one message from a stream, return its type and payload"""
+    magic, version, msg_type, length = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if magic != PLC_MAGIC or version != PLC_VERSION:
+        raise ConnectionError("Unexpected PLC message header")
+    return msg_type, await reader.readexactly(length)
+
+
+class RingBuffer:
+    """Bounded FIFO of samples; when full, the oldest samples are overwritten"""
+
+    def __init__(self, capacity):
+        self._data = np.empty(capacity, dtype=SAMPLE_DTYPE)
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    def push(self, samples):
+        capacity = len(self._data)
+        with self._lock:
+            if len(samples) > capacity:
+                self.dropped += len(samples) - capacity
+                samples = samples[-capacity:]
+            overflow = max(0, self._size + len(samples) - capacity)
+            if overflow:
+                self.dropped += overflow
+                self._start = (self._start + overflow) % capacity
+                self._size -= overflow
+            end = (self._start + self._size) % capacity
+            first = min(len(samples), capacity - end)
+            self._data[end:end + first] = samples[:first]
+            self._data[:len(samples) - first] = samples[first:]
+            self._size += len(samples)
+
+    def _ordered(self):
+        capacity = len(self._data)
+        positions = (self._start + np.arange(self._size)) % capacity
+        return self._data[positions]
+
+    def peek_last(self):
+        """Return the newest sample, or None when empty"""
+        with self._lock:
+            if not self._size:
+                return None
+            return self._data[(self._start + self._size - 1) % len(self._data)].copy()
+
+    def drain(self, before_index=None):
+        """Remove and return the samples whose index is below ``before_index`` (all if None)"""
+        with self._lock:
+            samples = self._ordered()
+            count = len(samples) if before_index is None else int(
+                np.searchsorted(samples['index'], before_index))
+            self._start = (self._start + count) % len(self._data)
+            self._size -= count
+            return samples[:count]
+
+
+class Subscription:
+    """One tag streamed from a PLC on behalf of a consumer identified by ``key``"""
+
+    def __init__(self, key, tag, sample_rate, resume_index=0, capacity=None):
+        self.key = key
+        self.tag = tag
+        self.sample_rate = int(sample_rate)
+        self.resume_index = int(resume_index)
+        # Index of the first whole second, known once a sample arrives when
+        # the subscription starts from the PLC's current sample
+        self.start_index = self._next_boundary(self.resume_index) if self.resume_index else None
+        # Ten seconds of samples absorb slow flushes and reconnections
+        self.buffer = RingBuffer(capacity or max(4096, 10 * self.sample_rate))
+        # Complete seconds of a failed flush, handed out again first
+        self.pending = None
+        # Samples of incomplete seconds discarded since the last flush
+        self.discarded = 0
+        self._lock = threading.Lock()
+
+    def _next_boundary(self, index):
+        return -(-index // self.sample_rate) * self.sample_rate
+
+    def receive(self, samples):
+        with self._lock:
+            if self.start_index is None and len(samples):
+                self.start_index = self._next_boundary(int(samples['index'][0]))
+                self.discarded += int(np.count_nonzero(samples['index'] < self.start_index))
+            # Replayed frames may overlap what was already received
+            samples = samples[samples['index'] >= max(self.resume_index, self.start_index or 0)]
+            if len(samples):
+                self.buffer.push(samples)
+                self.resume_index = int(samples['index'][-1]) + 1
+
+    def skip_before(self, index):
+        """Forget the samples below ``index``, e.g. ingested while another process acquired them"""
+        if not index:
+            return
+        with self._lock:
+            self.buffer.drain(index)
+            if self.pending is not None:
+                self.pending = self.pending[self.pending['index'] >= index]
+            self.resume_index = max(self.resume_index, index)
+            self.start_index = max(self.start_index or 0, self._next_boundary(index))
+
+    def drain_complete_seconds(self):
+        """Remove and return the samples of every second that is fully received"""
+        with self._lock:
+            last = self.buffer.peek_last()
+            samples = self.buffer.drain(
+                0 if last is None else (int(last['index']) + 1) // self.sample_rate * self.sample_rate)
+            # Samples are consecutive once deduplicated: a second is whole when
+            # none is missing, which overwritten samples or lost history break
+            __, counts = np.unique(samples['index'] // self.sample_rate, return_counts=True)
+            complete = np.repeat(counts == self.sample_rate, counts)
+            if not complete.all():
+                self.discarded += int(np.count_nonzero(~complete))
+                samples = samples[complete]
+            pending, self.pending = self.pending, None
+        if pending is not None and len(pending):
+            samples = np.concatenate([pending, samples])
+        return samples
+
+    def restore(self, samples):
+        """Hand ``samples`` out again at the next drain, keeping the newest whole seconds that fit"""
+        if len(samples) > self.buffer.capacity:
+            self.buffer.dropped += len(samples) - self.buffer.capacity
+            samples = samples[-self.buffer.capacity:]
+            samples = samples[samples['index'] >= self._next_boundary(int(samples['index'][0]))]
+        self.pending = samples
+
+
+class PlcConnection:
+    """A single connection to one PLC address, shared by all its subscriptions"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.subscriptions = {}
+        self.connected = False
+        self._writer = None
+        self._channels = itertools.count(1)
+
+    def add(self, subscription):
+        channel = next(self._channels)
+        self.subscriptions[channel] = subscription
+        if self._writer is not None:
+            self._send_subscribe(channel, subscription)
+        return channel
+
+    def _send_subscribe(self, channel, subscription):
+        self._writer.write(pack_subscribe(
+            channel, subscription.sample_rate, subscription.resume_index, subscription.tag))
+
+    async def run(self):
+        """Stay connected until cancelled, reconnecting with an exponential backoff"""
+        delay = BACKOFF_INITIAL
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                self.connected = True
+                delay = BACKOFF_INITIAL
+                _logger.info("Connected to PLC %s:%s", self.host, self.port)
+                for channel, subscription in self.subscriptions.items():
+                    self._send_subscribe(channel, subscription)
+                await self._writer.drain()
+                while True:
+                    msg_type, payload = await read_message(reader)
+                    if msg_type != MSG_FRAME:
+                        continue
+                    channel, samples = unpack_frame(payload)
+                    subscription = self.subscriptions.get(channel)
+                    if subscription is not None:
+                        subscription.receive(samples)
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.IncompleteReadError, ConnectionError) as e:
+                _logger.warning("PLC %s:%s unavailable (%s), retrying in %.1fs",
+                                self.host, self.port, e, delay)
+            finally:
+                self.connected = False
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+            # Jitter keeps many monitors from reconnecting in lockstep
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * 2, BACKOFF_MAX)
+
+
+class AcquisitionService:
+    """Acquire many tags from many PLCs in one event loop and flush them in batches.
+
+    ``start`` runs the connections on an event loop in a daemon thread, which
+    only reads sockets into the subscriptions' buffers. ``subscribe``,
+    ``unsubscribe``, ``resume`` and ``flush`` are called from the owner's
+    thread: ``flush(flush_callback)`` calls ``flush_callback(batches)`` with a
+    dict mapping each subscription key to the SAMPLE_DTYPE array of its newly
+    completed seconds; it may return keys to unsubscribe. When it raises, the
+    batches are kept for the next flush.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.connections = {}
+        self.subscriptions = {}
+        self._tasks = {}
+        self._loop = None
+        self._thread = None
+        self._watcher = None
+        self._last_flush = time.monotonic()
+
+    def start(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._watcher = self._loop.create_task(self._close_when_idle())
+        self._thread = threading.Thread(target=self._loop.run_forever, name='vibration-plc', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Close every connection and end the event loop's thread"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop.close()
+        self._loop = self._thread = None
+
+    async def _shutdown(self):
+        self._watcher.cancel()
+        await asyncio.gather(self._watcher, return_exceptions=True)
+        await self._close()
+
+    async def _close(self):
+        tasks = dict(self._tasks)
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for address, task in tasks.items():
+            if self._tasks.get(address) is task:
+                del self._tasks[address]
+
+    async def _close_when_idle(self):
+        # Nobody drains the buffers: the owner stopped running, e.g. its next
+        # run went to another process, which acquires on connections of its own
+        while True:
+            await asyncio.sleep(self.idle_timeout / 4)
+            if self._tasks and time.monotonic() - self._last_flush > self.idle_timeout:
+                _logger.info("No flush of the PLC samples for %.0fs, closing the connections", self.idle_timeout)
+                await self._close()
+
+    def resume(self):
+        """Reopen the connections closed while idle"""
+        self._last_flush = time.monotonic()
+        self._call(self._resume)
+
+    def _resume(self):
+        for address, connection in self.connections.items():
+            if self._loop is not None and address not in self._tasks:
+                self._tasks[address] = self._loop.create_task(connection.run())
+
+    def _call(self, function, *args):
+        """Run ``function`` on the event loop, or right away when it is not started"""
+        if self._loop is None:
+            function(*args)
+        else:
+            self._loop.call_soon_threadsafe(function, *args)
+
+    def subscribe(self, key, host, port, tag, sample_rate, resume_index=0):
+        subscription = Subscription(key, tag, sample_rate, resume_index)
+        self.subscriptions[key] = subscription
+        self._call(self._add, (host, port), subscription)
+        return subscription
+
+    def unsubscribe(self, key):
+        subscription = self.subscriptions.pop(key, None)
+        if subscription is not None:
+            self._call(self._remove, subscription)
+
+    def _add(self, address, subscription):
+        connection = self.connections.get(address)
+        if connection is None:
+            connection = self.connections[address] = PlcConnection(*address)
+        connection.add(subscription)
+        if self._loop is not None and address not in self._tasks:
+            self._tasks[address] = self._loop.create_task(connection.run())
+
+    def _remove(self, subscription):
+        for address, connection in list(self.connections.items()):
+            for channel, candidate in list(connection.subscriptions.items()):
+                if candidate is subscription:
+                    del connection.subscriptions[channel]
+            if not connection.subscriptions:
+                # Nobody listens to this PLC anymore
+                del self.connections[address]
+                task = self._tasks.pop(address, None)
+                if task is not None:
+                    task.cancel()
+
+    def flush(self, flush_callback):
+        self._last_flush = time.monotonic()
+        batches = {}
+        for key, subscription in list(self.subscriptions.items()):
+            samples = subscription.drain_complete_seconds()
+            if len(samples):
+                batches[key] = samples
+            if subscription.buffer.dropped:
+                _logger.warning("Dropped %s samples of %s, the flush is too slow",
+                                subscription.buffer.dropped, key)
+                subscription.buffer.dropped = 0
+            if subscription.discarded:
+                _logger.info("Discarded %s samples of %s from incomplete seconds", subscription.discarded, key)
+                subscription.discarded = 0
+        try:
+            unsubscribed = flush_callback(batches)
+        except Exception:
+            _logger.exception("Failed to flush the acquired PLC samples, keeping them for the next flush")
+            for key, samples in batches.items():
+                subscription = self.subscriptions.get(key)
+                if subscription is not None:
+                    subscription.restore(samples)
+            return
+        for key in unsubscribed or ():
+            self.unsubscribe(key)
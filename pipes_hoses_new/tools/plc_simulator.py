@@ -0,0 +1,124 @@
+"""Local TCP PLC simulator speaking the acquisition protocol of tools/plc.py.
+
+Tags are named after the frequency of the movement they sample, e.g.
+``VIB_7HZ``; each one streams a sine of the variant's amplitude with ±5%
+noise, at the sample rate requested by the subscriber, in frames pushed
+every ``frame_interval`` seconds. Subscribers may resume up to
+``history_seconds`` in the past. Run it with::
+
+    python -m odoo.addons.pipes_hoses_new.tools.plc_simulator --port 44818
+"""
+import argparse
+import asyncio
+import logging
+import math
+import re
+import time
+
+import numpy as np
+
+from . import plc
+
+_logger = logging.getLogger(__name__)
+
+# Peak displacement per frequency (Hz), in MM, as on the monitors
+TAG_AMPLITUDES = {2: 50, 3: 25, 5: 12.5, 7: 8.3}
+_TAG_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*HZ', re.IGNORECASE)
+
+
+def parse_tag(tag):
+    """Return the frequency and amplitude sampled by a tag"""
+    match = _TAG_PATTERN.search(tag)
+    if not match:
+        raise ValueError("Unknown tag %r" % tag)
+    frequency = float(match.group(1))
+    return frequency, TAG_AMPLITUDES.get(int(frequency), 50)
+
+
+def generate_samples(frequency, amplitude, sample_rate, first_index, count, rng, noise=0.05):
+    """Samples ``first_index`` to ``first_index + count - 1`` of a tag, as degree and actual arrays"""
+    index = np.arange(first_index, first_index + count, dtype=np.float64)
+    # Phase of the movement, from the sample's time since the epoch
+    turns = np.mod(index * frequency / sample_rate, 1.0)
+    degree = np.round(turns * 360.0, 4)
+    actual = amplitude * np.sin(np.radians(degree)) * rng.uniform(1.0 - noise, 1.0 + noise, size=count)
+    return degree, actual
+
+
+class PlcSimulator:
+    """asyncio TCP server streaming simulated vibration tags"""
+
+    def __init__(self, frame_interval=0.05, history_seconds=120, seed=None):
+        self.frame_interval = frame_interval
+        self.history_seconds = history_seconds
+        self.rng = np.random.default_rng(seed)
+
+    async def _stream(self, writer, channel, sample_rate, resume_index, tag):
+        frequency, amplitude = parse_tag(tag)
+        current = math.floor(time.time() * sample_rate)
+        oldest = current - self.history_seconds * sample_rate
+        next_index = max(resume_index, oldest) if resume_index else current
+        # Cap each frame so that replays are streamed in reasonable chunks
+        max_frame = max(sample_rate, 1)
+        while True:
+            current = math.floor(time.time() * sample_rate)
+            while next_index <= current:
+                count = min(current - next_index + 1, max_frame)
+                degree, actual = generate_samples(
+                    frequency, amplitude, sample_rate, next_index, count, self.rng)
+                writer.write(plc.pack_frame(channel, next_index, degree, actual))
+                next_index += count
+            await writer.drain()
+            await asyncio.sleep(self.frame_interval)
+
+    async def handle_client(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        _logger.info("PLC client connected from %s", peer)
+        streams = []
+        try:
+            while True:
+                msg_type, payload = await plc.read_message(reader)
+                if msg_type != plc.MSG_SUBSCRIBE:
+                    continue
+                channel, sample_rate, resume_index, tag = plc.unpack_subscribe(payload)
+                try:
+                    parse_tag(tag)
+                except ValueError:
+                    _logger.warning("%s subscribed to unknown tag %r", peer, tag)
+                    continue
+                _logger.info("%s subscribed to %s at %s Hz", peer, tag, sample_rate)
+                streams.append(asyncio.create_task(
+                    self._stream(writer, channel, sample_rate, resume_index, tag)))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            _logger.info("PLC client %s disconnected (%s)", peer, e)
+        finally:
+            for stream in streams:
+                stream.cancel()
+            await asyncio.gather(*streams, return_exceptions=True)
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=44818):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        _logger.info("PLC simulator listening on %s:%s", host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated vibration PLC")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=44818)
+    parser.add_argument('--frame-interval', type=float, default=0.05,
+                        help="Seconds between two pushed frames")
+    parser.add_argument('--seed', type=int, help="Seed of the noise, for reproducible runs")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    simulator = PlcSimulator(frame_interval=args.frame_interval, seed=args.seed)
+    try:
+        asyncio.run(simulator.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Planned-waveform templates and vectorised synthesis of simulated waveforms.
+
+The planned trace only depends on the frequency, the variant's amplitude
+and the sampled degrees, so it is built once per combination as an
+immutable ``PlannedTemplate`` and shared by ingestion, the chart computes
+and (through ``to_dict``) the chart widgets. Templates are memoised on the
+values they are built from, so changing an amplitude or frequency map
+yields a new template without any explicit invalidation; clear_template_cache
+only frees memory.
+
+The actual trace applies a seedable multiplicative noise to the template.
+Whole seconds (or whole runs of seconds) are produced in one call, with no
+per-sample Python work.
+"""
+import functools
+
+import numpy as np
+
+# Relative half-width of the uniform noise applied to the actual trace (±5%)
+DEFAULT_NOISE = 0.05
+
+
+class PlannedTemplate:
+    """Planned trace of one second, as read-only arrays (one entry per sample)"""
+
+    def __init__(self, frequency, amplitude, sample_degrees):
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.sample_degrees = sample_degrees
+        self.key = '%s:%s:%s' % (frequency, amplitude, len(sample_degrees))
+
+        num_cycles = int(frequency)
+        degrees = np.asarray(sample_degrees, dtype=np.float64)
+        cycle_duration = 1.0 / num_cycles
+        cycle_index = np.repeat(np.arange(num_cycles), len(degrees))
+
+        # Values over one cycle, indexed like sample_degrees
+        self.cycle_planned = amplitude * np.sin(np.radians(degrees))
+        # Values over the whole second
+        self.cycle = cycle_index + 1
+        self.degree = np.tile(degrees, num_cycles)
+        self.time_in_cycle = self.degree / 360.0 * cycle_duration
+        self.time = cycle_index * cycle_duration + self.time_in_cycle
+        self.planned = np.tile(self.cycle_planned, num_cycles)
+        for array in (self.cycle_planned, self.cycle, self.degree,
+                      self.time_in_cycle, self.time, self.planned):
+            array.flags.writeable = False
+
+    def planned_at(self, degrees):
+        """Planned values at arbitrary sampled degrees"""
+        return self.amplitude * np.sin(np.radians(np.asarray(degrees, dtype=np.float64)))
+
+    def to_dict(self):
+        """JSON-friendly form sent to the chart widgets (planned value per degree)"""
+        return {
+            'key': self.key,
+            'degrees': np.round(self.sample_degrees, 4).tolist(),
+            'planned': np.round(self.cycle_planned, 2).tolist(),
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def grid_degrees(samples_per_cycle):
+    """Evenly spaced sampled degrees of one cycle, from 0° included to 360° excluded"""
+    return tuple(float(degree) for degree in np.arange(samples_per_cycle) * (360.0 / samples_per_cycle))
+
+
+@functools.lru_cache(maxsize=64)
+def _build_template(frequency, amplitude, sample_degrees):
+    return PlannedTemplate(frequency, amplitude, sample_degrees)
+
+
+def get_planned_template(frequency, amplitude, sample_degrees):
+    """Return the shared PlannedTemplate for these parameters"""
+    return _build_template(
+        int(frequency), float(amplitude), tuple(float(degree) for degree in sample_degrees))
+
+
+def clear_template_cache():
+    """Drop every memoised template"""
+    _build_template.cache_clear()
+
+
+def synthesize_seconds(template, seconds=1, rng=None, noise=DEFAULT_NOISE):
+    """Build ``seconds`` consecutive seconds of samples following ``template``.
+
+    :param template: the PlannedTemplate of the monitor
+    :param rng: a ``numpy.random.Generator``; pass a seeded one for reproducible runs
+    :param noise: relative half-width of the uniform noise on the actual trace
+    :return: dict of arrays shaped (seconds, samples per second): ``cycle``
+        (1-based cycle within the second), ``degree``, ``time`` and
+        ``time_in_cycle`` in seconds, ``planned`` and ``actual`` in MM. All
+        but ``actual`` are broadcast views of the template, not copies.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    shape = (seconds, len(template.planned))
+    actual = template.planned * rng.uniform(1.0 - noise, 1.0 + noise, size=shape)
+
+    return {
+        'cycle': np.broadcast_to(template.cycle, shape),
+        'degree': np.broadcast_to(template.degree, shape),
+        'time': np.broadcast_to(template.time, shape),
+        'time_in_cycle': np.broadcast_to(template.time_in_cycle, shape),
+        'planned': np.broadcast_to(template.planned, shape),
+        'actual': actual,
+    }